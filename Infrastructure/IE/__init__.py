@@ -17,6 +17,9 @@ from .aurora_engine import (
     Aurora,
     AuroraCognitiveCycle,
     MetricsCollector,
+    LatencyHistogram,
+    IngestionPipeline,
+    BackpressureError,
     KnowledgeBasePersistence,
     run_all_tests
 )
@@ -25,15 +28,22 @@ from .aurora_engine import (
 from .core import (
     FractalTensor,
     Trigate,
+    VectorizedTrigate,
+    TernaryBitplane,
+    BitplaneTrigate,
     TernaryLogic,
     FractalKnowledgeBase,
+    KBChangeEvent,
     Transcender,
     Evolver,
+    TrioReductionEngine,
     Extender,
     Armonizador,
     RecursiveDeductionNetwork,
     TensorPoolManager,
+    EthicalMerkleTree,
     pattern0_create_fractal_cluster,
+    compute_merkle_signature,
     CoherenceError,
     PHI
 )
@@ -49,22 +59,32 @@ __all__ = [
     'Aurora',
     'AuroraCognitiveCycle',
     'MetricsCollector',
+    'LatencyHistogram',
+    'IngestionPipeline',
+    'BackpressureError',
     'KnowledgeBasePersistence',
     
     # Core components
     'FractalTensor',
     'Trigate',
+    'VectorizedTrigate',
+    'TernaryBitplane',
+    'BitplaneTrigate',
     'TernaryLogic',
     'FractalKnowledgeBase',
+    'KBChangeEvent',
     'Transcender',
     'Evolver',
+    'TrioReductionEngine',
     'Extender',
     'Armonizador',
     'RecursiveDeductionNetwork',
     'TensorPoolManager',
+    'EthicalMerkleTree',
     
     # Utilities
     'pattern0_create_fractal_cluster',
+    'compute_merkle_signature',
     'run_all_tests',
     'CoherenceError',
     'PHI',
@@ -0,0 +1,183 @@
+"""
+Aurora API Engines: pool de motores por usuario
+===============================================
+
+Construir un Extender por petición también construye su Armonizador, su
+RecursiveDeductionNetwork, un Transcender y un Trigate, y empieza con el
+memo LUT y las cachés vacías. El pool mantiene motores de larga vida por
+KB de usuario para que esas cachés se amorticen entre peticiones:
+
+- lease() presta un motor en exclusiva (un Extender no se comparte entre
+  peticiones concurrentes) y lo devuelve al pool al salir del bloque.
+  checkout() lo presta sin bloque y devuelve la función que lo devuelve:
+  para motores que usa un worker, se llama al terminar el worker y no al
+  salir del handler (que puede cancelarse antes).
+- Como mucho max_per_user motores ociosos por usuario y max_engines en
+  total; al superar el total se descartan los del usuario menos reciente.
+- Los motores ociosos más de idle_seconds se descartan (barrido
+  oportunista en lease(), o sweep() explícito).
+- Un motor solo se reutiliza con la misma KB: si la KB del usuario se
+  reemplaza (p. ej. al recargarla de disco), los motores viejos se tiran.
+- drop_user() sube la época del usuario: los motores que estaban
+  prestados se tiran al devolverlos en vez de volver al pool (retendrían
+  la KB expulsada).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from core import Extender, FractalKnowledgeBase
+
+
+class EnginePool:
+    """Pool acotado de motores (Extender) por usuario con expulsión por inactividad."""
+
+    def __init__(
+        self,
+        factory: Callable[..., Any] = Extender,
+        max_per_user: int = 4,
+        max_engines: int = 256,
+        idle_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.factory = factory
+        self.max_per_user = max_per_user
+        self.max_engines = max_engines
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        # user_id -> deque[(motor, kb, último uso)], orden LRU de usuarios
+        self._idle: "OrderedDict[str, deque]" = OrderedDict()
+        self._idle_count = 0
+        self._in_use = 0
+        # user_id -> [motores prestados, época]; solo usuarios con préstamos
+        self._leased: Dict[str, list] = {}
+        self._last_sweep = clock()
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0, 'discarded': 0}
+
+    @contextmanager
+    def lease(self, user_id: str, kb: FractalKnowledgeBase) -> Iterator[Any]:
+        """Prestar un motor para la KB del usuario (with pool.lease(...) as extender)."""
+        engine, epoch = self._acquire(user_id, kb)
+        try:
+            yield engine
+        finally:
+            self._release(user_id, kb, engine, epoch)
+
+    def checkout(self, user_id: str, kb: FractalKnowledgeBase) -> Tuple[Any, Callable[[], None]]:
+        """Prestar un motor sin bloque with: (motor, devolver). devolver() solo cuenta una vez."""
+        engine, epoch = self._acquire(user_id, kb)
+        once = threading.Lock()
+
+        def give_back() -> None:
+            if once.acquire(blocking=False):
+                self._release(user_id, kb, engine, epoch)
+
+        return engine, give_back
+
+    def _acquire(self, user_id: str, kb: FractalKnowledgeBase):
+        """(motor, época del usuario al prestarlo)"""
+        now = self.clock()
+        with self._lock:
+            if now - self._last_sweep >= self.idle_seconds / 2:
+                self._sweep_locked(now)
+            leased = self._leased.setdefault(user_id, [0, 0])
+            leased[0] += 1
+            self._in_use += 1
+            idle = self._idle.get(user_id)
+            while idle:
+                engine, engine_kb, _ = idle.pop()  # el más reciente: cachés más calientes
+                self._idle_count -= 1
+                if engine_kb is kb:
+                    self.stats['reused'] += 1
+                    return engine, leased[1]
+                self.stats['discarded'] += 1  # la KB del usuario fue reemplazada
+            self.stats['created'] += 1
+            epoch = leased[1]
+        try:
+            return self.factory(knowledge_base=kb), epoch
+        except Exception:
+            with self._lock:
+                self._end_lease_locked(user_id)
+            raise
+
+    def _end_lease_locked(self, user_id: str) -> int:
+        """Cerrar un préstamo; devuelve la época actual del usuario."""
+        self._in_use -= 1
+        leased = self._leased[user_id]
+        leased[0] -= 1
+        if not leased[0]:
+            del self._leased[user_id]  # sin préstamos la época ya no importa
+        return leased[1]
+
+    def _release(self, user_id: str, kb: FractalKnowledgeBase, engine, epoch: int) -> None:
+        with self._lock:
+            if self._end_lease_locked(user_id) != epoch:
+                self.stats['discarded'] += 1  # drop_user mientras estaba prestado
+                return
+            idle = self._idle.get(user_id)
+            if idle is None:
+                idle = self._idle[user_id] = deque()
+            self._idle.move_to_end(user_id)
+            if len(idle) >= self.max_per_user:
+                self.stats['discarded'] += 1
+                return
+            idle.append((engine, kb, self.clock()))
+            self._idle_count += 1
+            # Presupuesto global: primero los motores del usuario menos reciente
+            while self._idle_count > self.max_engines:
+                oldest_user, oldest = next(iter(self._idle.items()))
+                if oldest:
+                    oldest.popleft()
+                    self._idle_count -= 1
+                    self.stats['evicted'] += 1
+                if not oldest:
+                    del self._idle[oldest_user]
+
+    def sweep(self) -> int:
+        """Descartar los motores ociosos más de idle_seconds. Devuelve cuántos."""
+        with self._lock:
+            return self._sweep_locked(self.clock())
+
+    def _sweep_locked(self, now: float) -> int:
+        self._last_sweep = now
+        removed = 0
+        for user_id in list(self._idle):
+            idle = self._idle[user_id]
+            while idle and now - idle[0][2] > self.idle_seconds:
+                idle.popleft()
+                removed += 1
+            if not idle:
+                del self._idle[user_id]
+        self._idle_count -= removed
+        self.stats['evicted'] += removed
+        return removed
+
+    def drop_user(self, user_id: str) -> int:
+        """
+        Olvidar los motores de un usuario (p. ej. al descargar su KB). Los
+        prestados en ese momento no vuelven al pool. Devuelve los ociosos
+        descartados.
+        """
+        with self._lock:
+            leased = self._leased.get(user_id)
+            if leased is not None:
+                leased[1] += 1
+            idle = self._idle.pop(user_id, None)
+            removed = len(idle) if idle else 0
+            self._idle_count -= removed
+            return removed
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'idle': self._idle_count,
+                'in_use': self._in_use,
+                'users': len(self._idle),
+            }
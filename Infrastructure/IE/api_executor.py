@@ -0,0 +1,267 @@
+"""
+Aurora API Executor: capa de ejecución para los handlers de aurora_api
+======================================================================
+
+Los handlers de FastAPI son `async def`: cualquier trabajo de CPU hecho
+directamente en ellos bloquea el event loop y con él todas las demás
+peticiones (incluido /api/v1/health). Esta capa saca ese trabajo del loop:
+
+    thread   ThreadPoolExecutor compartido, para trabajo ligero o que
+             necesita estado del proceso (la KB del usuario, el
+             coordinador económico)
+    process  ProcessPoolExecutor (contexto spawn), para trabajo pesado de
+             tensores autocontenido: la función y sus argumentos deben ser
+             picklables, por eso los trabajos viven en este módulo y solo
+             importan core
+
+Cada endpoint tiene un límite de concurrencia (asyncio.Semaphore): las
+peticiones por encima del límite esperan en el loop sin ocupar workers.
+El hueco se devuelve cuando el worker termina, aunque la petición que lo
+esperaba se haya cancelado antes.
+Por endpoint se registran histogramas de tiempo en cola (desde que llega
+la petición hasta que un worker empieza a ejecutarla, incluida la espera
+dentro del pool) y de tiempo de ejecución.
+
+Configuración por entorno:
+
+    AURORA_THREAD_WORKERS    tamaño del pool de hilos (por defecto 8)
+    AURORA_PROCESS_WORKERS   tamaño del pool de procesos (por defecto el
+                             número de CPUs; 0 ejecuta el trabajo pesado
+                             en el pool de hilos)
+    AURORA_ENDPOINT_LIMITS   límites por endpoint, "extend=4,pattern0=2"
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from core import TensorPoolManager, pattern0_create_fractal_cluster
+from aurora_engine import LatencyHistogram
+
+logger = logging.getLogger("aurora.executor")
+
+# Límites por defecto. El coordinador económico no es thread-safe: todos
+# sus accesos, mutaciones y lecturas, comparten el carril "economics" con
+# límite 1 y quedan serializados entre sí (las lecturas devuelven copias)
+DEFAULT_ENDPOINT_LIMITS = {
+    "extend": 4,
+    "pattern0": 2,
+    "kb": 8,
+    "economics": 1,
+}
+DEFAULT_LIMIT = 8
+
+
+def parse_limits(spec: Optional[str]) -> Dict[str, int]:
+    """'extend=4,pattern0=2' -> {'extend': 4, 'pattern0': 2}"""
+    limits = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        try:
+            limits[name.strip()] = max(1, int(value))
+        except ValueError:
+            raise ValueError(f"Límite inválido en AURORA_ENDPOINT_LIMITS: '{part}'")
+    return limits
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    """Ejecuta fn en el worker y devuelve (inicio, fin, resultado)."""
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return started, time.time(), result
+
+
+# ===============================================================================
+# TRABAJOS PESADOS (ejecutables en el pool de procesos)
+# ===============================================================================
+
+def pattern0_job(space_id: str, num_tensors: int) -> Dict[str, Any]:
+    """Cluster Pattern 0 serializado: tensores (nivel_3 + metadata) y firma Merkle."""
+    pool = TensorPoolManager()
+    tensors = pattern0_create_fractal_cluster(
+        space_id=space_id,
+        num_tensors=num_tensors,
+        context={"pool": pool}
+    )
+    return {
+        "cluster": [{"nivel_3": t.nivel_3, "metadata": t.metadata} for t in tensors],
+        "cluster_signature": pool.signature(),
+    }
+
+
+# ===============================================================================
+# CAPA DE EJECUCIÓN
+# ===============================================================================
+
+class _EndpointStats:
+    __slots__ = ("limit", "in_flight", "waiting", "completed", "failed", "queue", "run")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue = LatencyHistogram()
+        self.run = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_ms": self.queue.summary(),
+            "run_ms": self.run.summary(),
+        }
+
+
+class ExecutionLayer:
+    """Despacha el trabajo de los handlers a pools con límites por endpoint."""
+
+    def __init__(
+        self,
+        thread_workers: int = 8,
+        process_workers: int = 0,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = DEFAULT_LIMIT
+    ):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.limits = {**DEFAULT_ENDPOINT_LIMITS, **(limits or {})}
+        self.default_limit = default_limit
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="aurora-api")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._process_lock = threading.Lock()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    @classmethod
+    def from_env(cls) -> "ExecutionLayer":
+        return cls(
+            thread_workers=int(os.environ.get("AURORA_THREAD_WORKERS", 8)),
+            process_workers=int(os.environ.get("AURORA_PROCESS_WORKERS", os.cpu_count() or 1)),
+            limits=parse_limits(os.environ.get("AURORA_ENDPOINT_LIMITS")),
+        )
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        # Creado bajo demanda; spawn evita heredar locks de los hilos del servidor
+        with self._process_lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+
+    def _endpoint(self, endpoint: str):
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            limit = self.limits.get(endpoint, self.default_limit)
+            stats = self._stats[endpoint] = _EndpointStats(limit)
+            self._semaphores[endpoint] = asyncio.Semaphore(limit)
+        return self._semaphores[endpoint], stats
+
+    async def run(
+        self,
+        endpoint: str,
+        fn: Callable,
+        *args,
+        kind: str = "thread",
+        on_done: Optional[Callable[[], Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Ejecutar fn(*args, **kwargs) fuera del event loop respetando el
+        límite del endpoint. kind='process' usa el pool de procesos si
+        está configurado (fn y argumentos picklables).
+
+        on_done se llama una sola vez cuando el trabajo deja de usar sus
+        recursos: al terminar el worker (aunque la petición se haya
+        cancelado antes) o al instante si no llegó a enviarse. Puede
+        llamarse desde el hilo del worker: debe ser thread-safe.
+        """
+        semaphore, stats = self._endpoint(endpoint)
+        arrived = time.time()
+        stats.waiting += 1
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            if on_done is not None:
+                on_done()
+            raise
+        finally:
+            stats.waiting -= 1
+        stats.in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            if kind == "process" and self.process_workers > 0:
+                executor = self._process_pool()
+            else:
+                executor = self._threads
+            future = executor.submit(_timed_call, fn, args, kwargs)
+        except BaseException:
+            stats.in_flight -= 1
+            stats.failed += 1
+            semaphore.release()
+            if on_done is not None:
+                on_done()
+            raise
+        # El hueco del endpoint se libera cuando el worker termina, no cuando
+        # la petición deja de esperarlo: si se cancela, el trabajo sigue
+        # ocupando su worker hasta acabar
+        future.add_done_callback(functools.partial(self._on_done, loop, semaphore, stats, arrived, on_done))
+        started, finished, result = await asyncio.wrap_future(future)
+        return result
+
+    @staticmethod
+    def _on_done(loop, semaphore, stats, arrived, on_done, future) -> None:
+        # Hilo del worker (o del gestor del pool de procesos): el gancho se
+        # llama aquí aunque el loop ya no exista; el estado del endpoint se
+        # toca en el loop
+        if on_done is not None:
+            try:
+                on_done()
+            except Exception as e:
+                logger.error(f"on_done hook failed: {e}")
+        if loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(ExecutionLayer._finish, semaphore, stats, arrived, future)
+        except RuntimeError:
+            pass  # loop cerrado entre medias
+
+    @staticmethod
+    def _finish(semaphore, stats, arrived, future) -> None:
+        stats.in_flight -= 1
+        semaphore.release()
+        if future.cancelled() or future.exception() is not None:
+            stats.failed += 1
+            return
+        started, finished, _ = future.result()
+        stats.queue.record(max(0.0, started - arrived) * 1000)
+        stats.run.record(max(0.0, finished - started) * 1000)
+        stats.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas por endpoint: límite, ocupación y percentiles de cola/ejecución."""
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "endpoints": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._threads.shutdown(wait=wait)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait)
+            self._processes = None
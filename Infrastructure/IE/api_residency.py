@@ -0,0 +1,335 @@
+"""
+Aurora API Residency: KB de usuario residentes con presupuesto de memoria
+=========================================================================
+
+El gateway mantenía en memoria la KB de cada usuario que alguna vez hizo
+login. KBResidencyManager acota eso:
+
+- Presupuesto de memoria (estimado por número de arquetipos): al
+  superarlo se expulsan las KB menos usadas recientemente (LRU).
+- Expulsar = volcar a disco. Con WAL (wal_root) se cierra el log con un
+  checkpoint; sin WAL se escribe un volcado en spill_dir en el formato
+  binario de kb_binary (pickle si la KB no es ternaria).
+- La siguiente petición del usuario la recarga de forma transparente.
+- Una KB fijada con pin() (una petición en curso la está usando) nunca
+  se expulsa; sweep() además expulsa las ociosas más de idle_seconds.
+
+Los volcados sin WAL son una extensión de la memoria, no persistencia. Sin
+spill_dir cada gestor vuelca en un directorio privado (mkdtemp, modo 0700)
+que close() borra; con un spill_dir compartido, remove_stale_spills() borra
+al arrancar los volcados que dejó un proceso anterior.
+
+Carga y volcado ocurren fuera del lock global (cada usuario en tránsito
+tiene un Event), así que el camino rápido de una KB residente no espera
+a la E/S de otros usuarios.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import kb_binary
+from core import FractalKnowledgeBase
+from kb_wal import KBWriteAheadLog
+
+logger = logging.getLogger("aurora.residency")
+
+_SPILL_RE = re.compile(r'^[0-9a-f]{32}\.(akb|pkl)$')
+
+
+class _Resident:
+    __slots__ = ("kb", "wal", "last_used", "pins")
+
+    def __init__(self, kb: FractalKnowledgeBase, wal: Optional[KBWriteAheadLog], now: float):
+        self.kb = kb
+        self.wal = wal
+        self.last_used = now
+        self.pins = 0
+
+
+class KBResidencyManager:
+    """KB por usuario con presupuesto de memoria, expulsión LRU a disco y recarga."""
+
+    # Coste estimado en memoria de un arquetipo almacenado (tensor + índices
+    # comodín, nombre y Ms); medido con tracemalloc entre ~2 KB (solo raíz)
+    # y ~4 KB (tensor completo de 13 filas)
+    ARCHETYPE_BYTES = 3072
+
+    def __init__(
+        self,
+        memory_budget_bytes: int,
+        spill_dir: Optional[str] = None,
+        wal_root: Optional[str] = None,
+        idle_seconds: Optional[float] = None,
+        on_evict: Optional[Callable[[str], Any]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._own_spill_dir = spill_dir is None
+        self.spill_dir = tempfile.mkdtemp(prefix="aurora_kb_spill_") if spill_dir is None else spill_dir
+        self.wal_root = wal_root
+        self.idle_seconds = idle_seconds
+        self.on_evict = on_evict
+        self.clock = clock
+        self._resident: "OrderedDict[str, _Resident]" = OrderedDict()  # orden LRU
+        self._transit: Dict[str, threading.Event] = {}  # cargando o volcando
+        self._lock = threading.Lock()
+        self.stats = {'loaded': 0, 'created': 0, 'evicted': 0, 'spilled_bytes': 0}
+
+        os.makedirs(self.spill_dir, mode=0o700, exist_ok=True)
+
+    def remove_stale_spills(self) -> int:
+        """
+        Borrar los volcados que dejó en spill_dir un proceso anterior.
+        Solo al arrancar: después no se distinguen de los de este gestor.
+        """
+        if self.stats['evicted']:
+            raise RuntimeError("remove_stale_spills() solo antes de la primera expulsión")
+        removed = 0
+        for name in os.listdir(self.spill_dir):
+            if _SPILL_RE.match(name):
+                try:
+                    os.remove(os.path.join(self.spill_dir, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return hashlib.sha256(user_id.encode()).hexdigest()[:32]
+
+    @classmethod
+    def estimate_bytes(cls, kb: FractalKnowledgeBase) -> int:
+        """Estimación O(universos) de la memoria de una KB."""
+        return sum(len(u.storage) for u in list(kb.universes.values())) * cls.ARCHETYPE_BYTES
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._resident
+
+    # -- acceso -----------------------------------------------------------------
+
+    def get(self, user_id: str) -> FractalKnowledgeBase:
+        """KB del usuario (recargándola si estaba en disco); puede expulsar a otras."""
+        kb = self._acquire(user_id, pin=False)
+        self.enforce_budget()
+        return kb
+
+    def pin(self, user_id: str, load: bool = True) -> Optional[FractalKnowledgeBase]:
+        """
+        Fijar la KB mientras una petición la usa (liberar con unpin). Con
+        load=False solo el camino rápido: None si no está residente.
+        """
+        if not load:
+            with self._lock:
+                entry = self._resident.get(user_id)
+                if entry is None:
+                    return None
+                self._touch(user_id, entry)
+                entry.pins += 1
+                return entry.kb
+        kb = self._acquire(user_id, pin=True)
+        self.enforce_budget()
+        return kb
+
+    def hold(self, user_id: str) -> Callable[[], None]:
+        """
+        Un pin más sobre una KB ya fijada, para el worker que la usa: la
+        petición puede terminar (o cancelarse) antes que él. Devuelve su
+        unpin, que solo cuenta una vez.
+        """
+        with self._lock:
+            entry = self._resident.get(user_id)
+            if entry is None or not entry.pins:
+                raise RuntimeError(f"KB del usuario {user_id} no está fijada")
+            entry.pins += 1
+        once = threading.Lock()
+
+        def release() -> None:
+            if once.acquire(blocking=False):
+                self.unpin(user_id)
+
+        return release
+
+    def unpin(self, user_id: str) -> None:
+        with self._lock:
+            entry = self._resident.get(user_id)
+            if entry is not None and entry.pins:
+                entry.pins -= 1
+                entry.last_used = self.clock()
+
+    def _touch(self, user_id: str, entry: _Resident) -> None:
+        entry.last_used = self.clock()
+        self._resident.move_to_end(user_id)
+
+    def _acquire(self, user_id: str, pin: bool) -> FractalKnowledgeBase:
+        while True:
+            with self._lock:
+                entry = self._resident.get(user_id)
+                if entry is not None:
+                    self._touch(user_id, entry)
+                    if pin:
+                        entry.pins += 1
+                    return entry.kb
+                event = self._transit.get(user_id)
+                if event is None:
+                    event = self._transit[user_id] = threading.Event()
+                    break
+            event.wait()  # otro hilo la está cargando o volcando
+
+        try:
+            kb, wal = self._load(user_id)
+            with self._lock:
+                entry = self._resident[user_id] = _Resident(kb, wal, self.clock())
+                if pin:
+                    entry.pins += 1
+            return kb
+        finally:
+            with self._lock:
+                del self._transit[user_id]
+            event.set()
+
+    # -- disco ------------------------------------------------------------------
+
+    def _spill_paths(self, user_id: str):
+        base = os.path.join(self.spill_dir, self._key(user_id))
+        return base + '.akb', base + '.pkl'
+
+    def _load(self, user_id: str):
+        if self.wal_root:
+            # Recupera snapshot + cola del log si el usuario ya tenía KB
+            wal = KBWriteAheadLog.open(os.path.join(self.wal_root, self._key(user_id)))
+            self.stats['loaded' if wal.kb.universes else 'created'] += 1
+            logger.info(f"Opened durable KB for user {user_id} ({wal.stats['replayed']} WAL records replayed)")
+            return wal.kb, wal
+
+        binary_path, pickle_path = self._spill_paths(user_id)
+        if os.path.exists(binary_path):
+            kb = kb_binary.load(binary_path)
+            os.remove(binary_path)
+        elif os.path.exists(pickle_path):
+            with open(pickle_path, 'rb') as f:
+                kb = pickle.load(f)
+            os.remove(pickle_path)
+        else:
+            self.stats['created'] += 1
+            logger.info(f"Created new KB for user {user_id}")
+            return FractalKnowledgeBase(), None
+        self.stats['loaded'] += 1
+        logger.info(f"Reloaded KB for user {user_id} from spill")
+        return kb, None
+
+    def _spill(self, user_id: str, entry: _Resident) -> None:
+        if entry.wal is not None:
+            entry.wal.close(checkpoint=True)
+            return
+        if not entry.kb.universes:
+            return  # nada que volcar: la recarga crea una KB vacía
+        binary_path, pickle_path = self._spill_paths(user_id)
+        try:
+            kb_binary.save(entry.kb, binary_path)
+            path = binary_path
+        except ValueError:
+            # Valores no ternarios: volcado pickle (misma atomicidad)
+            with open(pickle_path + '.tmp', 'wb') as f:
+                pickle.dump(entry.kb, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(pickle_path + '.tmp', pickle_path)
+            path = pickle_path
+        self.stats['spilled_bytes'] += os.path.getsize(path)
+
+    # -- expulsión --------------------------------------------------------------
+
+    def evict(self, user_id: str) -> bool:
+        """Volcar a disco la KB de un usuario. False si no está residente o está fijada."""
+        with self._lock:
+            entry = self._resident.get(user_id)
+            if entry is None or entry.pins or user_id in self._transit:
+                return False
+            del self._resident[user_id]
+            event = self._transit[user_id] = threading.Event()
+        try:
+            self._spill(user_id, entry)
+        except Exception as e:
+            logger.error(f"Spill failed for user {user_id}: {e}; KB kept in memory")
+            with self._lock:
+                self._resident[user_id] = entry
+                self._resident.move_to_end(user_id, last=False)
+            return False
+        finally:
+            with self._lock:
+                del self._transit[user_id]
+            event.set()
+        self.stats['evicted'] += 1
+        if self.on_evict is not None:
+            self.on_evict(user_id)
+        return True
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            kbs = [entry.kb for entry in self._resident.values()]
+        return sum(self.estimate_bytes(kb) for kb in kbs)
+
+    def enforce_budget(self) -> int:
+        """Expulsar KB no fijadas, de la menos a la más reciente, hasta cumplir el presupuesto."""
+        evicted = 0
+        with self._lock:
+            candidates = [(user_id, entry.kb) for user_id, entry in self._resident.items()]
+        usage = sum(self.estimate_bytes(kb) for _, kb in candidates)
+        for user_id, kb in candidates:
+            if usage <= self.memory_budget_bytes:
+                break
+            size = self.estimate_bytes(kb)
+            if self.evict(user_id):
+                usage -= size
+                evicted += 1
+        return evicted
+
+    def sweep(self) -> int:
+        """Expulsar las KB ociosas más de idle_seconds y aplicar el presupuesto."""
+        evicted = 0
+        if self.idle_seconds is not None:
+            now = self.clock()
+            with self._lock:
+                idle = [user_id for user_id, entry in self._resident.items()
+                        if not entry.pins and now - entry.last_used > self.idle_seconds]
+            evicted += sum(1 for user_id in idle if self.evict(user_id))
+        return evicted + self.enforce_budget()
+
+    def close(self) -> None:
+        """Cerrar los WAL (con checkpoint) y soltar todas las KB."""
+        with self._lock:
+            entries = list(self._resident.items())
+            self._resident.clear()
+        for user_id, entry in entries:
+            if entry.wal is not None:
+                try:
+                    entry.wal.close(checkpoint=True)
+                except Exception as e:
+                    logger.error(f"WAL close failed for user {user_id}: {e}")
+        if self._own_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            pinned = sum(1 for entry in self._resident.values() if entry.pins)
+            resident = len(self._resident)
+        return {
+            **self.stats,
+            'resident': resident,
+            'pinned': pinned,
+            'resident_bytes_estimate': self.resident_bytes(),
+            'memory_budget_bytes': self.memory_budget_bytes,
+        }
@@ -18,6 +18,9 @@ Usa rotación Fibonacci para explorar múltiples caminos de corrección.
 
 from typing import List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass, field
+import heapq
+import itertools
+import time
 import numpy as np
 from enum import Enum
 
@@ -132,6 +135,11 @@ class Armonizador:
         # Confianzas ajustadas (inicialmente 1.0)
         self.confianzas_arquetipos: Dict[str, float] = {}
         self.confianzas_relatores: Dict[str, float] = {}
+        
+        # Cola de prioridad por espacio lógico para armonización acotada
+        # {espacio_id: [(-severidad, secuencia, Incoherencia)]}
+        self.pendientes: Dict[str, List[Tuple[float, int, Incoherencia]]] = {}
+        self._secuencia = itertools.count()
     
     def detectar_incoherencias(
         self, 
@@ -452,6 +460,113 @@ class Armonizador:
             "confianzas_relatores": dict(self.confianzas_relatores)
         }
     
+    def armonizar_lote_acotado(
+        self,
+        tensores: Optional[List[TensorFFE]] = None,
+        espacio_logico: str = "default",
+        presupuesto_ms: Optional[float] = None,
+        max_operaciones: Optional[int] = None
+    ) -> Dict:
+        """
+        Armoniza un lote con presupuesto de tiempo y/o de operaciones
+        
+        Las incoherencias detectadas entran en una cola de prioridad por
+        severidad del espacio lógico. Se corrigen en orden hasta agotar el
+        presupuesto; lo que queda pendiente se retoma en la siguiente
+        llamada (basta con pasar tensores=None para solo drenar la cola).
+        
+        Args:
+            tensores: Lote nuevo a armonizar (opcional)
+            espacio_logico: ID del espacio lógico
+            presupuesto_ms: Tiempo máximo de reloj en milisegundos (None = sin límite)
+            max_operaciones: Máximo de autocorrecciones a intentar (None = sin límite)
+        
+        Returns:
+            Reporte con correcciones aplicadas y backlog residual
+        """
+        inicio = time.perf_counter()
+        limite = inicio + presupuesto_ms / 1000.0 if presupuesto_ms is not None else None
+        
+        nuevas = self.detectar_incoherencias(tensores, espacio_logico) if tensores else []
+        self.encolar_incoherencias(nuevas, espacio_logico)
+        cola = self.pendientes[espacio_logico]
+        
+        correcciones: List[CorreccionPropuesta] = []
+        fallidas: List[Incoherencia] = []
+        operaciones = 0
+        agotado = False
+        
+        while cola:
+            if max_operaciones is not None and operaciones >= max_operaciones:
+                agotado = True
+                break
+            if limite is not None and time.perf_counter() >= limite:
+                agotado = True
+                break
+            
+            _, _, incoherencia = heapq.heappop(cola)
+            operaciones += 1
+            
+            correccion = self.autocorregir(incoherencia)
+            if correccion:
+                self.aprender_de_error(incoherencia, correccion)
+                correcciones.append(correccion)
+            else:
+                fallidas.append(incoherencia)
+        
+        return {
+            "coherente": not cola and not fallidas,
+            "completo": not cola,
+            "presupuesto_agotado": agotado,
+            "incoherencias_nuevas": len(nuevas),
+            "operaciones": operaciones,
+            "correcciones": len(correcciones),
+            "fallidas": len(fallidas),
+            "correcciones_aplicadas": [
+                {
+                    "tipo": c.incoherencia.tipo.value,
+                    "severidad": c.incoherencia.nivel_severidad,
+                    "coherencia": c.coherencia_resultante,
+                    "costo": c.costo_correccion
+                }
+                for c in correcciones
+            ],
+            "pendientes": len(cola),
+            "backlog": [
+                {
+                    "tipo": inc.tipo.value,
+                    "severidad": inc.nivel_severidad,
+                    "descripcion": inc.descripcion
+                }
+                for _, _, inc in sorted(cola)
+            ],
+            "tiempo_ms": (time.perf_counter() - inicio) * 1000.0,
+            "aprendizajes": len(self.historial_aprendizajes)
+        }
+    
+    def encolar_incoherencias(
+        self,
+        incoherencias: List[Incoherencia],
+        espacio_logico: str = "default"
+    ) -> int:
+        """
+        Añade incoherencias a la cola de prioridad del espacio lógico
+        
+        Returns:
+            Número de incoherencias pendientes tras encolar
+        """
+        cola = self.pendientes.setdefault(espacio_logico, [])
+        for incoherencia in incoherencias:
+            heapq.heappush(
+                cola,
+                (-incoherencia.nivel_severidad, next(self._secuencia), incoherencia)
+            )
+        return len(cola)
+    
+    def pendientes_en(self, espacio_logico: str = "default") -> int:
+        """Número de incoherencias pendientes en la cola del espacio lógico"""
+        return len(self.pendientes.get(espacio_logico, []))
+    
     # ========================================================================
     # MÉTODOS PRIVADOS - Detección de Incoherencias
     # ========================================================================
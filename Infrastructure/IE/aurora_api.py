@@ -19,11 +19,15 @@ from fastapi import FastAPI, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 import jwt
 import secrets
 import hashlib
 import time
+import asyncio
+import copy
+import threading
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import logging
 
@@ -37,11 +41,13 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from core import (
     FractalTensor,
     Trigate,
+    VectorizedTrigate,
     FractalKnowledgeBase,
     Evolver,
     Extender,
     Transcender,
     Armonizador,
+    TensorPoolManager,
     pattern0_create_fractal_cluster
 )
 
@@ -55,6 +61,10 @@ from adaptive_economics import (
     TRUST_REWARDS
 )
 
+from api_executor import ExecutionLayer, pattern0_job
+from api_engines import EnginePool
+from api_residency import KBResidencyManager
+
 # ===============================================================================
 # CONFIGURATION
 # ===============================================================================
@@ -64,10 +74,69 @@ JWT_SECRET = secrets.token_hex(32)
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Durabilidad de las KB: directorio raíz del write-ahead log (un subdirectorio
+# por usuario). Sin definir, las KB viven solo en memoria.
+KB_WAL_DIR = os.environ.get("AURORA_WAL_DIR")
+
+# Residencia de las KB: presupuesto de memoria, directorio de volcado (sin
+# WAL), inactividad tras la que se vuelcan y periodo del barrido de
+# mantenimiento (KB ociosas, sesiones expiradas, motores)
+KB_MEMORY_BUDGET_MB = float(os.environ.get("AURORA_KB_MEMORY_MB", 512))
+KB_SPILL_DIR = os.environ.get("AURORA_KB_SPILL_DIR")  # sin definir: directorio privado del proceso
+KB_IDLE_SECONDS = float(os.environ.get("AURORA_KB_IDLE_SECONDS", 1800))
+SWEEP_INTERVAL_SECONDS = float(os.environ.get("AURORA_SWEEP_SECONDS", 60))
+
+# Endpoints por lotes: máximo de elementos por petición
+MAX_BATCH_ITEMS = int(os.environ.get("AURORA_MAX_BATCH_ITEMS", 10000))
+
 # Logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("aurora.api")
 
+# Singletons del gateway (capa de ejecución, motores, residencia de las KB,
+# coordinador económico): se construyen en el arranque con init_gateway(),
+# no al importar. Con el contexto spawn cada worker del pool de procesos
+# reimporta el módulo principal; así solo ve definiciones.
+execution: Optional[ExecutionLayer] = None
+engines: Optional[EnginePool] = None
+residency: Optional[KBResidencyManager] = None
+economics_coordinator: Optional[AdaptiveEconomicsCoordinator] = None
+
+
+def init_gateway() -> None:
+    """Construir los singletons del gateway (idempotente)."""
+    global execution, engines, residency, economics_coordinator
+    if execution is not None:
+        return
+
+    # Capa de ejecución: el trabajo de CPU de los handlers sale del event loop
+    # (AURORA_THREAD_WORKERS, AURORA_PROCESS_WORKERS, AURORA_ENDPOINT_LIMITS)
+    execution = ExecutionLayer.from_env()
+
+    # Motores (Extender) de larga vida por KB de usuario: sus LUT y cachés se
+    # amortizan entre peticiones; los ociosos se descartan tras
+    # AURORA_ENGINE_IDLE_SECONDS
+    engines = EnginePool(
+        max_per_user=int(os.environ.get("AURORA_ENGINES_PER_USER", 4)),
+        max_engines=int(os.environ.get("AURORA_MAX_ENGINES", 256)),
+        idle_seconds=float(os.environ.get("AURORA_ENGINE_IDLE_SECONDS", 600))
+    )
+
+    # KB por usuario con presupuesto de memoria: las menos usadas se vuelcan a
+    # disco (o se cierra su WAL) y se recargan en la siguiente petición. Al
+    # volcar una KB se sueltan también sus motores.
+    residency = KBResidencyManager(
+        memory_budget_bytes=int(KB_MEMORY_BUDGET_MB * 1024 * 1024),
+        spill_dir=KB_SPILL_DIR,
+        wal_root=KB_WAL_DIR,
+        idle_seconds=KB_IDLE_SECONDS,
+        on_evict=engines.drop_user
+    )
+
+    # ADAPTIVE ECONOMICS COORDINATOR
+    # Sistema de gobernanza donde los usuarios entrenan modelos que votan sobre políticas
+    economics_coordinator = AdaptiveEconomicsCoordinator()
+
 # ===============================================================================
 # FASTAPI APP
 # ===============================================================================
@@ -96,8 +165,7 @@ app.add_middleware(
 # Sesiones activas: {token: session_data}
 active_sessions: Dict[str, Dict[str, Any]] = {}
 
-# Knowledge Bases por usuario: {user_id: FractalKnowledgeBase}
-user_kbs: Dict[str, FractalKnowledgeBase] = {}
+# Knowledge Bases por usuario: ver `residency` (KBResidencyManager)
 
 # Metrics
 metrics = {
@@ -107,9 +175,7 @@ metrics = {
     "kb_queries": 0
 }
 
-# ADAPTIVE ECONOMICS COORDINATOR
-# Sistema de gobernanza donde los usuarios entrenan modelos que votan sobre políticas
-economics_coordinator = AdaptiveEconomicsCoordinator()
+# Coordinador económico: ver init_gateway()
 
 # Modelos de usuarios: {user_id: model_id}
 user_models: Dict[str, str] = {}
@@ -148,9 +214,11 @@ class TensorQuery(BaseModel):
     Ms_query: Optional[List[int]] = Field(None, description="Vector Ms para búsqueda")
 
 class TensorSynthesis(BaseModel):
-    """Request para síntesis de tensors"""
-    tensor_a_key: str = Field(..., description="Key del tensor A")
-    tensor_b_key: str = Field(..., description="Key del tensor B")
+    """Request para síntesis de tensors (por keys o por arrays de vectores)"""
+    tensor_a_key: Optional[str] = Field(None, description="Key del tensor A")
+    tensor_b_key: Optional[str] = Field(None, description="Key del tensor B")
+    A: Optional[List[List[Optional[int]]]] = Field(None, description="Vectores A (misma longitud, NULL = null)")
+    B: Optional[List[List[Optional[int]]]] = Field(None, description="Vectores B, emparejados con A")
     space_id: str = Field("default", description="Espacio lógico")
 
 class ExtendQuery(BaseModel):
@@ -159,6 +227,28 @@ class ExtendQuery(BaseModel):
     space_id: str = Field("default", description="Espacio lógico")
     use_recursive: bool = Field(False, description="Usar red recursiva de deducción")
 
+class KBStoreItem(BaseModel):
+    """Arquetipo a almacenar (elemento de /kb/store_batch)"""
+    archetype_name: str = Field(..., description="Nombre del arquetipo")
+    tensor_data: Dict[str, Any] = Field(..., description="nivel_3, Ms, Ss y MetaM del tensor")
+    space_id: str = Field("default", description="Espacio lógico")
+
+class TensorCreateBatch(BaseModel):
+    """Lote de tensores a crear"""
+    items: List[TensorCreate] = Field(..., description="Tensores, en orden")
+
+class KBStoreBatch(BaseModel):
+    """Lote de arquetipos a almacenar"""
+    items: List[KBStoreItem] = Field(..., description="Arquetipos, en orden")
+
+class TensorQueryBatch(BaseModel):
+    """Lote de consultas a la KB"""
+    items: List[TensorQuery] = Field(..., description="Consultas, en orden")
+
+class ExtendQueryBatch(BaseModel):
+    """Lote de extensiones fractales"""
+    items: List[ExtendQuery] = Field(..., description="Extensiones, en orden")
+
 class CollaborativeTask(BaseModel):
     """Tarea colaborativa entre peers"""
     task_type: str = Field(..., description="Tipo de tarea (synthesis, training, etc)")
@@ -246,11 +336,320 @@ async def get_current_user(authorization: str = Header(None)):
     return payload
 
 def get_user_kb(user_id: str) -> FractalKnowledgeBase:
-    """Obtiene o crea la Knowledge Base del usuario"""
-    if user_id not in user_kbs:
-        user_kbs[user_id] = FractalKnowledgeBase()
-        logger.info(f"Created new KB for user {user_id}")
-    return user_kbs[user_id]
+    """Obtiene o crea la Knowledge Base del usuario (recargándola si estaba volcada)"""
+    return residency.get(user_id)
+
+async def _reload_pinned(user_id: str) -> FractalKnowledgeBase:
+    """
+    Recargar y fijar la KB en el pool de hilos. Si la petición se cancela
+    mientras tanto, el pin que toma el worker se suelta igualmente: lo hace
+    on_done o el handler, el que llegue después.
+    """
+    lock = threading.Lock()
+    state = {"pinned": False, "done": False, "abandoned": False}
+
+    def reload() -> FractalKnowledgeBase:
+        kb = residency.pin(user_id)
+        state["pinned"] = True
+        return kb
+
+    def done() -> None:
+        with lock:
+            state["done"] = True
+            orphan = state["abandoned"] and state["pinned"]
+        if orphan:
+            residency.unpin(user_id)
+
+    try:
+        return await execution.run("residency", reload, on_done=done)
+    except asyncio.CancelledError:
+        with lock:
+            state["abandoned"] = True
+            orphan = state["done"] and state["pinned"]
+        if orphan:
+            residency.unpin(user_id)
+        raise
+
+@asynccontextmanager
+async def user_kb(user_id: str):
+    """
+    KB del usuario fijada en memoria mientras dura la petición. Si estaba
+    volcada a disco se recarga en el pool de hilos, fuera del event loop.
+    Los workers que la usan toman su propio pin con kb_worker_done().
+    """
+    kb = residency.pin(user_id, load=False)
+    if kb is None:
+        kb = await _reload_pinned(user_id)
+    try:
+        yield kb
+    finally:
+        residency.unpin(user_id)
+
+async def economics_read(fn: Callable[..., Any], *args) -> Any:
+    """
+    Lectura del coordinador económico en su carril "economics": serializada
+    con las mutaciones (que corren en workers) y devuelta como copia, para
+    no serializar en el loop estructuras que un worker está modificando.
+    """
+    return await execution.run("economics", lambda: copy.deepcopy(fn(*args)))
+
+def kb_worker_done(user_id: str, *also: Callable[[], Any]) -> Callable[[], None]:
+    """
+    on_done para un worker que usa la KB fijada del usuario: la mantiene
+    fijada (no expulsable) hasta que el worker termina, aunque la petición
+    se cancele antes, y suelta también `also` (p. ej. el motor prestado).
+    """
+    unpin = residency.hold(user_id)
+
+    def done() -> None:
+        for release in also:
+            release()
+        unpin()
+
+    return done
+
+def sweep_expired_sessions() -> int:
+    """Elimina las sesiones (tokens) expiradas. Devuelve cuántas."""
+    now = datetime.utcnow().isoformat()
+    expired = [token for token, session in list(active_sessions.items()) if session["expires_at"] < now]
+    for token in expired:
+        active_sessions.pop(token, None)
+    metrics["active_sessions"] = len(active_sessions)
+    return len(expired)
+
+def check_batch_size(items: List[Any]) -> None:
+    """Rechaza lotes vacíos o mayores que MAX_BATCH_ITEMS"""
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(items)} > {MAX_BATCH_ITEMS} items")
+
+def batch_response(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Respuesta de un lote: resultados en el orden de entrada, con su índice"""
+    for index, result in enumerate(results):
+        result["index"] = index
+    failed = sum(1 for result in results if not result["success"])
+    return {"success": True, "count": len(results), "failed": failed, "results": results}
+
+# -- Elementos compartidos por los endpoints simples y por lotes ----------------
+
+def tensor_view(tensor: FractalTensor) -> Dict[str, Any]:
+    return {
+        "nivel_3": tensor.nivel_3,
+        "Ms": tensor.Ms if hasattr(tensor, 'Ms') else None,
+        "Ss": tensor.Ss if hasattr(tensor, 'Ss') else None
+    }
+
+def create_tensor_item(tensor_req: TensorCreate, user_id: str) -> Dict[str, Any]:
+    """Crea un tensor (aleatorio o desde nivel_3) y su respuesta"""
+    if tensor_req.random:
+        tensor = FractalTensor.random()
+    else:
+        tensor = FractalTensor(nivel_3=tensor_req.nivel_3 or [[0, 0, 0]])
+
+    tensor.metadata["created_by"] = user_id
+    tensor.metadata["created_at"] = datetime.utcnow().isoformat()
+
+    return {
+        "success": True,
+        "tensor_key": f"tensor_{secrets.token_hex(8)}",
+        "tensor": {
+            "nivel_3": tensor.nivel_3,
+            "nivel_9": tensor.nivel_9 if hasattr(tensor, 'nivel_9') else None,
+            "nivel_1": tensor.nivel_1 if hasattr(tensor, 'nivel_1') else None,
+            "Ms": tensor.Ms if hasattr(tensor, 'Ms') else None,
+            "Ss": tensor.Ss if hasattr(tensor, 'Ss') else None,
+            "metadata": tensor.metadata
+        }
+    }
+
+def tensor_from_data(tensor_data: Dict[str, Any]) -> FractalTensor:
+    """Tensor de un arquetipo a almacenar desde su representación JSON"""
+    tensor = FractalTensor(nivel_3=tensor_data.get("nivel_3", [[0, 0, 0]]))
+    if "Ms" in tensor_data:
+        tensor.Ms = tensor_data["Ms"]
+    if "Ss" in tensor_data:
+        tensor.Ss = tensor_data["Ss"]
+    if "MetaM" in tensor_data:
+        tensor.MetaM = tensor_data["MetaM"]
+    return tensor
+
+def query_item(universe, query: TensorQuery) -> Dict[str, Any]:
+    """Resuelve una consulta contra el snapshot de un universo"""
+    if query.archetype_name:
+        archetype = universe.find_archetype_by_name(query.archetype_name)
+        if not archetype:
+            return {
+                "success": False,
+                "message": f"Archetype '{query.archetype_name}' not found"
+            }
+        return {
+            "success": True,
+            "archetype": {"name": query.archetype_name, "tensor": tensor_view(archetype)}
+        }
+
+    elif query.Ms_query:
+        archetype = universe.get_archetype_by_ms(query.Ms_query)
+        if not archetype:
+            return {
+                "success": False,
+                "message": "No archetype found for given Ms"
+            }
+        return {
+            "success": True,
+            "archetype": {"tensor": tensor_view(archetype)}
+        }
+
+    return {
+        "success": False,
+        "message": "Must provide either archetype_name or Ms_query"
+    }
+
+def synthesize_vectors(A: List[List[Optional[int]]], B: List[List[Optional[int]]]):
+    """
+    M y S de cada par (A[i], B[i]) en una sola llamada a VectorizedTrigate;
+    sin NumPy, Trigate escalar vector a vector.
+    """
+    if len(A) != len(B) or any(len(a) != len(A[0]) for a in A + B):
+        raise ValueError("A and B must contain the same number of vectors, all of the same length")
+    if any(v not in (0, 1, None) for vector in A + B for v in vector):
+        raise ValueError("Vector values must be 0, 1 or null")
+    try:
+        vt = VectorizedTrigate()
+    except ImportError:
+        trigate = Trigate()
+        pairs = [trigate.synthesize(a, b) for a, b in zip(A, B)]
+        return [M for M, _ in pairs], [S for _, S in pairs]
+    M, S = vt.synthesize(vt.encode(A), vt.encode(B))
+    return vt.decode(M), vt.decode(S)
+
+def extend_view(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "method": result.get("reconstruction_method", "unknown"),
+        "tensor": tensor_view(result["reconstructed_tensor"]),
+        "log": result.get("log", []),
+        "coherence": result.get("coherence"),
+        "converged": result.get("converged")
+    }
+
+# -- Lotes (se ejecutan enteros en la capa de ejecución) ------------------------
+
+def create_tensor_batch(items: List[TensorCreate], user_id: str) -> List[Dict[str, Any]]:
+    results = []
+    for item in items:
+        try:
+            results.append(create_tensor_item(item, user_id))
+        except Exception as e:
+            results.append({"success": False, "error": str(e)})
+    return results
+
+def store_batch(kb: FractalKnowledgeBase, items: List[KBStoreItem]) -> List[Dict[str, Any]]:
+    """
+    Almacena un lote con una ingesta en bloque por espacio
+    (add_archetypes_bulk, mismo estado final que fila a fila). Las filas
+    incoherentes se saltan y se informan como error de su elemento.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    by_space: Dict[str, List[tuple]] = {}
+    for index, item in enumerate(items):
+        try:
+            tensor = tensor_from_data(item.tensor_data)
+        except Exception as e:
+            results[index] = {"success": False, "error": str(e)}
+            continue
+        by_space.setdefault(item.space_id, []).append((index, item.archetype_name, tensor))
+
+    for space_id, rows in by_space.items():
+        try:
+            report = kb.add_archetypes_bulk(
+                space_id,
+                [tensor for _, _, tensor in rows],
+                Ss=[tensor.Ss if tensor.Ss else [0, 0, 0] for _, _, tensor in rows],
+                names=[name for _, name, _ in rows],
+                strict=False
+            )
+        except Exception as e:
+            for index, _, _ in rows:
+                results[index] = {"success": False, "error": str(e)}
+            continue
+
+        conflicts = {conflict['row']: conflict for conflict in report['conflicts']}
+        generation = kb.universe_generation(space_id)
+        for row, (index, name, _) in enumerate(rows):
+            conflict = conflicts.get(row)
+            if conflict:
+                results[index] = {
+                    "success": False,
+                    "error": f"Coherence violation: MetaM distinct for Ms {conflict['Ms']}. "
+                             f"Existing: {conflict['expected_MetaM']}, New: {conflict['MetaM']}"
+                }
+            else:
+                results[index] = {
+                    "success": True,
+                    "message": f"Archetype '{name}' stored successfully",
+                    "space_id": space_id,
+                    "generation": generation
+                }
+    return results
+
+def query_batch(kb: FractalKnowledgeBase, items: List[TensorQuery]) -> List[Dict[str, Any]]:
+    """Consultas de un lote: un snapshot por espacio para todo el lote"""
+    snapshots: Dict[str, Any] = {}
+    results = []
+    for item in items:
+        try:
+            universe = snapshots.get(item.space_id)
+            if universe is None:
+                universe = snapshots[item.space_id] = kb.snapshot(item.space_id)
+            results.append(query_item(universe, item))
+        except Exception as e:
+            results.append({"success": False, "error": str(e)})
+    return results
+
+def extend_batch(extender: Extender, items: List[ExtendQuery]) -> List[Dict[str, Any]]:
+    """
+    Extensiones de un lote: las consultas repetidas se resuelven una vez y
+    las recursivas de cada espacio van juntas a
+    extend_fractal_recursive_batch. Si el lote recursivo falla, se repite
+    elemento a elemento para aislar el error.
+    """
+    def attempt(fn, ss_query, context):
+        try:
+            return fn(ss_query, context)
+        except Exception as e:
+            return e
+
+    # (espacio, recursiva, Ss) -> índices de entrada
+    groups: Dict[tuple, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault((item.space_id, item.use_recursive, tuple(item.ss_query)), []).append(index)
+
+    resolved: Dict[tuple, Any] = {}
+    recursive_by_space: Dict[str, List[tuple]] = {}
+    for key in groups:
+        if key[1]:
+            recursive_by_space.setdefault(key[0], []).append(key)
+        else:
+            resolved[key] = attempt(extender.extend_fractal, list(key[2]), {"space_id": key[0]})
+
+    for space_id, keys in recursive_by_space.items():
+        context = {"space_id": space_id}
+        try:
+            resolved.update(zip(keys, extender.extend_fractal_recursive_batch([list(key[2]) for key in keys], context)))
+        except Exception:
+            for key in keys:
+                resolved[key] = attempt(extender.extend_fractal_recursive, list(key[2]), context)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    for key, indices in groups.items():
+        result = resolved[key]
+        if isinstance(result, Exception):
+            payload = {"success": False, "error": str(result)}
+        else:
+            payload = {"success": True, "result": extend_view(result)}
+        for index in indices:
+            results[index] = dict(payload)
+    return results
 
 # ===============================================================================
 # AUTHENTICATION ENDPOINTS
@@ -287,8 +686,7 @@ async def login(auth_req: AuthRequest):
     
     metrics["active_sessions"] = len(active_sessions)
     
-    # Inicializar Knowledge Base del usuario
-    get_user_kb(user_id)
+    # La Knowledge Base del usuario se carga (o crea) en su primera petición
     
     logger.info(f"🐹 User {user_id} authenticated with peer_id {auth_req.peer_id}")
     
@@ -341,31 +739,7 @@ async def create_tensor(
     metrics["tensor_operations"] += 1
     
     try:
-        if tensor_req.random:
-            tensor = FractalTensor.random()
-        else:
-            tensor = FractalTensor(nivel_3=tensor_req.nivel_3 or [[0, 0, 0]])
-        
-        # Guardar en KB del usuario
-        kb = get_user_kb(current_user["user_id"])
-        tensor_key = f"tensor_{secrets.token_hex(8)}"
-        
-        # Almacenar
-        tensor.metadata["created_by"] = current_user["user_id"]
-        tensor.metadata["created_at"] = datetime.utcnow().isoformat()
-        
-        return {
-            "success": True,
-            "tensor_key": tensor_key,
-            "tensor": {
-                "nivel_3": tensor.nivel_3,
-                "nivel_9": tensor.nivel_9 if hasattr(tensor, 'nivel_9') else None,
-                "nivel_1": tensor.nivel_1 if hasattr(tensor, 'nivel_1') else None,
-                "Ms": tensor.Ms if hasattr(tensor, 'Ms') else None,
-                "Ss": tensor.Ss if hasattr(tensor, 'Ss') else None,
-                "metadata": tensor.metadata
-            }
-        }
+        return create_tensor_item(tensor_req, current_user["user_id"])
     except Exception as e:
         logger.error(f"Error creating tensor: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -375,10 +749,25 @@ async def synthesize_tensors(
     synthesis_req: TensorSynthesis,
     current_user: Dict = Depends(get_current_user)
 ):
-    """Sintetiza dos tensores usando Trigate"""
-    metrics["tensor_operations"] += 1
+    """
+    Sintetiza tensores con Trigate. Con arrays A y B (miles de vectores
+    de cualquier longitud) la síntesis es vectorizada y devuelve M y S por
+    par, en orden.
+    """
+    if (synthesis_req.A is None) != (synthesis_req.B is None):
+        raise HTTPException(status_code=400, detail="A and B must be given together")
+    metrics["tensor_operations"] += len(synthesis_req.A) if synthesis_req.A is not None else 1
     
     try:
+        if synthesis_req.A is not None:
+            if not synthesis_req.A:
+                return {"success": True, "count": 0, "M": [], "S": []}
+            try:
+                M, S = await execution.run("tensors", synthesize_vectors, synthesis_req.A, synthesis_req.B)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return {"success": True, "count": len(M), "M": M, "S": S}
+
         # Crear tensores de ejemplo (en producción, recuperar de KB)
         tensor_a = FractalTensor.random()
         tensor_b = FractalTensor.random()
@@ -407,6 +796,8 @@ async def synthesize_tensors(
                 }
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in synthesis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -426,30 +817,31 @@ async def store_archetype(
     metrics["kb_queries"] += 1
     
     try:
-        kb = get_user_kb(current_user["user_id"])
+        async with user_kb(current_user["user_id"]) as kb:
         
-        # Crear tensor desde data
-        tensor = FractalTensor(nivel_3=tensor_data.get("nivel_3", [[0, 0, 0]]))
-        if "Ms" in tensor_data:
-            tensor.Ms = tensor_data["Ms"]
-        if "Ss" in tensor_data:
-            tensor.Ss = tensor_data["Ss"]
+            # Crear tensor desde data
+            tensor = tensor_from_data(tensor_data)
         
-        # Almacenar
-        kb.add_archetype(
-            space_id=space_id,
-            name=archetype_name,
-            archetype_tensor=tensor,
-            Ss=tensor.Ss if hasattr(tensor, 'Ss') and tensor.Ss else [0, 0, 0]
-        )
+            # Almacenar (indexar los patrones comodín es CPU: fuera del loop)
+            await execution.run(
+                "kb",
+                kb.add_archetype,
+                space_id=space_id,
+                name=archetype_name,
+                archetype_tensor=tensor,
+                Ss=tensor.Ss if hasattr(tensor, 'Ss') and tensor.Ss else [0, 0, 0],
+                on_done=kb_worker_done(current_user["user_id"])
+            )
         
-        logger.info(f"Stored archetype '{archetype_name}' for user {current_user['user_id']}")
+            logger.info(f"Stored archetype '{archetype_name}' for user {current_user['user_id']}")
         
-        return {
-            "success": True,
-            "message": f"Archetype '{archetype_name}' stored successfully",
-            "space_id": space_id
-        }
+            return {
+                "success": True,
+                "message": f"Archetype '{archetype_name}' stored successfully",
+                "space_id": space_id,
+                "generation": kb.universe_generation(space_id),
+                "kb_generation": kb.generation
+            }
     except Exception as e:
         logger.error(f"Error storing archetype: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -463,51 +855,8 @@ async def query_archetype(
     metrics["kb_queries"] += 1
     
     try:
-        kb = get_user_kb(current_user["user_id"])
-        
-        if query.archetype_name:
-            archetype = kb.get_archetype(query.space_id, query.archetype_name)
-            if not archetype:
-                return {
-                    "success": False,
-                    "message": f"Archetype '{query.archetype_name}' not found"
-                }
-            
-            return {
-                "success": True,
-                "archetype": {
-                    "name": query.archetype_name,
-                    "tensor": {
-                        "nivel_3": archetype.nivel_3,
-                        "Ms": archetype.Ms if hasattr(archetype, 'Ms') else None,
-                        "Ss": archetype.Ss if hasattr(archetype, 'Ss') else None
-                    }
-                }
-            }
-        
-        elif query.Ms_query:
-            archetype = kb.get_archetype_by_ms(query.space_id, query.Ms_query)
-            if not archetype:
-                return {
-                    "success": False,
-                    "message": "No archetype found for given Ms"
-                }
-            
-            return {
-                "success": True,
-                "archetype": {
-                    "tensor": {
-                        "nivel_3": archetype.nivel_3,
-                        "Ms": archetype.Ms if hasattr(archetype, 'Ms') else None,
-                        "Ss": archetype.Ss if hasattr(archetype, 'Ss') else None
-                    }
-                }
-            }
-        
-        return {
-            "success": False,
-            "message": "Must provide either archetype_name or Ms_query"
-        }
+        async with user_kb(current_user["user_id"]) as kb:
+            return query_item(kb.snapshot(query.space_id), query)
         
     except Exception as e:
         logger.error(f"Error querying KB: {e}")
@@ -526,30 +875,17 @@ async def extend_fractal(
     metrics["tensor_operations"] += 1
     
     try:
-        kb = get_user_kb(current_user["user_id"])
-        extender = Extender(knowledge_base=kb)
-        
-        context = {"space_id": extend_req.space_id}
+        async with user_kb(current_user["user_id"]) as kb:
+            context = {"space_id": extend_req.space_id}
         
-        if extend_req.use_recursive:
-            result = extender.extend_fractal_recursive(extend_req.ss_query, context)
-        else:
-            result = extender.extend_fractal(extend_req.ss_query, context)
+            # El motor vuelve al pool cuando termina el worker, no al salir
+            # del handler: si la petición se cancela, el worker aún lo usa
+            extender, give_back = engines.checkout(current_user["user_id"], kb)
+            extend = extender.extend_fractal_recursive if extend_req.use_recursive else extender.extend_fractal
+            result = await execution.run("extend", extend, extend_req.ss_query, context,
+                                         on_done=kb_worker_done(current_user["user_id"], give_back))
         
-        return {
-            "success": True,
-            "result": {
-                "method": result.get("reconstruction_method", "unknown"),
-                "tensor": {
-                    "nivel_3": result["reconstructed_tensor"].nivel_3,
-                    "Ms": result["reconstructed_tensor"].Ms if hasattr(result["reconstructed_tensor"], 'Ms') else None,
-                    "Ss": result["reconstructed_tensor"].Ss if hasattr(result["reconstructed_tensor"], 'Ss') else None
-                },
-                "log": result.get("log", []),
-                "coherence": result.get("coherence"),
-                "converged": result.get("converged")
-            }
-        }
+            return {"success": True, "result": extend_view(result)}
     except Exception as e:
         logger.error(f"Error in extend operation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -564,26 +900,104 @@ async def create_pattern0_cluster(
     metrics["tensor_operations"] += 1
     
     try:
-        tensors = pattern0_create_fractal_cluster(
-            space_id=space_id,
-            num_tensors=num_tensors
-        )
+        # Trabajo pesado y autocontenido: pool de procesos
+        job = await execution.run("pattern0", pattern0_job, space_id, num_tensors, kind="process")
         
         return {
             "success": True,
-            "cluster": [
-                {
-                    "nivel_3": t.nivel_3,
-                    "metadata": t.metadata
-                }
-                for t in tensors
-            ],
-            "message": f"Created ethical cluster with {len(tensors)} tensors"
+            "cluster": job["cluster"],
+            # Raíz Merkle del cluster: verificable por tensor o subárbol
+            "cluster_signature": job["cluster_signature"],
+            "message": f"Created ethical cluster with {len(job['cluster'])} tensors"
         }
     except Exception as e:
         logger.error(f"Error creating Pattern 0 cluster: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ===============================================================================
+# BATCH OPERATIONS
+# ===============================================================================
+#
+# Variantes por lotes de create / store / query / extend: un token, una KB
+# fijada y una sola llamada a la capa de ejecución por petición. Los
+# resultados vuelven en el orden de entrada; un elemento que falla lleva
+# {"success": False, "error": ...} sin afectar al resto.
+
+@app.post("/api/v1/tensors/create_batch")
+async def create_tensors_batch(
+    batch: TensorCreateBatch,
+    current_user: Dict = Depends(get_current_user)
+):
+    """Crea un lote de tensores fractales"""
+    check_batch_size(batch.items)
+    metrics["tensor_operations"] += len(batch.items)
+
+    try:
+        results = await execution.run("tensors", create_tensor_batch, batch.items, current_user["user_id"])
+        return batch_response(results)
+    except Exception as e:
+        logger.error(f"Error creating tensor batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/kb/store_batch")
+async def store_archetypes_batch(
+    batch: KBStoreBatch,
+    current_user: Dict = Depends(get_current_user)
+):
+    """Almacena un lote de arquetipos (ingesta en bloque por espacio)"""
+    check_batch_size(batch.items)
+    metrics["kb_queries"] += len(batch.items)
+
+    try:
+        async with user_kb(current_user["user_id"]) as kb:
+            results = await execution.run("kb", store_batch, kb, batch.items,
+                                          on_done=kb_worker_done(current_user["user_id"]))
+            response = batch_response(results)
+            response["kb_generation"] = kb.generation
+
+        logger.info(f"Stored {response['count'] - response['failed']}/{response['count']} archetypes for user {current_user['user_id']}")
+        return response
+    except Exception as e:
+        logger.error(f"Error storing archetype batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/kb/query_batch")
+async def query_archetypes_batch(
+    batch: TensorQueryBatch,
+    current_user: Dict = Depends(get_current_user)
+):
+    """Consulta un lote de arquetipos en la Knowledge Base"""
+    check_batch_size(batch.items)
+    metrics["kb_queries"] += len(batch.items)
+
+    try:
+        async with user_kb(current_user["user_id"]) as kb:
+            results = await execution.run("kb", query_batch, kb, batch.items,
+                                          on_done=kb_worker_done(current_user["user_id"]))
+        return batch_response(results)
+    except Exception as e:
+        logger.error(f"Error querying KB batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/aurora/extend_batch")
+async def extend_fractal_batch(
+    batch: ExtendQueryBatch,
+    current_user: Dict = Depends(get_current_user)
+):
+    """Extiende un lote de tensores con un único Extender del pool"""
+    check_batch_size(batch.items)
+    metrics["tensor_operations"] += len(batch.items)
+
+    try:
+        async with user_kb(current_user["user_id"]) as kb:
+            extender, give_back = engines.checkout(current_user["user_id"], kb)
+            results = await execution.run("extend", extend_batch, extender, batch.items,
+                                          on_done=kb_worker_done(current_user["user_id"], give_back))
+        return batch_response(results)
+    except Exception as e:
+        logger.error(f"Error in extend batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ===============================================================================
 # COLLABORATIVE OPERATIONS (P2P)
 # ===============================================================================
@@ -632,7 +1046,7 @@ async def register_user_model(current_user: Dict = Depends(get_current_user)):
         }
     
     # Registrar modelo nuevo
-    model_id = economics_coordinator.registrar_modelo_usuario(peer_id)
+    model_id = await execution.run("economics", economics_coordinator.registrar_modelo_usuario, peer_id)
     user_models[user_id] = model_id
     
     logger.info(f"🧠 User {user_id} registered model {model_id}")
@@ -669,7 +1083,7 @@ async def train_user_model(
     model_id = user_models[user_id]
     
     # Entrenar modelo
-    economics_coordinator.entrenar_modelo_con_interaccion(model_id, request.interaccion)
+    await execution.run("economics", economics_coordinator.entrenar_modelo_con_interaccion, model_id, request.interaccion)
     
     logger.info(f"🎓 Model {model_id} trained with interaction: {request.interaccion.get('tipo', 'unknown')}")
     
@@ -705,10 +1119,10 @@ async def vote_on_policy(
     model_id = user_models[user_id]
     
     # Votar
-    economics_coordinator.votar_politica(model_id, request.politica, request.valor_propuesto)
+    await execution.run("economics", economics_coordinator.votar_politica, model_id, request.politica, request.valor_propuesto)
     
     # Obtener valor consensuado actual
-    valor_actual = economics_coordinator.governance.obtener_politica_actual(request.politica)
+    valor_actual = await economics_read(economics_coordinator.governance.obtener_politica_actual, request.politica)
     
     logger.info(f"🗳️  Model {model_id} voted: {request.politica} = {request.valor_propuesto}")
     
@@ -728,7 +1142,7 @@ async def get_current_policies(current_user: Dict = Depends(get_current_user)):
     🔑 IMPORTANTE: Estos valores NO están hardcoded.
     Son el consenso emergente de todos los modelos entrenados por usuarios.
     """
-    metricas = economics_coordinator.obtener_metricas()
+    metricas = await economics_read(economics_coordinator.obtener_metricas)
     
     return {
         "success": True,
@@ -747,7 +1161,7 @@ async def get_policy_history(
     Obtiene el histórico de evolución de una política.
     Permite ver cómo ha cambiado con el tiempo según los votos de modelos.
     """
-    historico = economics_coordinator.obtener_evolucion_politica(nombre)
+    historico = await economics_read(economics_coordinator.obtener_evolucion_politica, nombre)
     
     if not historico:
         raise HTTPException(status_code=404, detail=f"Policy '{nombre}' not found")
@@ -777,21 +1191,23 @@ async def process_network_block(
     
     🔑 Este endpoint es para validadores/coordinadores de la red.
     """
-    # Crear estado de red
-    estado = NetworkState(
-        timestamp=datetime.utcnow(),
-        nodos_activos=report.nodos_activos,
-        latencia_promedio_ms=report.latencia_promedio_ms,
-        operaciones_por_hora=report.operaciones_por_hora,
-        coherencia_promedio=report.coherencia_promedio,
-        supply_merit=economics_coordinator.supplies["MERIT"],
-        supply_mind=economics_coordinator.supplies["MIND"],
-        supply_trust=economics_coordinator.supplies["TRUST"],
-        fees_acumuladas=report.fees_acumuladas
-    )
-    
-    # Procesar bloque con políticas aprendidas
-    resultado = economics_coordinator.procesar_bloque(estado)
+    def procesar() -> Dict[str, Any]:
+        # Crear estado de red (supplies leídos en el mismo carril que los actualiza)
+        estado = NetworkState(
+            timestamp=datetime.utcnow(),
+            nodos_activos=report.nodos_activos,
+            latencia_promedio_ms=report.latencia_promedio_ms,
+            operaciones_por_hora=report.operaciones_por_hora,
+            coherencia_promedio=report.coherencia_promedio,
+            supply_merit=economics_coordinator.supplies["MERIT"],
+            supply_mind=economics_coordinator.supplies["MIND"],
+            supply_trust=economics_coordinator.supplies["TRUST"],
+            fees_acumuladas=report.fees_acumuladas
+        )
+        # Procesar bloque con políticas aprendidas
+        return copy.deepcopy(economics_coordinator.procesar_bloque(estado))
+
+    resultado = await execution.run("economics", procesar)
     
     logger.info(f"🔗 Block processed: MERIT +{resultado['emisiones']['MERIT']:.2f} -{resultado['quemas']['MERIT']:.2f}")
     
@@ -819,7 +1235,9 @@ async def reward_compute_operation(
     user_id = current_user["user_id"]
     
     # Calcular recompensa
-    recompensa = economics_coordinator.emitir_recompensa_computo(
+    recompensa = await execution.run(
+        "economics",
+        economics_coordinator.emitir_recompensa_computo,
         tipo_operacion=request.tipo_operacion,
         complejidad=request.complejidad,
         coherencia=request.coherencia,
@@ -858,7 +1276,9 @@ async def validate_trust_interaction(
     peer_a = current_user["peer_id"]
     
     # Validar y emitir TRUST
-    valida, cantidad = economics_coordinator.emitir_trust(
+    valida, cantidad = await execution.run(
+        "economics",
+        economics_coordinator.emitir_trust,
         tipo=request.tipo,
         peer_a=peer_a,
         peer_b=request.peer_b,
@@ -892,7 +1312,7 @@ async def get_token_supplies(current_user: Dict = Depends(get_current_user)):
     """
     return {
         "success": True,
-        "supplies": economics_coordinator.supplies,
+        "supplies": await economics_read(lambda: economics_coordinator.supplies),
         "configs": {
             "MERIT": {
                 "symbol": MERIT_CONFIG.symbol,
@@ -927,16 +1347,21 @@ async def health_check():
 @app.get("/api/v1/metrics")
 async def get_metrics(current_user: Dict = Depends(get_current_user)):
     """Obtiene métricas del sistema (incluye gobernanza económica)"""
-    econ_metrics = economics_coordinator.obtener_metricas()
+    econ_metrics = await economics_read(economics_coordinator.obtener_metricas)
     
     return {
         "success": True,
         "metrics": {
             **metrics,
             "timestamp": datetime.utcnow().isoformat(),
-            "user_kbs": len(user_kbs),
+            "user_kbs": len(residency),
             "user_models": len(user_models)
         },
+        # KB residentes, volcadas/recargadas y memoria estimada frente al presupuesto
+        "kb_residency": residency.summary(),
+        # Ocupación y percentiles de cola/ejecución por endpoint
+        "executor": execution.stats(),
+        "engines": engines.summary(),
         "economics": {
             "supplies": econ_metrics["supplies"],
             "gobernanza": econ_metrics["gobernanza"],
@@ -948,8 +1373,31 @@ async def get_metrics(current_user: Dict = Depends(get_current_user)):
 # STARTUP
 # ===============================================================================
 
+_maintenance_task: Optional[asyncio.Task] = None
+
+async def maintenance_loop():
+    """Barrido periódico: sesiones expiradas, motores ociosos y KB ociosas o sobre presupuesto."""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            sessions = sweep_expired_sessions()
+            engines.sweep()
+            spilled = await execution.run("residency", residency.sweep)
+            if sessions or spilled:
+                logger.info(f"🧹 Maintenance: {sessions} expired sessions, {spilled} KBs spilled to disk")
+        except Exception as e:
+            logger.error(f"Maintenance sweep failed: {e}")
+
 @app.on_event("startup")
 async def startup_event():
+    global _maintenance_task
+    init_gateway()
+    # Volcados huérfanos de un proceso anterior (solo con AURORA_KB_SPILL_DIR;
+    # el directorio por defecto es privado y nuevo)
+    stale = residency.remove_stale_spills()
+    if stale:
+        logger.info(f"🧹 Removed {stale} stale KB spill files from {residency.spill_dir}")
+    _maintenance_task = asyncio.create_task(maintenance_loop())
     logger.info("🌟 Aurora IE API Gateway started!")
     logger.info(f"📡 Docs available at: /docs")
     logger.info(f"🔐 JWT Secret initialized")
@@ -961,6 +1409,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("🐹 Aurora IE API Gateway shutting down...")
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+    residency.close()
+    execution.shutdown()
 
 # ===============================================================================
 # MAIN
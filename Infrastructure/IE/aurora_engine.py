@@ -4,7 +4,7 @@ Aurora Engine: Orquestador Cognitivo Completo
 
 Sistema funcional completo que integra:
 - Ciclo Cognitivo (Transcender → Evolver → KB → Extender)
-- Persistencia (JSON/Pickle)
+- Persistencia (JSON/Pickle/binario columnar)
 - API de alto nivel
 - Métricas y observabilidad
 - Tests integrados
@@ -15,10 +15,17 @@ Author: Aurora Alliance
 Version: 1.0.0
 """
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Optional, Union
 import json
 import pickle
 import logging
+import queue
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, asdict
@@ -37,6 +44,8 @@ try:
         pattern0_create_fractal_cluster,
         PHI
     )
+    from . import kb_binary
+    from .kb_wal import KBWriteAheadLog
 except ImportError:
     from core import (
         FractalTensor, 
@@ -50,6 +59,8 @@ except ImportError:
         pattern0_create_fractal_cluster,
         PHI
     )
+    import kb_binary
+    from kb_wal import KBWriteAheadLog
 
 # ===============================================================================
 # METRICS & OBSERVABILITY
@@ -68,15 +79,128 @@ class CognitiveMetrics:
     def to_dict(self) -> dict:
         return asdict(self)
 
+class LatencyHistogram:
+    """
+    Histograma de latencias estilo HDR: cubetas log-lineales de memoria fija.
+    
+    Cada potencia de 2 se divide en 2**sub_bucket_bits cubetas, así que el
+    error relativo de un percentil es < 2**-sub_bucket_bits (≈6% con 4 bits).
+    record() es O(1) y percentiles() recorre un número fijo de cubetas,
+    independiente de cuántas muestras se hayan registrado.
+    """
+    
+    def __init__(self, max_value_us: int = 3_600_000_000, sub_bucket_bits: int = 4):
+        self.sub_buckets = 1 << sub_bucket_bits
+        self.max_value_us = max_value_us
+        self.counts = [0] * (self._index(max_value_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+    
+    def _index(self, value: int) -> int:
+        sub = self.sub_buckets
+        if value < 2 * sub:
+            return value
+        shift = value.bit_length() - sub.bit_length()
+        return (shift + 1) * sub + (value >> shift) - sub
+    
+    def _value(self, index: int) -> float:
+        """Punto medio del rango de valores de una cubeta."""
+        sub = self.sub_buckets
+        if index < 2 * sub:
+            return float(index)
+        shift = index // sub - 1
+        low = (index % sub + sub) << shift
+        return low + ((1 << shift) - 1) / 2
+    
+    def record(self, latency_ms: float) -> None:
+        value = min(max(int(latency_ms * 1000), 0), self.max_value_us)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        if value > self.max_us:
+            self.max_us = value
+    
+    def percentiles(self, quantiles=(0.5, 0.9, 0.99)) -> Dict[float, float]:
+        """Percentiles en ms (una sola pasada sobre las cubetas)."""
+        result = {}
+        if not self.count:
+            return {q: 0.0 for q in quantiles}
+        targets = sorted((max(1, int(q * self.count + 0.999999)), q) for q in quantiles)
+        seen, t = 0, 0
+        for index, n in enumerate(self.counts):
+            if not n:
+                continue
+            seen += n
+            while t < len(targets) and seen >= targets[t][0]:
+                result[targets[t][1]] = min(self._value(index), self.max_us) / 1000
+                t += 1
+            if t == len(targets):
+                break
+        return result
+    
+    def summary(self) -> Dict[str, float]:
+        p = self.percentiles((0.5, 0.9, 0.99))
+        return {
+            "count": self.count,
+            "mean_ms": self.total_us / self.count / 1000 if self.count else 0.0,
+            "p50_ms": p[0.5],
+            "p90_ms": p[0.9],
+            "p99_ms": p[0.99],
+            "max_ms": self.max_us / 1000
+        }
+    
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Sumar las muestras de otro histograma con la misma configuración."""
+        if len(other.counts) != len(self.counts):
+            raise ValueError("LatencyHistogram.merge: configuraciones distintas")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
 class MetricsCollector:
-    """Colector de métricas con agregación fractal."""
+    """
+    Colector de métricas con agregación fractal y memoria fija.
+    
+    Cada operación actualiza contadores agregados (O(1)), un histograma de
+    latencia por (operación, espacio) y una muestra reservoir de tamaño fijo
+    de CognitiveMetrics; get_summary no recorre ningún historial.
+    
+    Los espacios los eligen los clientes: solo se siguen por separado los
+    max_spaces más recientes. Al expulsar uno (LRU), sus histogramas se
+    suman a los del espacio OTHER_SPACE y se olvida su kb_size.
+    """
+    
+    PHI_WINDOW = 10  # coherencias que pondera phi_weighted_coherence
+    OTHER_SPACE = "_other"
     
-    def __init__(self):
-        self.metrics: List[CognitiveMetrics] = []
+    def __init__(self, sample_size: int = 256, recent_size: int = 64, seed: Optional[int] = None,
+                 max_spaces: int = 64):
         self.logger = logging.getLogger("aurora.metrics")
+        self._lock = threading.Lock()
+        self.total_operations = 0
+        self.coherence_sum = 0.0
+        # operación -> {'count', 'coherence_sum', 'nulls', 'iterations'}
+        self.counters: Dict[str, Dict[str, float]] = {}
+        self.latency: Dict[tuple, LatencyHistogram] = {}
+        self.kb_size: Dict[str, int] = {}
+        self.max_spaces = max_spaces
+        self._spaces: "OrderedDict[str, None]" = OrderedDict()  # orden LRU
+        self.folded_spaces = 0
+        self._phi_coherences: List[float] = []
+        self.sample_size = sample_size
+        self.sample: List[CognitiveMetrics] = []
+        self.recent: deque = deque(maxlen=recent_size)
+        self._rng = random.Random(seed)
+    
+    @property
+    def metrics(self) -> List[CognitiveMetrics]:
+        """Últimas operaciones registradas (ventana acotada)."""
+        return list(self.recent)
     
     def log_operation(self, operation: str, **kwargs) -> None:
-        """Registrar operación con timestamp."""
+        """Registrar operación con timestamp (latency_ms y space_id opcionales)."""
         metric = CognitiveMetrics(
             timestamp=datetime.utcnow().isoformat(),
             coherence_score=kwargs.get('coherence', 0.0),
@@ -85,23 +209,79 @@ class MetricsCollector:
             kb_size=kwargs.get('kb_size', 0),
             operation=operation
         )
-        self.metrics.append(metric)
-        self.logger.info(f"{operation}: coherence={metric.coherence_score:.3f}, kb_size={metric.kb_size}")
+        space_id = kwargs.get('space_id', 'default')
+        latency_ms = kwargs.get('latency_ms')
+        with self._lock:
+            self.total_operations += 1
+            self.coherence_sum += metric.coherence_score
+            counters = self.counters.get(operation)
+            if counters is None:
+                counters = self.counters[operation] = {'count': 0, 'coherence_sum': 0.0, 'nulls': 0, 'iterations': 0}
+            counters['count'] += 1
+            counters['coherence_sum'] += metric.coherence_score
+            counters['nulls'] += metric.null_count
+            counters['iterations'] += metric.iteration_count
+            self._touch_space(space_id)
+            self.kb_size[space_id] = metric.kb_size
+            if latency_ms is not None:
+                histogram = self.latency.get((operation, space_id))
+                if histogram is None:
+                    histogram = self.latency[(operation, space_id)] = LatencyHistogram()
+                histogram.record(latency_ms)
+            if len(self._phi_coherences) < self.PHI_WINDOW:
+                self._phi_coherences.append(metric.coherence_score)
+            # Reservoir (algoritmo R): muestra uniforme de todo el historial
+            if len(self.sample) < self.sample_size:
+                self.sample.append(metric)
+            else:
+                slot = self._rng.randrange(self.total_operations)
+                if slot < self.sample_size:
+                    self.sample[slot] = metric
+            self.recent.append(metric)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s: coherence=%.3f, kb_size=%d", operation, metric.coherence_score, metric.kb_size)
+    
+    def _touch_space(self, space_id: str) -> None:
+        if space_id in self._spaces:
+            self._spaces.move_to_end(space_id)
+            return
+        self._spaces[space_id] = None
+        if len(self._spaces) <= self.max_spaces:
+            return
+        evicted, _ = self._spaces.popitem(last=False)
+        self.kb_size.pop(evicted, None)
+        for operation in self.counters:
+            histogram = self.latency.pop((operation, evicted), None)
+            if histogram is None:
+                continue
+            other = self.latency.get((operation, self.OTHER_SPACE))
+            if other is None:
+                self.latency[(operation, self.OTHER_SPACE)] = histogram
+            else:
+                other.merge(histogram)
+        self.folded_spaces += 1
     
     def get_summary(self) -> Dict[str, Any]:
-        """Resumen estadístico fractal (PHI-weighted)."""
-        if not self.metrics:
-            return {"status": "no_metrics"}
-        
-        return {
-            "total_operations": len(self.metrics),
-            "avg_coherence": sum(m.coherence_score for m in self.metrics) / len(self.metrics),
-            "operations_by_type": {
-                op: sum(1 for m in self.metrics if m.operation == op)
-                for op in set(m.operation for m in self.metrics)
-            },
-            "phi_weighted_coherence": sum(m.coherence_score * (PHI ** i) for i, m in enumerate(self.metrics[:10]))
-        }
+        """Resumen estadístico fractal (PHI-weighted), en tiempo constante."""
+        with self._lock:
+            if not self.total_operations:
+                return {"status": "no_metrics"}
+            
+            latency: Dict[str, Dict[str, Any]] = {}
+            for (operation, space_id), histogram in self.latency.items():
+                latency.setdefault(operation, {})[space_id] = histogram.summary()
+            return {
+                "total_operations": self.total_operations,
+                "avg_coherence": self.coherence_sum / self.total_operations,
+                "operations_by_type": {op: c['count'] for op, c in self.counters.items()},
+                "phi_weighted_coherence": sum(c * (PHI ** i) for i, c in enumerate(self._phi_coherences)),
+                "avg_coherence_by_type": {op: c['coherence_sum'] / c['count'] for op, c in self.counters.items()},
+                "nulls_by_type": {op: c['nulls'] for op, c in self.counters.items()},
+                "kb_size": dict(self.kb_size),
+                "latency_ms": latency,
+                "folded_spaces": self.folded_spaces,
+                "sample_size": len(self.sample)
+            }
 
 # ===============================================================================
 # PERSISTENCE LAYER
@@ -112,39 +292,63 @@ class KnowledgeBasePersistence:
     
     @staticmethod
     def save_kb(kb: FractalKnowledgeBase, path: str, format: str = 'json') -> bool:
-        """Guardar KB a disco (formato recursivo)."""
+        """
+        Guardar KB a disco (formato recursivo).
+
+        format: 'json', 'pickle' o 'binary' (columnar, un segmento por
+        universo mapeable con open_kb; ver kb_binary).
+        """
         path_obj = Path(path)
         path_obj.parent.mkdir(parents=True, exist_ok=True)
         
-        # Serializar recursivamente todos los universos
-        serialized = {
-            space_id: {
-                'storage': {
-                    str(k): KnowledgeBasePersistence._serialize_tensor(v)
-                    for k, v in universe.storage.items()
-                },
-                'name_index': list(universe.name_index.keys())
-            }
-            for space_id, universe in kb.universes.items()
-        }
+        if format == 'binary':
+            kb_binary.save(kb, str(path_obj))
+            logging.info(f"KB guardada en {path} ({len(kb.universes)} universos, binario)")
+            return True
+        
+        if format not in ('json', 'pickle'):
+            raise ValueError(f"Formato no soportado: {format}")
+        
+        # Snapshots por universo: consistentes aunque otros hilos sigan
+        # escribiendo (p. ej. Aurora.learn_async)
+        snapshots = {space_id: kb.snapshot(space_id) for space_id in list(kb.universes)}
         
         if format == 'json':
+            # Serializar recursivamente todos los universos
+            serialized = {
+                space_id: {
+                    'storage': {
+                        str(k): KnowledgeBasePersistence._serialize_tensor(v)
+                        for k, v in universe.storage.items()
+                    },
+                    'name_index': list(universe.name_index.keys())
+                }
+                for space_id, universe in snapshots.items()
+            }
             with open(path_obj, 'w', encoding='utf-8') as f:
                 json.dump(serialized, f, indent=2)
-        elif format == 'pickle':
-            with open(path_obj, 'wb') as f:
-                pickle.dump(kb, f)
         else:
-            raise ValueError(f"Formato no soportado: {format}")
+            frozen = FractalKnowledgeBase()
+            frozen.universes = snapshots
+            frozen.generation = kb.generation
+            with open(path_obj, 'wb') as f:
+                pickle.dump(frozen, f)
         
         logging.info(f"KB guardada en {path} ({len(kb.universes)} universos)")
         return True
     
     @staticmethod
-    def load_kb(path: str, format: str = 'json') -> FractalKnowledgeBase:
-        """Cargar KB desde disco (reconstrucción fractal)."""
+    def load_kb(path: str, format: str = 'json', spaces: Optional[List[str]] = None) -> FractalKnowledgeBase:
+        """
+        Cargar KB desde disco (reconstrucción fractal).
+
+        En formato 'binary' se puede cargar solo una parte con `spaces`.
+        """
         path_obj = Path(path)
         
+        if format == 'binary':
+            return kb_binary.load(str(path_obj), spaces=spaces)
+        
         if format == 'pickle':
             with open(path_obj, 'rb') as f:
                 return pickle.load(f)
@@ -155,15 +359,19 @@ class KnowledgeBasePersistence:
         
         kb = FractalKnowledgeBase()
         for space_id, space_data in data.items():
+            tensors, names = [], []
             for key_str, tensor_data in space_data['storage'].items():
-                tensor = KnowledgeBasePersistence._deserialize_tensor(tensor_data)
-                # Reconstruir índices
-                kb.add_archetype(
-                    space_id,
-                    tensor_data.get('name', f'tensor_{key_str}'),
-                    tensor,
-                    tensor.Ms if hasattr(tensor, 'Ms') else tensor.nivel_3[0]
-                )
+                tensors.append(KnowledgeBasePersistence._deserialize_tensor(tensor_data))
+                names.append(tensor_data.get('name', f'tensor_{key_str}'))
+            if not tensors:
+                continue
+            # Reconstruir índices en bloque (coherencia validada en una pasada)
+            kb.add_archetypes_bulk(
+                space_id,
+                tensors,
+                Ss=[t.Ms if hasattr(t, 'Ms') else t.nivel_3[0] for t in tensors],
+                names=names
+            )
         
         logging.info(f"KB cargada desde {path} ({len(kb.universes)} universos)")
         return kb
@@ -178,7 +386,8 @@ class KnowledgeBasePersistence:
             'Ms': tensor.Ms if hasattr(tensor, 'Ms') else None,
             'Ss': tensor.Ss if hasattr(tensor, 'Ss') else None,
             'MetaM': tensor.MetaM if hasattr(tensor, 'MetaM') else None,
-            'metadata': tensor.metadata if hasattr(tensor, 'metadata') else {}
+            'metadata': tensor.metadata if hasattr(tensor, 'metadata') else {},
+            'summary_version': FractalTensor.SUMMARY_VERSION
         }
     
     @staticmethod
@@ -191,7 +400,29 @@ class KnowledgeBasePersistence:
             MetaM=data.get('MetaM')
         )
         tensor.metadata = data.get('metadata', {})
+        # Niveles derivados solo se reutilizan si el resumen es de la versión actual;
+        # archivos anteriores (hash dependiente de PYTHONHASHSEED) se regeneran
+        if data.get('summary_version') == FractalTensor.SUMMARY_VERSION:
+            if data.get('nivel_9'):
+                tensor.nivel_9 = data['nivel_9']
+            if data.get('nivel_1'):
+                tensor.nivel_1 = data['nivel_1']
         return tensor
+    
+    @staticmethod
+    def open_kb(path: str) -> FractalKnowledgeBase:
+        """
+        Abrir una KB binaria mapeada en memoria: la apertura es inmediata y
+        cada universo se carga la primera vez que se accede a él.
+        """
+        return kb_binary.open_kb(str(path))
+    
+    @staticmethod
+    def migrate_kb(path: str, format: str = 'json', out_path: Optional[str] = None) -> FractalKnowledgeBase:
+        """Migrar KB persistida a la versión actual del resumen nivel_1 (cargar + guardar)."""
+        kb = KnowledgeBasePersistence.load_kb(path, format)
+        KnowledgeBasePersistence.save_kb(kb, out_path or path, format)
+        return kb
 
 # ===============================================================================
 # COGNITIVE CYCLE ORCHESTRATOR
@@ -209,10 +440,17 @@ class AuroraCognitiveCycle:
     5. Extender → Armonizador (validación)
     """
     
+    # Resultados de query_batch cacheados (LRU, por generación del universo)
+    QUERY_CACHE_MAX_ENTRIES = 4096
+    # Por debajo de este número de fallos distintos no compensa el pool
+    PARALLEL_MIN_MISSES = 8
+    
     def __init__(
         self, 
         kb: Optional[FractalKnowledgeBase] = None,
-        enable_metrics: bool = True
+        enable_metrics: bool = True,
+        query_cache_max_entries: Optional[int] = None,
+        query_workers: Optional[int] = None
     ):
         self.kb = kb or FractalKnowledgeBase()
         self.transcender = Transcender()
@@ -221,33 +459,72 @@ class AuroraCognitiveCycle:
         self.armonizador = Armonizador(knowledge_base=self.kb)
         self.metrics = MetricsCollector() if enable_metrics else None
         self.logger = logging.getLogger("aurora.cycle")
+        # (space_id, patrón) -> (generación del universo, resultado)
+        self._query_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self.query_cache_max_entries = query_cache_max_entries or self.QUERY_CACHE_MAX_ENTRIES
+        self.query_cache_stats = {'hits': 0, 'misses': 0, 'deduplicated': 0, 'invalidated': 0, 'evicted': 0}
+        self.query_workers = query_workers or min(8, os.cpu_count() or 1)
+        self._query_pool: Optional[ThreadPoolExecutor] = None
+        # Lotes usando el pool ahora mismo; close() espera a que terminen y,
+        # mientras espera (closing), los lotes nuevos no toman el pool
+        self._query_pool_cond = threading.Condition(threading.Lock())
+        self._query_pool_users = 0
+        self._query_pool_closing = False
+    
+    def close(self) -> None:
+        """Liberar los hilos del pool de consultas (se recrea si se vuelve a usar)."""
+        with self._query_pool_cond:
+            self._query_pool_closing = True
+            while self._query_pool_users:
+                self._query_pool_cond.wait()
+            pool, self._query_pool = self._query_pool, None
+            self._query_pool_closing = False
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def _borrow_query_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Pool de consultas para un lote (devolver con _return_query_pool); None si se está cerrando."""
+        with self._query_pool_cond:
+            if self._query_pool_closing:
+                return None
+            if self._query_pool is None:
+                self._query_pool = ThreadPoolExecutor(max_workers=self.query_workers,
+                                                      thread_name_prefix="aurora-query")
+            self._query_pool_users += 1
+            return self._query_pool
+    
+    def _return_query_pool(self) -> None:
+        with self._query_pool_cond:
+            self._query_pool_users -= 1
+            self._query_pool_cond.notify_all()
     
     def learn(
         self, 
-        tensors: List[FractalTensor], 
+        tensors: Iterable[FractalTensor], 
         space_id: str = "default"
     ) -> Dict[str, Any]:
         """
         Aprendizaje fractal: Tensors → Arquetipo → KB.
         
         Pipeline recursivo:
-        - Evolver sintetiza familia de tensores
+        - Evolver sintetiza familia de tensores (una lista, o cualquier
+          iterable/generador: se reduce por bloques sin materializarlo)
         - KB valida coherencia absoluta
         - Métricas registran operación
         """
-        self.logger.info(f"🧠 LEARN: {len(tensors)} tensors en espacio '{space_id}'")
-        
+        start = time.perf_counter()
         # 1. Evolucionar arquetipo
-        archetype = self.evolver.compute_fractal_archetype(tensors)
+        archetype = self._synthesize(tensors, space_id)
         
         # 2. Almacenar en KB con validación de coherencia
         try:
-            archetype_name = f"archetype_{hash(str(archetype.Ms))}_{datetime.utcnow().timestamp()}"
+            archetype_name = self._archetype_name(archetype)
             self.kb.add_archetype(
                 space_id,
                 archetype_name,
                 archetype,
-                archetype.Ss if hasattr(archetype, 'Ss') and archetype.Ss else archetype.Ms
+                self._archetype_key(archetype)
             )
             
             # 3. Métricas
@@ -255,7 +532,9 @@ class AuroraCognitiveCycle:
                 self.metrics.log_operation(
                     'learn',
                     coherence=1.0,  # Coherencia asegurada por KB
-                    kb_size=len(self.kb.universes.get(space_id, {}).storage if hasattr(self.kb.universes.get(space_id, {}), 'storage') else {})
+                    kb_size=len(self.kb.snapshot(space_id).storage),
+                    space_id=space_id,
+                    latency_ms=(time.perf_counter() - start) * 1000
                 )
             
             return {
@@ -269,6 +548,21 @@ class AuroraCognitiveCycle:
             self.logger.error(f"❌ LEARN failed: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    def _synthesize(self, tensors: Iterable[FractalTensor], space_id: str) -> FractalTensor:
+        if isinstance(tensors, (list, tuple)):
+            self.logger.info(f"🧠 LEARN: {len(tensors)} tensors en espacio '{space_id}'")
+            return self.evolver.compute_fractal_archetype(list(tensors))
+        self.logger.info(f"🧠 LEARN: familia en streaming en espacio '{space_id}'")
+        return self.evolver.compute_fractal_archetype_stream(tensors)
+    
+    @staticmethod
+    def _archetype_name(archetype: FractalTensor) -> str:
+        return f"archetype_{hash(str(archetype.Ms))}_{datetime.utcnow().timestamp()}"
+    
+    @staticmethod
+    def _archetype_key(archetype: FractalTensor) -> list:
+        return archetype.Ss if hasattr(archetype, 'Ss') and archetype.Ss else archetype.Ms
+    
     def query(
         self, 
         pattern: Union[List[int], FractalTensor],
@@ -284,6 +578,7 @@ class AuroraCognitiveCycle:
         - Armonizador valida coherencia
         """
         self.logger.info(f"🔍 QUERY: pattern={pattern} en espacio '{space_id}'")
+        start = time.perf_counter()
         
         # 1. Extender reconstruye desde patrón
         result = self.extender.extend_fractal(
@@ -292,15 +587,155 @@ class AuroraCognitiveCycle:
         )
         
         # 2. Métricas
+        self._log_query_metrics(result, space_id, (time.perf_counter() - start) * 1000)
+        
+        return result
+    
+    def _log_query_metrics(self, result: Dict[str, Any], space_id: str, latency_ms: Optional[float] = None):
         if self.metrics:
             self.metrics.log_operation(
                 'query',
                 coherence=result.get('coherence', 0.0),
                 nulls=sum(1 for v in result['reconstructed_tensor'].nivel_3[0] if v is None),
-                kb_size=len(self.kb.universes.get(space_id, {}).storage if hasattr(self.kb.universes.get(space_id, {}), 'storage') else {})
+                kb_size=len(self.kb.snapshot(space_id).storage),
+                space_id=space_id,
+                latency_ms=latency_ms
             )
+    
+    def query_batch(
+        self,
+        patterns: List[Union[List[int], FractalTensor]],
+        space_id: str = "default",
+        space_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Consulta por lotes: deduplica los patrones, los agrupa por espacio,
+        sirve las repeticiones desde una caché invalidada por la generación
+        del universo y resuelve los fallos distintos en paralelo.
         
-        return result
+        space_ids (opcional) da el espacio de cada patrón; si no, todos van
+        a space_id. Los resultados vuelven en el orden de entrada y cada uno
+        es una copia propia (se pueden modificar sin tocar la caché).
+        """
+        if space_ids is not None and len(space_ids) != len(patterns):
+            raise ValueError("space_ids debe tener la misma longitud que patterns")
+        
+        # 1. Deduplicar: cada (espacio, patrón) distinto se resuelve una vez
+        slots: Dict[tuple, List[int]] = {}
+        distinct: Dict[tuple, Union[List[int], FractalTensor]] = {}
+        for i, pattern in enumerate(patterns):
+            key = (space_ids[i] if space_ids is not None else space_id, self._query_key(pattern))
+            if key in slots:
+                slots[key].append(i)
+            else:
+                slots[key] = [i]
+                distinct[key] = pattern
+        with self._query_cache_lock:
+            self.query_cache_stats['deduplicated'] += len(patterns) - len(distinct)
+        
+        # 2. Caché por generación; los fallos se agrupan por espacio
+        resolved: Dict[tuple, Dict[str, Any]] = {}
+        misses: Dict[str, List[tuple]] = {}
+        for key in distinct:
+            cached = self._query_cache_get(key)
+            if cached is not None:
+                resolved[key] = cached
+            else:
+                misses.setdefault(key[0], []).append(key)
+        
+        # 3. Resolver los fallos de cada espacio
+        for space, keys in misses.items():
+            self.logger.info(f"🔍 QUERY batch: {len(keys)} patrones distintos en espacio '{space}'")
+            generation = self.kb.universe_generation(space)
+            start = time.perf_counter()
+            solved = self._resolve_batch([distinct[k] for k in keys], space)
+            # Latencia amortizada: el lote se resuelve junto (y en paralelo)
+            latency_ms = (time.perf_counter() - start) * 1000 / len(keys)
+            for key, result in zip(keys, solved):
+                self._log_query_metrics(result, space, latency_ms)
+                self._query_cache_put(key, generation, result)
+                resolved[key] = result
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(patterns)
+        for key, indices in slots.items():
+            for i in indices:
+                results[i] = self._copy_result(resolved[key])
+        return results
+    
+    def _resolve_batch(
+        self,
+        patterns: List[Union[List[int], FractalTensor]],
+        space_id: str
+    ) -> List[Dict[str, Any]]:
+        """Patrones con NULLs → red recursiva por lotes; el resto → extend_fractal (en paralelo)."""
+        contexto = {'space_id': space_id}
+        incomplete = [i for i, p in enumerate(patterns) if None in self._query_root(p)]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(patterns)
+        if incomplete:
+            solved = self.extender.extend_fractal_recursive_batch([patterns[i] for i in incomplete], contexto)
+            for i, result in zip(incomplete, solved):
+                results[i] = result
+        
+        complete = [i for i, result in enumerate(results) if result is None]
+        pool = None
+        if len(complete) >= self.PARALLEL_MIN_MISSES and self.query_workers > 1:
+            pool = self._borrow_query_pool()
+        if pool is not None:
+            try:
+                solved = list(pool.map(lambda i: self.extender.extend_fractal(patterns[i], contexto), complete))
+            finally:
+                self._return_query_pool()
+        else:
+            solved = (self.extender.extend_fractal(patterns[i], contexto) for i in complete)
+        for i, result in zip(complete, solved):
+            results[i] = result
+        return results
+    
+    @staticmethod
+    def _query_root(pattern) -> list:
+        if isinstance(pattern, FractalTensor):
+            return pattern.nivel_3[0] if pattern.nivel_3 else []
+        return pattern if isinstance(pattern, (list, tuple)) else []
+    
+    @staticmethod
+    def _query_key(pattern) -> tuple:
+        """Clave hashable del patrón (un tensor se identifica por sus filas de nivel_3)."""
+        if isinstance(pattern, FractalTensor):
+            return ('tensor',) + tuple(tuple(row) for row in pattern.nivel_3)
+        if isinstance(pattern, (list, tuple)):
+            return tuple(pattern)
+        return ('raw', repr(pattern))
+    
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        copy = dict(result)
+        copy['reconstructed_tensor'] = result['reconstructed_tensor'].derive()
+        if 'log' in result:
+            copy['log'] = list(result['log'])
+        return copy
+    
+    def _query_cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                self.query_cache_stats['misses'] += 1
+                return None
+            if entry[0] != self.kb.universe_generation(key[0]):
+                del self._query_cache[key]
+                self.query_cache_stats['invalidated'] += 1
+                self.query_cache_stats['misses'] += 1
+                return None
+            self._query_cache.move_to_end(key)
+            self.query_cache_stats['hits'] += 1
+            return entry[1]
+    
+    def _query_cache_put(self, key: tuple, generation: int, result: Dict[str, Any]) -> None:
+        with self._query_cache_lock:
+            self._query_cache[key] = (generation, self._copy_result(result))
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.query_cache_max_entries:
+                self._query_cache.popitem(last=False)
+                self.query_cache_stats['evicted'] += 1
     
     def process_batch(
         self, 
@@ -314,10 +749,238 @@ class AuroraCognitiveCycle:
         # Learn phase: sintetizar arquetipos
         learn_result = self.learn(tensors, space_id)
         
-        # Query phase: reconstruir cada input
-        results = [self.query(inp, space_id) for inp in inputs]
+        # Query phase: deduplicada y cacheada (los NULLs van juntos a la red recursiva)
+        return self.query_batch(inputs, space_id)
+
+# ===============================================================================
+# ASYNC INGESTION (cola acotada + micro-lotes por espacio)
+# ===============================================================================
+
+class BackpressureError(RuntimeError):
+    """La cola de ingesta está llena y el productor no quiso (o no pudo) esperar."""
+    pass
+
+class IngestionPipeline:
+    """
+    Servicio de ingesta asíncrona para AuroraCognitiveCycle.learn.
+    
+    - submit() encola una familia de tensores y devuelve un Future con el
+      mismo dict que learn(); se puede ignorar (fire-and-forget), esperar
+      con result() o, desde asyncio, con asyncio.wrap_future(future).
+    - La cola admite como mucho max_pending familias sin terminar. Al
+      llenarse, submit() bloquea al productor o lanza BackpressureError
+      (block=False o timeout vencido); `pressure` da el nivel de llenado.
+    - Un despachador agrupa lo encolado en micro-lotes por espacio y el
+      pool de workers sintetiza los arquetipos e inserta cada lote con un
+      único add_archetypes_bulk (un lock, un registro WAL, una generación).
+    - Cada espacio tiene como mucho un lote en curso, así que las familias
+      de un mismo espacio se insertan en orden de llegada; espacios
+      distintos avanzan en paralelo.
+    """
+    
+    def __init__(
+        self,
+        cycle: AuroraCognitiveCycle,
+        max_pending: int = 1024,
+        max_batch: int = 64,
+        batch_window: float = 0.002,
+        workers: Optional[int] = None
+    ):
+        self.cycle = cycle
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.logger = logging.getLogger("aurora.ingest")
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'batches': 0}
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._backlogs: Dict[str, deque] = {}  # espacio -> lotes esperando a su worker
+        self._closed = False
+        self._aborted = False  # close(wait=False): lo no insertado falla
+        self._pool = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                        thread_name_prefix="aurora-ingest")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="aurora-ingest-dispatch", daemon=True)
+        self._dispatcher.start()
+    
+    @property
+    def pending(self) -> int:
+        """Familias aceptadas que aún no se han insertado."""
+        return self._pending
+    
+    @property
+    def pressure(self) -> float:
+        """Llenado de la cola (0.0 vacía, 1.0 llena: submit bloquearía)."""
+        return self._pending / self.max_pending
+    
+    def submit(
+        self,
+        tensors: Iterable[FractalTensor],
+        space_id: str = "default",
+        block: bool = True,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """Encolar una familia para learn(); ver la clase para la contrapresión."""
+        if self._closed:
+            raise RuntimeError("IngestionPipeline cerrado")
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise BackpressureError(f"Cola de ingesta llena ({self.max_pending} familias pendientes)")
+        future: Future = Future()
+        with self._lock:
+            # Comprobar y encolar bajo el mismo lock que close(): nada entra
+            # en la cola después del centinela
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("IngestionPipeline cerrado")
+            self._pending += 1
+            self.stats['submitted'] += 1
+            self._queue.put((space_id, tensors, future, time.perf_counter()))
+        return future
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que todo lo aceptado esté insertado. False si vence el timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+    
+    def close(self, wait: bool = True) -> None:
+        """
+        Dejar de aceptar familias. Con wait=True se drena lo pendiente; con
+        wait=False lo que aún no se ha insertado falla con RuntimeError.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._aborted = not wait
+            self._queue.put(None)
+        self._dispatcher.join()
+        if wait:
+            self.flush()
+        self._pool.shutdown(wait=wait)
+    
+    # -- despachador ----------------------------------------------------------
+    
+    def _dispatch_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            
+            groups: Dict[str, list] = {}
+            for item in batch:
+                groups.setdefault(item[0], []).append(item)
+            for space_id, items in groups.items():
+                with self._lock:
+                    backlog = self._backlogs.get(space_id)
+                    if backlog is not None:  # ya hay un lote en curso: encadenar
+                        backlog.extend(items)
+                        continue
+                    self._backlogs[space_id] = deque()
+                self._pool.submit(self._run_space, space_id, items)
+    
+    def _run_space(self, space_id: str, items: list):
+        """Worker de un espacio: procesa su lote y sigue con lo encadenado."""
+        while True:
+            try:
+                self._ingest(space_id, items)
+            except Exception as e:  # no debe dejar futures sin resolver
+                self.logger.error(f"❌ INGEST failed en '{space_id}': {e}")
+                self._finish([(item[2], None, None if item[2].cancelled() else e)
+                              for item in items if item[2].cancelled() or not item[2].done()])
+            with self._lock:
+                backlog = self._backlogs[space_id]
+                if not backlog:
+                    del self._backlogs[space_id]
+                    return
+                items = [backlog.popleft() for _ in range(min(len(backlog), self.max_batch))]
+    
+    def _ingest(self, space_id: str, items: list):
+        cycle = self.cycle
+        rows, outcomes = [], []
+        for item in items:
+            if not item[2].set_running_or_notify_cancel():  # cancelado en cola
+                outcomes.append((item[2], None, None))
+                continue
+            if self._aborted:
+                outcomes.append((item[2], None, RuntimeError("IngestionPipeline cerrado sin drenar")))
+                continue
+            try:
+                archetype = cycle._synthesize(item[1], space_id)
+            except Exception as e:
+                outcomes.append((item[2], None, e))
+                continue
+            rows.append((item, archetype, cycle._archetype_name(archetype)))
         
-        return results
+        if rows:
+            try:
+                report = cycle.kb.add_archetypes_bulk(
+                    space_id,
+                    [archetype for _, archetype, _ in rows],
+                    Ss=[cycle._archetype_key(archetype) for _, archetype, _ in rows],
+                    names=[name for _, _, name in rows],
+                    strict=False
+                )
+                conflicts = {c['row']: c for c in report['conflicts']}
+            except Exception as e:
+                conflicts = {row: {'error': str(e)} for row in range(len(rows))}
+            with self._lock:
+                self.stats['batches'] += 1
+            
+            kb_size = len(cycle.kb.snapshot(space_id).storage)
+            now = time.perf_counter()
+            for row, (item, archetype, name) in enumerate(rows):
+                if row in conflicts:
+                    error = conflicts[row].get('error') or (
+                        f"Coherence violation: Ms {conflicts[row]['Ms']} MetaM {conflicts[row]['MetaM']} "
+                        f"!= {conflicts[row]['expected_MetaM']}"
+                    )
+                    self.logger.error(f"❌ LEARN failed: {error}")
+                    outcomes.append((item[2], {'status': 'error', 'error': error}, None))
+                    continue
+                if cycle.metrics:
+                    cycle.metrics.log_operation(
+                        'learn',
+                        coherence=1.0,
+                        kb_size=kb_size,
+                        space_id=space_id,
+                        latency_ms=(now - item[3]) * 1000  # incluye la espera en cola
+                    )
+                outcomes.append((item[2], {
+                    'status': 'success',
+                    'archetype': archetype,
+                    'archetype_name': name,
+                    'space_id': space_id
+                }, None))
+        self._finish(outcomes)
+    
+    def _finish(self, outcomes: list):
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            elif result is not None:
+                future.set_result(result)
+            self._slots.release()
+        with self._idle:
+            self._pending -= len(outcomes)
+            self.stats['completed'] += sum(1 for _, r, e in outcomes if r is not None and r['status'] == 'success')
+            self.stats['failed'] += sum(1 for _, r, e in outcomes if e is not None or (r is not None and r['status'] != 'success'))
+            if self._pending == 0:
+                self._idle.notify_all()
 
 # ===============================================================================
 # HIGH-LEVEL API (User-Friendly)
@@ -333,40 +996,94 @@ class Aurora:
     - Sigue principios Aurora (recursividad, fractalidad)
     """
     
-    def __init__(self, kb_path: Optional[str] = None):
-        """Inicializar Aurora con KB opcional desde disco."""
+    def __init__(self, kb_path: Optional[str] = None, wal_dir: Optional[str] = None, **wal_options):
+        """
+        Inicializar Aurora con KB opcional desde disco.
+
+        Con wal_dir cada escritura se registra en un write-ahead log y la KB
+        se recupera de él al reiniciar (kb_path solo siembra un WAL vacío).
+        """
+        self.wal: Optional[KBWriteAheadLog] = None
         if kb_path and Path(kb_path).exists():
             self.kb = KnowledgeBasePersistence.load_kb(kb_path)
             print(f"✅ KB cargada desde {kb_path}")
         else:
             self.kb = FractalKnowledgeBase()
             print("✅ KB nueva creada")
+        if wal_dir:
+            self.wal = KBWriteAheadLog.open(wal_dir, kb=self.kb, **wal_options)
+            self.kb = self.wal.kb
+            print(f"✅ WAL activo en {wal_dir} ({self.wal.stats['replayed']} registros reaplicados)")
         
         self.cycle = AuroraCognitiveCycle(kb=self.kb, enable_metrics=True)
+        self.ingestion: Optional[IngestionPipeline] = None  # se crea con learn_async
         self.logger = logging.getLogger("aurora.api")
     
     def learn(self, data: List[List[int]], space_id: str = "default") -> 'Aurora':
-        """Aprender de datos (API fluida)."""
-        tensors = [FractalTensor(nivel_3=[d]) for d in data]
+        """
+        Aprender de datos (API fluida). Con un generador de vectores ternarios
+        la familia se reduce en streaming, sin crear un tensor por vector.
+        """
+        if isinstance(data, (list, tuple)):
+            tensors = [FractalTensor(nivel_3=[d]) for d in data]
+        else:
+            tensors = (list(d) for d in data)
         self.cycle.learn(tensors, space_id)
         return self
     
+    def learn_async(
+        self,
+        data: List[List[int]],
+        space_id: str = "default",
+        block: bool = True,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Encolar una familia en el pipeline de ingesta sin esperar a la
+        síntesis. Devuelve un Future con el resultado de learn(); lanza
+        BackpressureError si la cola está llena y no se puede esperar.
+        """
+        if self.ingestion is None:
+            self.ingestion = IngestionPipeline(self.cycle)
+        if isinstance(data, (list, tuple)):
+            tensors = [FractalTensor(nivel_3=[d]) for d in data]
+        else:
+            tensors = (list(d) for d in data)
+        return self.ingestion.submit(tensors, space_id, block=block, timeout=timeout)
+    
     def query(self, pattern: List[int], space_id: str = "default") -> FractalTensor:
         """Consultar patrón."""
         result = self.cycle.query(pattern, space_id)
         return result['reconstructed_tensor']
     
+    def query_batch(self, patterns: List[List[int]], space_id: str = "default") -> List[FractalTensor]:
+        """Consultar varios patrones (deduplicados y cacheados)."""
+        return [r['reconstructed_tensor'] for r in self.cycle.query_batch(patterns, space_id)]
+    
     def save(self, path: str, format: str = 'json') -> 'Aurora':
         """Guardar KB a disco (API fluida)."""
         KnowledgeBasePersistence.save_kb(self.kb, path, format)
         return self
     
+    def close(self) -> None:
+        """
+        Drenar la ingesta pendiente, liberar los hilos de consulta y cerrar
+        el WAL (si lo hay) compactándolo en un snapshot.
+        """
+        if self.ingestion is not None:
+            self.ingestion.close(wait=True)
+            self.ingestion = None
+        self.cycle.close()
+        if self.wal is not None:
+            self.wal.close(checkpoint=True)
+            self.wal = None
+    
     def metrics(self) -> Dict[str, Any]:
         """Obtener métricas del sistema."""
         return self.cycle.metrics.get_summary() if self.cycle.metrics else {}
     
     def __repr__(self):
-        kb_size = sum(len(u.storage) for u in self.kb.universes.values())
+        kb_size = sum(len(u.storage) for u in list(self.kb.universes.values()))
         return f"Aurora(kb_size={kb_size}, universes={len(self.kb.universes)})"
 
 # ===============================================================================
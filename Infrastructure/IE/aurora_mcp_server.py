@@ -398,7 +398,10 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
                         "archetypes": len(universe.storage),
                         "indexed": len(universe.ms_index)
                     }
-                    for space_id, universe in AURORA_INSTANCE.kb.universes.items()
+                    for space_id, universe in (
+                        (space_id, AURORA_INSTANCE.kb.snapshot(space_id))
+                        for space_id in list(AURORA_INSTANCE.kb.universes)
+                    )
                 }
             }
             
@@ -517,7 +520,7 @@ async def read_resource(uri: str) -> str:
     elif uri.startswith("aurora://kb/space/"):
         space_id = uri.split("/")[-1]
         if space_id in AURORA_INSTANCE.kb.universes:
-            universe = AURORA_INSTANCE.kb.universes[space_id]
+            universe = AURORA_INSTANCE.kb.snapshot(space_id)
             space_data = {
                 "space_id": space_id,
                 "archetypes": len(universe.storage),
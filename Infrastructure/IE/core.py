@@ -20,11 +20,22 @@ Version: 1.0.0
 from __future__ import annotations
 
 from typing import List, Dict, Any, Tuple, Optional, Union
+import functools
 import hashlib
 import random
 import itertools
 import logging
 import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo requieren los motores vectorizados
+    np = None
 
 
 # ===============================================================================
@@ -133,20 +144,23 @@ class Trigate:
                     else:
                         m = 1 if (a ^ b) == r else 0
                     cls._LUT_LEARN[(a, b, r)] = m
-                    
+        
+        for m in states:
+            for r in states:
+                for x in states:
                     # Deduction A: M + R + B -> A
-                    if TernaryLogic.NULL in (m, r, b):
+                    if TernaryLogic.NULL in (m, r, x):
                         a_result = TernaryLogic.NULL
                     else:
-                        a_result = b ^ r if m == 1 else 1 - (b ^ r)
-                    cls._LUT_DEDUCE_A[(m, r, b)] = a_result
+                        a_result = x ^ r if m == 1 else 1 - (x ^ r)
+                    cls._LUT_DEDUCE_A[(m, r, x)] = a_result
                     
                     # Deduction B: M + R + A -> B
-                    if TernaryLogic.NULL in (m, r, a):
+                    if TernaryLogic.NULL in (m, r, x):
                         b_result = TernaryLogic.NULL
                     else:
-                        b_result = a ^ r if m == 1 else 1 - (a ^ r)
-                    cls._LUT_DEDUCE_B[(m, r, a)] = b_result
+                        b_result = x ^ r if m == 1 else 1 - (x ^ r)
+                    cls._LUT_DEDUCE_B[(m, r, x)] = b_result
         
         cls._initialized = True
         print(f"Trigate LUTs initialized: {len(cls._LUT_INFER)} entries each")
@@ -195,6 +209,238 @@ class Trigate:
 
         return current, history
 
+class VectorizedTrigate:
+    """
+    NumPy Trigate over int8 arrays of any shape.
+
+    NULL is encoded as the sentinel NULL_CODE (2), so every position is a
+    code in {0, 1, 2}. The four Trigate modes are the scalar 27-entry LUTs
+    flattened into NumPy tables indexed by ``x*9 + y*3 + z`` (argument
+    order as in the scalar method), and arguments broadcast against each
+    other, so scalars like ``M=1`` are allowed.
+    """
+
+    NULL_CODE = 2
+    _NP_INFER = None
+    _NP_LEARN = None
+    _NP_DEDUCE_A = None
+    _NP_DEDUCE_B = None
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("VectorizedTrigate requires numpy")
+        if VectorizedTrigate._NP_INFER is None:
+            VectorizedTrigate._initialize_tables()
+
+    @classmethod
+    def _initialize_tables(cls):
+        """Flatten the scalar Trigate LUTs into 27-entry int8 tables."""
+        if not Trigate._initialized:
+            Trigate._initialize_luts()
+
+        def flatten(lut):
+            table = np.empty(27, dtype=np.int8)
+            for x, y, z in itertools.product((0, 1, None), repeat=3):
+                table[cls._code(x) * 9 + cls._code(y) * 3 + cls._code(z)] = cls._code(lut[(x, y, z)])
+            return table
+
+        cls._NP_LEARN = flatten(Trigate._LUT_LEARN)
+        cls._NP_DEDUCE_A = flatten(Trigate._LUT_DEDUCE_A)
+        cls._NP_DEDUCE_B = flatten(Trigate._LUT_DEDUCE_B)
+        cls._NP_INFER = flatten(Trigate._LUT_INFER)
+
+    @classmethod
+    def _code(cls, value: Optional[int]) -> int:
+        return cls.NULL_CODE if value is None else int(value)
+
+    @classmethod
+    def encode(cls, vectors) -> 'np.ndarray':
+        """Convert (nested) lists with None into an int8 code array."""
+        if isinstance(vectors, np.ndarray):
+            return vectors.astype(np.int8, copy=False)
+        arr = np.array(vectors, dtype=object)
+        return np.where(arr == None, cls.NULL_CODE, arr).astype(np.int8)  # noqa: E711
+
+    @classmethod
+    def decode(cls, codes) -> list:
+        """Convert an int8 code array back into (nested) lists with None."""
+        codes = np.asarray(codes)
+        out = codes.astype(object)
+        out[codes == cls.NULL_CODE] = None
+        return out.tolist()
+
+    @staticmethod
+    def _lookup(table, x, y, z):
+        x, y, z = (np.asarray(v, dtype=np.int8) for v in (x, y, z))
+        return table[x * 9 + y * 3 + z]
+
+    def infer(self, A, B, M):
+        """Inference mode: R given A, B, M."""
+        return self._lookup(self._NP_INFER, A, B, M)
+
+    def learn(self, A, B, R):
+        """Learning mode: M given A, B, R."""
+        return self._lookup(self._NP_LEARN, A, B, R)
+
+    def deduce_a(self, M, R, B):
+        """Deduction mode: A given M, R, B."""
+        return self._lookup(self._NP_DEDUCE_A, M, R, B)
+
+    def deduce_b(self, M, R, A):
+        """Deduction mode: B given M, R, A."""
+        return self._lookup(self._NP_DEDUCE_B, M, R, A)
+
+    def synthesize(self, A, B):
+        """Aurora synthesis: M = XOR, S = XNOR (NULL-propagating)."""
+        return self.infer(A, B, 1), self.infer(A, B, 0)
+
+    def recursive_synthesis(self, vectors):
+        """
+        Prefix-scan reduction of ``vectors`` along axis 0.
+
+        Ternary XOR is associative, so the sequential fold of
+        ``Trigate.recursive_synthesis`` is a cumulative XOR of the known
+        bits plus a cumulative AND of the known masks. Returns
+        ``(result, history)`` with the same meaning as the scalar version.
+        """
+        codes = np.asarray(vectors, dtype=np.int8)
+        if codes.shape[0] < 2:
+            raise ValueError("At least 2 vectors required")
+
+        known = codes != self.NULL_CODE
+        prefix = np.bitwise_xor.accumulate(np.where(known, codes, 0).astype(np.int8), axis=0)
+        prefix_known = np.logical_and.accumulate(known, axis=0)
+        scan = np.where(prefix_known, prefix, self.NULL_CODE).astype(np.int8)
+        return scan[-1], scan[1:]
+
+class TernaryBitplane:
+    """
+    Wide ternary vector stored as two bitplanes over Python ints.
+
+    Bit i of ``known`` is 1 when position i holds 0/1 and 0 when it is NULL;
+    bit i of ``value`` holds the bit itself and is always 0 for NULLs.
+    Python ints have arbitrary width, so a single bitwise operation covers
+    every position of the vector at once.
+    """
+    __slots__ = ('value', 'known', 'length')
+
+    def __init__(self, value: int = 0, known: int = 0, length: int = 0):
+        self.length = length
+        self.known = known & ((1 << length) - 1)
+        self.value = value & self.known
+
+    @classmethod
+    def from_list(cls, vector: List[Optional[int]]) -> 'TernaryBitplane':
+        """Pack a list of 0/1/None into bitplanes."""
+        value = known = 0
+        for i, v in enumerate(vector):
+            if v is not None:
+                known |= 1 << i
+                if v:
+                    value |= 1 << i
+        return cls(value, known, len(vector))
+
+    @classmethod
+    def from_nivel_3(cls, nivel_3: List[List[Optional[int]]]) -> 'TernaryBitplane':
+        """Pack the concatenated vectors of a FractalTensor.nivel_3."""
+        return cls.from_list([v for vec in nivel_3 for v in vec])
+
+    def to_list(self) -> List[Optional[int]]:
+        """Unpack into a list of 0/1/None."""
+        return [
+            ((self.value >> i) & 1) if (self.known >> i) & 1 else None
+            for i in range(self.length)
+        ]
+
+    def to_nivel_3(self, width: int = 3) -> List[List[Optional[int]]]:
+        """Unpack into consecutive vectors of ``width`` (FractalTensor.nivel_3 layout)."""
+        flat = self.to_list()
+        return [flat[i:i + width] for i in range(0, len(flat), width)]
+
+    def null_count(self) -> int:
+        return self.length - bin(self.known).count('1')
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, TernaryBitplane)
+            and (self.value, self.known, self.length) == (other.value, other.known, other.length)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.value, self.known, self.length))
+
+    def __repr__(self):
+        return f"TernaryBitplane(length={self.length}, nulls={self.null_count()})"
+
+
+class BitplaneTrigate:
+    """
+    Trigate over TernaryBitplane operands.
+
+    With NULL propagation handled by AND-ing the known masks, every mode is
+    a parity check: R = ~(A ^ B ^ M) for inference, and the same identity
+    solved for M, A or B gives learning and both deductions.
+    """
+
+    @staticmethod
+    def _check(*operands: TernaryBitplane) -> int:
+        length = operands[0].length
+        if any(op.length != length for op in operands):
+            raise ValueError("All vectors must have the same length")
+        return length
+
+    @classmethod
+    def _parity(cls, x: TernaryBitplane, y: TernaryBitplane, z: TernaryBitplane) -> TernaryBitplane:
+        length = cls._check(x, y, z)
+        known = x.known & y.known & z.known
+        return TernaryBitplane(~(x.value ^ y.value ^ z.value), known, length)
+
+    @classmethod
+    def ternary_xor(cls, a: TernaryBitplane, b: TernaryBitplane) -> TernaryBitplane:
+        """XOR with NULL propagation."""
+        length = cls._check(a, b)
+        return TernaryBitplane(a.value ^ b.value, a.known & b.known, length)
+
+    @classmethod
+    def ternary_xnor(cls, a: TernaryBitplane, b: TernaryBitplane) -> TernaryBitplane:
+        """XNOR with NULL propagation."""
+        length = cls._check(a, b)
+        return TernaryBitplane(~(a.value ^ b.value), a.known & b.known, length)
+
+    def infer(self, A: TernaryBitplane, B: TernaryBitplane, M: TernaryBitplane) -> TernaryBitplane:
+        """Inference mode: Compute R given A, B, M."""
+        return self._parity(A, B, M)
+
+    def learn(self, A: TernaryBitplane, B: TernaryBitplane, R: TernaryBitplane) -> TernaryBitplane:
+        """Learning mode: Learn M given A, B, R."""
+        return self._parity(A, B, R)
+
+    def deduce_a(self, M: TernaryBitplane, R: TernaryBitplane, B: TernaryBitplane) -> TernaryBitplane:
+        """Deduction mode: Deduce A given M, R, B."""
+        return self._parity(M, R, B)
+
+    def deduce_b(self, M: TernaryBitplane, R: TernaryBitplane, A: TernaryBitplane) -> TernaryBitplane:
+        """Deduction mode: Deduce B given M, R, A."""
+        return self._parity(M, R, A)
+
+    def synthesize(self, A: TernaryBitplane, B: TernaryBitplane) -> Tuple[TernaryBitplane, TernaryBitplane]:
+        """Aurora synthesis: Generate M (logic) and S (form) from A and B."""
+        return self.ternary_xor(A, B), self.ternary_xnor(A, B)
+
+    def recursive_synthesis(self, vectors: List[TernaryBitplane]) -> Tuple[TernaryBitplane, List[TernaryBitplane]]:
+        """Sequentially reduce a list of bitplane vectors."""
+        if len(vectors) < 2:
+            raise ValueError("At least 2 vectors required")
+
+        history: List[TernaryBitplane] = []
+        current = vectors[0]
+
+        for nxt in vectors[1:]:
+            current = self.ternary_xor(current, nxt)
+            history.append(current)
+
+        return current, history
+
 # ===============================================================================
 # FRACTAL TENSOR ARCHITECTURE
 # ===============================================================================
@@ -203,45 +449,134 @@ class FractalTensor:
     """
     Aurora's fundamental data structure with hierarchical 3-9-27 organization.
     Supports fractal scaling and semantic coherence validation.
+
+    nivel_9 and nivel_1 are derived from nivel_3 lazily: they are built on
+    first read and invalidated whenever nivel_3 is reassigned or
+    _generate_hierarchy() is called.
+
+    Level rows are treated as immutable once shared: code replaces a row
+    (tensor.nivel_3[0] = new_root) instead of editing it in place, so
+    derive() can hand out copy-on-write tensors that share unchanged rows.
     """
     
+    # Versión del resumen nivel_1[2]:
+    #   1 = hash(str(root)) % 8 (dependiente de PYTHONHASHSEED)
+    #   2 = código base 3 de la raíz (NULL = 2) % 8, determinista
+    SUMMARY_VERSION = 2
+    
     def __init__(self, nivel_3=None, Ms=None, Ss=None, MetaM=None):
         """Initialize fractal tensor with 3-level hierarchy."""
         self.nivel_3 = nivel_3 or [[0, 0, 0]]  # Finest detail level
         self.metadata = {}
-        
-        # Auto-generate hierarchical levels
-        self._generate_hierarchy()
 
         self.Ms = Ms if Ms is not None else (self.nivel_3[0] if self.nivel_3 else [0,0,0])
         self.Ss = Ss
         self.MetaM = MetaM
     
+    @property
+    def nivel_3(self):
+        return self._nivel_3
+    
+    @nivel_3.setter
+    def nivel_3(self, value):
+        self._nivel_3 = value
+        self._nivel_9 = None
+        self._nivel_1 = None
+    
+    @property
+    def nivel_9(self):
+        if self._nivel_9 is None:
+            self._nivel_9 = self._build_nivel_9()
+        return self._nivel_9
+    
+    @nivel_9.setter
+    def nivel_9(self, value):
+        self._nivel_9 = value
+    
+    @property
+    def nivel_1(self):
+        if self._nivel_1 is None:
+            self._nivel_1 = self._build_nivel_1()
+        return self._nivel_1
+    
+    @nivel_1.setter
+    def nivel_1(self, value):
+        self._nivel_1 = value
+    
+    @staticmethod
+    def root_summary(root) -> int:
+        """
+        Resumen determinista de la raíz: código base 3 (NULL = 2) módulo 8.
+        No depende de PYTHONHASHSEED ni formatea cadenas.
+        """
+        code = 0
+        for v in root:
+            code = code * 3 + (2 if v is None else v)
+        return code % 8
+    
     def _generate_hierarchy(self):
         """
-        Generate nivel_9 and nivel_1 from nivel_3.
-        Tolera NULLs tratándolos como 0 para cálculos de resumen.
+        Regenerate nivel_9 and nivel_1 from nivel_3 (lazily, on next read).
         """
+        self._nivel_9 = None
+        self._nivel_1 = None
+    
+    def _build_nivel_9(self):
         # Nivel 9: group 3 vectors from nivel_3
         if len(self.nivel_3) >= 3:
-            self.nivel_9 = [self.nivel_3[i:i+3] for i in range(0, len(self.nivel_3), 3)]
-        else:
-            self.nivel_9 = [self.nivel_3]
-        
-        # Nivel 1: summary vector from nivel_3[0]
-        # Tolerante a NULLs: None se trata como 0
-        if self.nivel_3:
-            root = self.nivel_3[0]
-            # Sumar solo valores no-NULL (None = 0)
-            sum_val = sum(v if v is not None else 0 for v in root)
-            self.nivel_1 = [sum_val % 8, len(self.nivel_3), hash(str(root)) % 8]
-        else:
-            self.nivel_1 = [0, 0, 0]
+            return [self.nivel_3[i:i+3] for i in range(0, len(self.nivel_3), 3)]
+        return [self.nivel_3]
+    
+    def _build_nivel_1(self):
+        """
+        Nivel 1: summary vector from nivel_3[0].
+        Tolera NULLs tratándolos como 0 para la suma.
+        """
+        if not self.nivel_3:
+            return [0, 0, 0]
+        root = self.nivel_3[0]
+        # Sumar solo valores no-NULL (None = 0)
+        sum_val = sum(v if v is not None else 0 for v in root)
+        return [sum_val % 8, len(self.nivel_3), self.root_summary(root)]
+    
+    def derive(self, root: Optional[list] = None) -> 'FractalTensor':
+        """
+        Copy-on-write derivation: new tensor with its own level list and
+        metadata dict, sharing the (immutable) rows with this one.
+        Costs O(rows) instead of a deepcopy; `root` replaces nivel_3[0].
+        """
+        derived = self.__class__.__new__(self.__class__)
+        derived.__dict__.update(self.__dict__)
+        derived._nivel_3 = list(self._nivel_3)
+        derived.metadata = dict(self.metadata)
+        if root is not None:
+            if derived._nivel_3:
+                derived._nivel_3[0] = list(root)
+            else:
+                derived._nivel_3.append(list(root))
+            derived._nivel_9 = None
+            derived._nivel_1 = None
+        return derived
+    
+    def __copy__(self):
+        return self.derive()
+    
+    def __setstate__(self, state):
+        # Migración: pickles anteriores guardan los niveles como atributos planos
+        # y un nivel_1[2] dependiente del hash del proceso; se regeneran.
+        if 'nivel_3' in state:
+            state['_nivel_3'] = state.pop('nivel_3')
+            state.pop('nivel_9', None)
+            state.pop('nivel_1', None)
+            state['_nivel_9'] = None
+            state['_nivel_1'] = None
+        self.__dict__.update(state)
     
     @classmethod
-    def random(cls, space_constraints=None):
-        """Generate random fractal tensor."""
-        nivel_3 = [[random.randint(0, 1) for _ in range(3)] for _ in range(3)]
+    def random(cls, space_constraints=None, rng: Optional[random.Random] = None):
+        """Generate random fractal tensor (rng: per-call generator instead of the global one)."""
+        rng = rng or random
+        nivel_3 = [[rng.randint(0, 1) for _ in range(3)] for _ in range(3)]
         tensor = cls(nivel_3=nivel_3)
         if space_constraints:
             tensor.metadata['space_id'] = space_constraints
@@ -255,35 +590,328 @@ class FractalTensor:
 # KNOWLEDGE BASE SYSTEM
 # ===============================================================================
 
+class KBChangeEvent:
+    """
+    Notificación de cambio emitida por FractalKnowledgeBase.
+
+    type es 'add' (clave Ss nueva), 'replace' (clave Ss existente) o
+    'bulk' (add_archetypes_bulk; Ss, name y archetype son None y entries
+    lista las filas aceptadas como (Ss, archetype, name)); generation es la
+    del universo y kb_generation la global, ambas ya incrementadas por este
+    cambio.
+    """
+    __slots__ = ('type', 'space_id', 'Ss', 'name', 'generation', 'kb_generation', 'archetype', 'entries')
+
+    def __init__(self, type: str, space_id: str, Ss: Tuple, name: Optional[str], generation: int, kb_generation: int,
+                 archetype: Optional[FractalTensor] = None, entries: Optional[List[Tuple]] = None):
+        self.type = type
+        self.space_id = space_id
+        self.Ss = Ss
+        self.name = name
+        self.generation = generation
+        self.kb_generation = kb_generation
+        self.archetype = archetype
+        self.entries = entries
+
+    def __repr__(self):
+        return (f"KBChangeEvent({self.type}, space={self.space_id!r}, Ss={self.Ss}, "
+                f"gen={self.generation}, kb_gen={self.kb_generation})")
+
+
 class _SingleUniverseKB:
-    """Knowledge base for a single logical space."""
+    """
+    Knowledge base for a single logical space.
+
+    Concurrency: writers mutate under the universe lock; readers take
+    snapshot(), an immutable view that shares the containers with the
+    live universe (copy-on-write: the first write after a snapshot copies
+    the top-level dicts, and each index bucket the first time it changes).
+    """
     
-    def __init__(self):
+    # Raíces más largas no se indexan por comodines (2^n patrones por raíz)
+    WILDCARD_MAX_LEN = 8
+    # Contenedores compartidos con los snapshots publicados
+    _COW_FIELDS = ('storage', 'name_index', 'ss_index', 'ms_index', 'wildcard_index', 'relation_index',
+                   '_wildcard_roots', '_storage_order', '_root_lengths')
+    
+    def __init__(self, space_id: str = 'default', kb: 'FractalKnowledgeBase' = None):
+        self.space_id = space_id
+        self._kb = kb
         self.storage = {}
         self.name_index = {}
         self.ss_index = {}
         self.ms_index = {}
+        # Índice de comodines: patrón de raíz con None en posiciones enmascaradas
+        # -> claves Ss candidatas, en orden de inserción en storage
+        self.wildcard_index: Dict[Tuple, Dict[Tuple, None]] = {}
+        # Igual pero sobre raíces con NULL -> 0, para el experto relator
+        self.relation_index: Dict[Tuple, Dict[Tuple, None]] = {}
+        self._wildcard_roots: Dict[Tuple, Tuple] = {}
+        self._storage_order: Dict[Tuple, int] = {}
+        self._root_lengths: Dict[int, int] = {}
+        self._unindexed_roots = 0
+        # Monótona: se incrementa con cada cambio de contenido
+        self.generation = 0
+        self._init_concurrency()
+    
+    def _init_concurrency(self):
+        self._lock = threading.RLock()
+        self._snapshot: Optional['_SingleUniverseKB'] = None
+        self._shared = False
+        # Buckets de índice ya copiados desde el último snapshot: (id(index), patrón)
+        self._cow_owned: Optional[set] = None
+        self._frozen = False
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_kb'] = None  # FractalKnowledgeBase.__setstate__ lo vuelve a enlazar
+        for name in ('_lock', '_snapshot', '_shared', '_cow_owned', '_frozen'):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('space_id', 'default')
+        self.__dict__.setdefault('_kb', None)
+        self.__dict__.setdefault('generation', 0)
+        self._init_concurrency()
+        # Pickles anteriores a los índices de comodines: reconstruirlos
+        if 'wildcard_index' not in state:
+            self.wildcard_index, self.relation_index = {}, {}
+            self._wildcard_roots, self._storage_order, self._root_lengths = {}, {}, {}
+            self._unindexed_roots = 0
+            for key, archetype in self.storage.items():
+                self._storage_order[key] = len(self._storage_order)
+                self._index_wildcards(key, archetype)
     
     def add_archetype(self, archetype_tensor: FractalTensor, Ss: list, name: Optional[str] = None, **kwargs) -> bool:
         """Add archetype to this universe, validating coherence."""
         if not hasattr(archetype_tensor, 'Ms') or not hasattr(archetype_tensor, 'MetaM'):
              raise ValueError("Archetype must have Ms and MetaM attributes for coherence validation.")
 
-        # Principle of Absolute Coherence: Ms -> MetaM must be unique
-        self._validate_coherence(archetype_tensor.Ms, archetype_tensor.MetaM)
-
-        key = tuple(Ss)
-        self.storage[key] = archetype_tensor
-        self.ss_index[key] = archetype_tensor
-        
-        ms_key = tuple(archetype_tensor.Ms)
-        self.ms_index[ms_key] = archetype_tensor
+        with self._lock:
+            # Principle of Absolute Coherence: Ms -> MetaM must be unique
+            self._validate_coherence(archetype_tensor.Ms, archetype_tensor.MetaM)
+            key = tuple(Ss)
+            replaced = key in self.storage
+            if self._kb is not None:
+                # Write-ahead: el registro durable va antes que la mutación
+                self._kb._log_ahead('replace' if replaced else 'add', self, key, name, archetype=archetype_tensor)
+            self._begin_write()
+
+            if replaced:
+                self._unindex_wildcards(key)
+            else:
+                self._storage_order[key] = len(self._storage_order)
+            self.storage[key] = archetype_tensor
+            self.ss_index[key] = archetype_tensor
+            self._index_wildcards(key, archetype_tensor)
+            
+            ms_key = tuple(archetype_tensor.Ms)
+            self.ms_index[ms_key] = archetype_tensor
 
-        if name:
-            self.name_index[name] = archetype_tensor
-        
+            if name:
+                self.name_index[name] = archetype_tensor
+            
+            self.generation += 1
+            # Dentro del lock: los suscriptores (WAL) ven las escrituras del
+            # universo en el orden en que se aplicaron
+            if self._kb is not None:
+                self._kb._notify('replace' if replaced else 'add', self, key, name, archetype=archetype_tensor)
         return True
 
+    def add_archetypes_bulk(
+        self,
+        archetype_tensors: List[FractalTensor],
+        Ss: List[list],
+        names: Optional[List[Optional[str]]] = None,
+        strict: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Add many archetypes at once, with the same final state as calling
+        add_archetype row by row.
+
+        Coherence (Ms -> MetaM unique) is validated in one grouped pass
+        against the existing index and the earlier rows of the batch.
+        strict=True raises a CoherenceError listing every conflict before
+        writing anything; strict=False skips the conflicting rows and
+        reports them.
+        """
+        names = names if names is not None else [None] * len(archetype_tensors)
+        if not (len(archetype_tensors) == len(Ss) == len(names)):
+            raise ValueError("add_archetypes_bulk: columns must have the same length")
+
+        with self._lock:
+            # 1. Validación agrupada: MetaM de referencia por Ms
+            reference: Dict[Tuple, Any] = {}
+            conflicts = []
+            accepted = []
+            for row, tensor in enumerate(archetype_tensors):
+                if not hasattr(tensor, 'Ms') or not hasattr(tensor, 'MetaM'):
+                    raise ValueError("Archetype must have Ms and MetaM attributes for coherence validation.")
+                ms_key = tuple(tensor.Ms)
+                if ms_key not in reference:
+                    existing = self.ms_index.get(ms_key)
+                    reference[ms_key] = existing.MetaM if existing is not None else tensor.MetaM
+                if reference[ms_key] != tensor.MetaM:
+                    conflicts.append({
+                        'row': row,
+                        'Ms': list(ms_key),
+                        'MetaM': tensor.MetaM,
+                        'expected_MetaM': reference[ms_key]
+                    })
+                else:
+                    accepted.append(row)
+
+            if conflicts and strict:
+                details = "; ".join(
+                    f"row {c['row']}: Ms {c['Ms']} MetaM {c['MetaM']} != {c['expected_MetaM']}"
+                    for c in conflicts[:10]
+                )
+                more = f" (+{len(conflicts) - 10} more)" if len(conflicts) > 10 else ""
+                raise CoherenceError(f"Coherence violation in {len(conflicts)} rows: {details}{more}")
+
+            entries = [(tuple(Ss[row]), archetype_tensors[row], names[row]) for row in accepted]
+            if entries and self._kb is not None:
+                self._kb._log_ahead('bulk', self, None, None, entries=entries)
+            self._begin_write()
+
+            # 2. Estado final por clave Ss (gana la última fila, orden de la primera)
+            final: Dict[Tuple, FractalTensor] = {}
+            for row in accepted:
+                final[tuple(Ss[row])] = archetype_tensors[row]
+
+            replaced = self._store_bulk(final)
+            self.ms_index.update((tuple(archetype_tensors[row].Ms), archetype_tensors[row]) for row in accepted)
+            self.name_index.update((names[row], archetype_tensors[row]) for row in accepted if names[row])
+
+            if accepted:
+                self.generation += 1
+                if self._kb is not None:
+                    self._kb._notify('bulk', self, None, None, entries=entries)
+
+            return {
+                'added': len(final) - replaced,
+                'replaced': replaced,
+                'rows': len(accepted),
+                'conflicts': conflicts
+            }
+
+    def _store_bulk(self, final: Dict[Tuple, FractalTensor]) -> int:
+        """
+        Write the final Ss -> archetype mapping and index it. Replaced keys
+        go through the per-key path; new keys are indexed grouped by root
+        (2^n patterns once per distinct root). Returns the replaced count.
+        """
+        new_items = []
+        replaced = 0
+        for key, archetype_tensor in final.items():
+            if key in self.storage:
+                self._unindex_wildcards(key)
+                self._index_wildcards(key, archetype_tensor)
+                replaced += 1
+            else:
+                self._storage_order[key] = len(self._storage_order)
+                new_items.append((key, archetype_tensor))
+        self.storage.update(final)
+        self.ss_index.update(final)
+
+        by_root: Dict[Tuple, List[Tuple]] = {}
+        for key, archetype_tensor in new_items:
+            nivel_3 = getattr(archetype_tensor, 'nivel_3', None)
+            if not nivel_3:
+                continue
+            root = tuple(nivel_3[0])
+            if len(root) > self.WILDCARD_MAX_LEN:
+                self._unindexed_roots += 1
+                self._wildcard_roots[key] = None
+                continue
+            self._wildcard_roots[key] = root
+            by_root.setdefault(root, []).append(key)
+
+        order = self._storage_order
+        for root, keys in by_root.items():
+            self._root_lengths[len(root)] = self._root_lengths.get(len(root), 0) + len(keys)
+        for index, normalize in (
+            (self.wildcard_index, lambda root: root),
+            (self.relation_index, lambda root: tuple(0 if v is None else v for v in root)),
+        ):
+            runs: Dict[Tuple, List[List[Tuple]]] = {}
+            for root, keys in by_root.items():
+                for pattern in self._masked_patterns(normalize(root)):
+                    runs.setdefault(pattern, []).append(keys)
+            # Las claves nuevas van detrás de todas las existentes en storage
+            for pattern, groups in runs.items():
+                merged = groups[0] if len(groups) == 1 else sorted(
+                    itertools.chain.from_iterable(groups), key=order.__getitem__
+                )
+                self._writable_bucket(index, pattern).update(dict.fromkeys(merged))
+        return replaced
+
+    def restore(self, items, ms_items=(), name_items=()) -> None:
+        """
+        Rebuild the universe from persisted state: items are (Ss key,
+        archetype) pairs in storage order. No coherence validation,
+        generation bump or notification (the data was valid when saved).
+        """
+        final: Dict[Tuple, FractalTensor] = {}
+        for key, archetype_tensor in items:
+            final[tuple(key)] = archetype_tensor
+        with self._lock:
+            self._begin_write()
+            self._store_bulk(final)
+            self.ms_index.update((tuple(ms), archetype_tensor) for ms, archetype_tensor in ms_items)
+            self.name_index.update(name_items)
+            # Sin cambio de generación: el snapshot publicado ya no es válido
+            self._snapshot = None
+
+    def snapshot(self) -> '_SingleUniverseKB':
+        """
+        Immutable view of the current state, safe to read from any thread
+        without locks. Cached per generation: repeated reads without
+        writes in between cost O(1).
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.generation == self.generation:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.generation != self.generation:
+                snapshot = _SingleUniverseKB.__new__(_SingleUniverseKB)
+                snapshot.__dict__.update({name: getattr(self, name) for name in self._COW_FIELDS})
+                snapshot.space_id = self.space_id
+                snapshot._kb = None
+                snapshot._unindexed_roots = self._unindexed_roots
+                snapshot.generation = self.generation
+                snapshot._init_concurrency()
+                snapshot._frozen = True
+                snapshot._snapshot = snapshot
+                self._snapshot = snapshot
+                self._shared = True
+            return self._snapshot
+
+    def _begin_write(self) -> None:
+        """Copy-on-write: stop sharing containers with the published snapshot."""
+        if self._frozen:
+            raise RuntimeError(f"KB snapshot of '{self.space_id}' is read-only")
+        if not self._shared:
+            return
+        for name in self._COW_FIELDS:
+            setattr(self, name, dict(getattr(self, name)))
+        self._cow_owned = set()
+        self._shared = False
+
+    def _writable_bucket(self, index: Dict[Tuple, Dict[Tuple, None]], pattern: Tuple) -> Dict[Tuple, None]:
+        """Index bucket ready to mutate (copied once if a snapshot may share it)."""
+        keys = index.get(pattern)
+        owned = self._cow_owned
+        if owned is not None and (id(index), pattern) not in owned:
+            owned.add((id(index), pattern))
+            if keys is not None:
+                keys = index[pattern] = dict(keys)
+        if keys is None:
+            keys = index[pattern] = {}
+        return keys
+
     def _validate_coherence(self, Ms, MetaM):
         """Principio de Coherencia Absoluta: Ms → MetaM único"""
         existing = self.get_archetype_by_ms(Ms)
@@ -296,6 +924,153 @@ class _SingleUniverseKB:
         key = tuple(Ms_query)
         return self.ms_index.get(key)
     
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _masked_patterns(root: Tuple) -> Tuple[Tuple, ...]:
+        """All 2^n patterns of a root with None at the masked positions."""
+        return tuple({
+            tuple(v if mask >> i & 1 else None for i, v in enumerate(root))
+            for mask in range(1 << len(root))
+        })
+    
+    def _index_wildcards(self, key: Tuple, archetype_tensor: FractalTensor) -> None:
+        """Register the masked patterns of the archetype root in both indexes."""
+        nivel_3 = getattr(archetype_tensor, 'nivel_3', None)
+        if not nivel_3:
+            return
+        root = tuple(nivel_3[0])
+        if len(root) > self.WILDCARD_MAX_LEN:
+            self._unindexed_roots += 1
+            self._wildcard_roots[key] = None
+            return
+
+        self._wildcard_roots[key] = root
+        self._root_lengths[len(root)] = self._root_lengths.get(len(root), 0) + 1
+        self._add_patterns(self.wildcard_index, key, root)
+        # El relator compara con NULL tratado como 0 (Transcender.relate_vectors)
+        self._add_patterns(self.relation_index, key, tuple(0 if v is None else v for v in root))
+    
+    def _add_patterns(self, index: Dict[Tuple, Dict[Tuple, None]], key: Tuple, root: Tuple) -> None:
+        order = self._storage_order
+        for pattern in self._masked_patterns(root):
+            keys = self._writable_bucket(index, pattern)
+            last = next(reversed(keys), None)
+            keys[key] = None
+            # Una clave Ss reemplazada conserva su posición en storage
+            if last is not None and order[last] > order[key]:
+                index[pattern] = dict.fromkeys(sorted(keys, key=order.__getitem__))
+    
+    def _unindex_wildcards(self, key: Tuple) -> None:
+        """Remove the patterns registered for a replaced Ss key."""
+        if key not in self._wildcard_roots:
+            return
+        root = self._wildcard_roots.pop(key)
+        if root is None:
+            self._unindexed_roots -= 1
+            return
+        self._root_lengths[len(root)] -= 1
+        if not self._root_lengths[len(root)]:
+            del self._root_lengths[len(root)]
+        self._remove_patterns(self.wildcard_index, key, root)
+        self._remove_patterns(self.relation_index, key, tuple(0 if v is None else v for v in root))
+    
+    def _remove_patterns(self, index: Dict[Tuple, Dict[Tuple, None]], key: Tuple, root: Tuple) -> None:
+        for pattern in self._masked_patterns(root):
+            keys = index.get(pattern)
+            if keys is not None and key in keys:
+                keys = self._writable_bucket(index, pattern)
+                del keys[key]
+                if not keys:
+                    del index[pattern]
+    
+    def _needs_scan(self, length: int) -> bool:
+        """Indexes are exact only when every root has the query length."""
+        return bool(self._unindexed_roots) or any(l != length for l in self._root_lengths)
+    
+    def _best_indexed(self, index: Dict[Tuple, Dict[Tuple, None]], query: Tuple) -> Tuple[Optional[FractalTensor], int]:
+        """
+        First archetype (in storage order) sharing the most positions with
+        the query, probing masks from most to fewest kept positions.
+        """
+        order = self._storage_order
+        n = len(query)
+        for kept in range(n, -1, -1):
+            best_key = None
+            for positions in itertools.combinations(range(n), kept):
+                pattern = tuple(query[i] if i in positions else None for i in range(n))
+                keys = index.get(pattern)
+                if keys:
+                    first = next(iter(keys))
+                    if best_key is None or order[first] < order[best_key]:
+                        best_key = first
+            if best_key is not None:
+                return self.storage[best_key], kept
+        return None, 0
+    
+    def find_archetype_by_pattern(self, query: List[Optional[int]]) -> Optional[FractalTensor]:
+        """
+        First archetype (in storage order) whose root matches the query,
+        with NULLs in the query acting as wildcards.
+        """
+        query = tuple(query)
+        if self._needs_scan(len(query)):
+            return self._scan_by_pattern(query)
+        keys = self.wildcard_index.get(query)
+        if not keys:
+            return None
+        return self.storage[next(iter(keys))]
+    
+    def _scan_by_pattern(self, query: Tuple) -> Optional[FractalTensor]:
+        """Linear fallback when root lengths differ from the query length."""
+        for candidate in self._rooted_archetypes():
+            candidate_root = candidate.nivel_3[0]
+            if all(
+                val is None or i >= len(candidate_root) or candidate_root[i] == val
+                for i, val in enumerate(query)
+            ):
+                return candidate
+        return None
+    
+    def best_positional_match(self, query: List[int]) -> Tuple[Optional[FractalTensor], int]:
+        """
+        Archetype whose root has the most positions equal to the query
+        (first in storage order on ties) and that match count.
+        """
+        query = tuple(query)
+        # Un NULL en la consulta coincide con NULL: el índice lo trata como comodín
+        if None in query or self._needs_scan(len(query)):
+            best, best_count = None, -1
+            for candidate in self._rooted_archetypes():
+                count = sum(1 for a, b in zip(candidate.nivel_3[0], query) if a == b)
+                if count > best_count:
+                    best_count, best = count, candidate
+            return best, max(best_count, 0)
+        return self._best_indexed(self.wildcard_index, query)
+    
+    def best_relation_match(self, query: List[Optional[int]]) -> Tuple[Optional[FractalTensor], int]:
+        """
+        Archetype with the most neutral (0) components in
+        Transcender.relate_vectors(query, root) and that score.
+        """
+        query = tuple(0 if v is None else v for v in query)
+        if self._needs_scan(len(query)):
+            best, best_score = None, -1
+            for candidate in self._rooted_archetypes():
+                root = candidate.nivel_3[0]
+                if len(root) != len(query):
+                    score = 3  # relate_vectors devuelve [0, 0, 0] si las longitudes difieren
+                else:
+                    score = sum(1 for a, b in zip(query, root) if (0 if b is None else b) == a)
+                if score > best_score:
+                    best_score, best = score, candidate
+            return best, max(best_score, 0)
+        return self._best_indexed(self.relation_index, query)
+    
+    def _rooted_archetypes(self):
+        for candidate in self.storage.values():
+            if hasattr(candidate, 'nivel_3') and candidate.nivel_3:
+                yield candidate
+    
     def find_archetype_by_name(self, name: str) -> Optional[FractalTensor]:
         """Find archetype by name."""
         return self.name_index.get(name)
@@ -307,28 +1082,170 @@ class _SingleUniverseKB:
         return [result] if result else []
 
 class FractalKnowledgeBase:
-    """Multi-universe knowledge base manager."""
+    """
+    Multi-universe knowledge base manager.
+
+    Thread-safe: writes lock only their universe; reads go through
+    snapshot(space_id), which never creates spaces and never blocks on
+    writers of an unchanged universe.
+    """
     
     def __init__(self):
         self.universes = {}
+        # Generación global monótona: cambia con cualquier cambio de universo
+        self.generation = 0
+        self._subscribers: Dict[int, Tuple[Any, Optional[str]]] = {}
+        self._next_token = itertools.count(1)
+        self._write_ahead = None
+        # Protege la creación de universos, la generación global y las suscripciones
+        self._lock = threading.Lock()
     
     def _get_space(self, space_id: str = 'default'):
-        """Get or create a logical space."""
-        if space_id not in self.universes:
-            self.universes[space_id] = _SingleUniverseKB()
-        return self.universes[space_id]
+        """Get or create a logical space (write path)."""
+        universe = self.universes.get(space_id)
+        if universe is None:
+            with self._lock:
+                universe = self.universes.get(space_id)
+                if universe is None:
+                    universe = self.universes[space_id] = _SingleUniverseKB(space_id, kb=self)
+        return universe
+    
+    def get_space(self, space_id: str = 'default') -> Optional[_SingleUniverseKB]:
+        """Live universe or None; never creates it."""
+        return self.universes.get(space_id)
+    
+    def snapshot(self, space_id: str = 'default') -> _SingleUniverseKB:
+        """
+        Read-only snapshot of a universe (empty if it does not exist);
+        never creates it. Use it for every read path.
+        """
+        universe = self.universes.get(space_id)
+        if universe is None:
+            universe = _SingleUniverseKB(space_id)
+        return universe.snapshot()
+    
+    def universe_generation(self, space_id: str) -> int:
+        """Generation of a universe (0 if it does not exist); never creates it."""
+        universe = self.universes.get(space_id)
+        return universe.generation if universe is not None else 0
+    
+    def subscribe(self, callback, space_id: Optional[str] = None) -> int:
+        """
+        Register callback(event: KBChangeEvent) for add/replace events,
+        for one universe or all of them. Returns a token for unsubscribe.
+        """
+        with self._lock:
+            token = next(self._next_token)
+            self._subscribers[token] = (callback, space_id)
+        return token
+    
+    def unsubscribe(self, token: int) -> bool:
+        """Remove a subscription; False if the token is unknown."""
+        with self._lock:
+            return self._subscribers.pop(token, None) is not None
+    
+    def set_write_ahead(self, hook) -> None:
+        """
+        Install (or remove, with None) the durability hook. hook(event) runs
+        inside the universe lock after validation and BEFORE the write is
+        applied or published to subscribers; if it raises, the write is
+        aborted and the exception reaches the caller. At most one hook.
+        """
+        with self._lock:
+            if hook is not None and self._write_ahead is not None:
+                raise RuntimeError("KB already has a write-ahead hook")
+            self._write_ahead = hook
+
+    def _log_ahead(self, event_type: str, universe: '_SingleUniverseKB', key: Tuple, name: Optional[str],
+                   archetype: Optional[FractalTensor] = None, entries: Optional[List[Tuple]] = None):
+        hook = self._write_ahead
+        if hook is None:
+            return
+        # Generaciones que tendrá la escritura si se aplica
+        hook(KBChangeEvent(event_type, universe.space_id, key, name, universe.generation + 1, self.generation + 1,
+                           archetype=archetype, entries=entries))
+
+    def _notify(self, event_type: str, universe: '_SingleUniverseKB', key: Tuple, name: Optional[str],
+                archetype: Optional[FractalTensor] = None, entries: Optional[List[Tuple]] = None):
+        with self._lock:
+            self.generation += 1
+            kb_generation = self.generation
+            subscribers = list(self._subscribers.values())
+        if not subscribers:
+            return
+        event = KBChangeEvent(event_type, universe.space_id, key, name, universe.generation, kb_generation,
+                              archetype=archetype, entries=entries)
+        for callback, space_id in subscribers:
+            if space_id is not None and space_id != universe.space_id:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                # Un suscriptor defectuoso no debe impedir la escritura en la KB
+                logging.getLogger("aurora.trinity").error(f"KB subscriber failed on {event}: {e}")
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Los suscriptores son del proceso en curso; no se persisten
+        state['_subscribers'] = {}
+        state['_write_ahead'] = None
+        state.pop('_next_token', None)
+        state.pop('_lock', None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._subscribers = {}
+        self._next_token = itertools.count(1)
+        self._write_ahead = None
+        self._lock = threading.Lock()
+        for space_id, universe in self.universes.items():
+            universe.space_id = space_id
+            universe._kb = self
+        if 'generation' not in state:
+            self.generation = sum(u.generation for u in self.universes.values())
     
     def add_archetype(self, space_id: str, name: str, archetype_tensor: FractalTensor, Ss: list, **kwargs) -> bool:
         """Add archetype to specified logical space."""
         return self._get_space(space_id).add_archetype(archetype_tensor, Ss, name=name, **kwargs)
     
+    def add_archetypes_bulk(
+        self,
+        space_id: str,
+        archetype_tensors: Optional[List[FractalTensor]] = None,
+        *,
+        Ms: Optional[List[list]] = None,
+        MetaM: Optional[List[list]] = None,
+        Ss: Optional[List[list]] = None,
+        names: Optional[List[Optional[str]]] = None,
+        strict: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Columnar bulk ingestion into a logical space.
+
+        Either pass the archetype tensors, or the Ms/MetaM columns to build
+        root-only archetypes from. Ss defaults to the Ms column. See
+        _SingleUniverseKB.add_archetypes_bulk for the coherence report.
+        """
+        if archetype_tensors is None:
+            if Ms is None:
+                raise ValueError("add_archetypes_bulk needs archetype_tensors or an Ms column")
+            MetaM = MetaM if MetaM is not None else [None] * len(Ms)
+            archetype_tensors = [
+                FractalTensor(nivel_3=[list(ms)], Ms=list(ms), MetaM=metam)
+                for ms, metam in zip(Ms, MetaM)
+            ]
+        if Ss is None:
+            Ss = [tensor.Ms for tensor in archetype_tensors]
+        return self._get_space(space_id).add_archetypes_bulk(archetype_tensors, Ss, names, strict=strict)
+    
     def get_archetype(self, space_id: str, name: str) -> Optional[FractalTensor]:
         """Get archetype by space_id and name."""
-        return self._get_space(space_id).find_archetype_by_name(name)
+        return self.snapshot(space_id).find_archetype_by_name(name)
 
     def get_archetype_by_ms(self, space_id: str, Ms_query: List[int]) -> Optional[FractalTensor]:
         """Find archetype by Ms in a specific space."""
-        return self._get_space(space_id).get_archetype_by_ms(Ms_query)
+        return self.snapshot(space_id).get_archetype_by_ms(Ms_query)
 
 # ===============================================================================
 # PROCESSING MODULES
@@ -392,6 +1309,22 @@ class Transcender:
         MetaM = [TernaryLogic.ternary_xor(a, b) for a, b in zip(M_intermediate, M_emergent)]
         return {'M_emergent': M_emergent, 'MetaM': MetaM, 'Ms': M_emergent, 'Ss': MetaM}
 
+    def compute_vector_trio_batch(self, A, B, C) -> Dict[str, Any]:
+        """
+        Versión vectorizada de compute_vector_trio sobre arrays (..., 3).
+
+        Entradas y salidas usan códigos int8 de VectorizedTrigate (NULL = 2).
+        """
+        vt = VectorizedTrigate()
+        A, B, C = (vt.encode(v) for v in (A, B, C))
+        M_AB, _ = vt.synthesize(A, B)
+        M_BC, _ = vt.synthesize(B, C)
+        M_CA, _ = vt.synthesize(C, A)
+        M_emergent, _ = vt.synthesize(M_AB, M_BC)
+        M_intermediate, _ = vt.synthesize(M_emergent, M_CA)
+        MetaM, _ = vt.synthesize(M_intermediate, M_emergent)
+        return {'M_emergent': M_emergent, 'MetaM': MetaM, 'Ms': M_emergent, 'Ss': MetaM}
+
     def deep_learning(
         self,
         A: List[int],
@@ -422,18 +1355,8 @@ class Transcender:
         Sintetiza tres tensores fractales en uno, de manera jerárquica y elegante.
         Prioriza una raíz de entrada válida por encima de la síntesis.
         """
-        from copy import deepcopy
-        
         # Create output tensor with basic structure
         out = FractalTensor(nivel_3=[[0, 0, 0]])
-        
-        # Ensure all tensors have proper structure
-        if not hasattr(A, 'nivel_3') or not A.nivel_3:
-            A.nivel_3 = [[0, 0, 0]]
-        if not hasattr(B, 'nivel_3') or not B.nivel_3:
-            B.nivel_3 = [[0, 0, 0]]
-        if not hasattr(C, 'nivel_3') or not C.nivel_3:
-            C.nivel_3 = [[0, 0, 0]]
 
         def synthesize_trio(vectors: list) -> list:
             # Only use first 3 elements of each vector
@@ -444,10 +1367,11 @@ class Transcender:
             m_emergent = r.get('M_emergent', [0, 0, 0])
             return [bit if bit is not None else 0 for bit in m_emergent[:3]]
 
-        # Extract vectors for synthesis
-        A_vec = A.nivel_3[0] if A.nivel_3 else [0, 0, 0]
-        B_vec = B.nivel_3[0] if B.nivel_3 else [0, 0, 0]
-        C_vec = C.nivel_3[0] if C.nivel_3 else [0, 0, 0]
+        # Extract vectors for synthesis (inputs without structure read as
+        # neutral; the input tensors are never modified)
+        A_vec = A.nivel_3[0] if getattr(A, 'nivel_3', None) else [0, 0, 0]
+        B_vec = B.nivel_3[0] if getattr(B, 'nivel_3', None) else [0, 0, 0]
+        C_vec = C.nivel_3[0] if getattr(C, 'nivel_3', None) else [0, 0, 0]
         
         # Compute emergent properties
         result = self.compute_vector_trio(A_vec, B_vec, C_vec)
@@ -483,6 +1407,155 @@ class Transcender:
 
         return out
 
+class TrioReductionEngine:
+    """
+    Reducción en árbol de tríos (síntesis de Evolver) sobre códigos int8
+    de VectorizedTrigate.
+
+    Cada nivel agrupa los nodos de tres en tres (el último trío se completa
+    con raíces neutras [0, 0, 0]) y calcula M_emergent de todos los tríos a
+    la vez, igual que Transcender.compute_full_fractal trío a trío. Los
+    tríos de un nivel son independientes: los niveles grandes se reparten
+    en bloques entre un pool de `workers` hilos (NumPy libera el GIL); los
+    motores con el mismo número de workers comparten pool.
+
+    reduce_stream() consume familias de cualquier tamaño por bloques
+    alineados de 3**k raíces: cada bloque se reduce exactamente k niveles a
+    un nodo del árbol completo, así que solo se mantienen un bloque y los
+    nodos de nivel k, con el mismo resultado que la reducción completa.
+    """
+
+    STREAM_BLOCK_LEVELS = 10  # bloques de 3**10 = 59049 raíces
+    PARALLEL_MIN_TRIOS = 1 << 16
+    _ROOT_INDEX = {root: i for i, root in enumerate(itertools.product((0, 1, None), repeat=3))}
+    _ROOT_CODES = None
+    _pools: Dict[int, ThreadPoolExecutor] = {}  # workers -> pool compartido
+    _pool_lock = threading.Lock()
+
+    def __init__(self, workers: Optional[int] = None):
+        self.vt = VectorizedTrigate()
+        self.workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+        if TrioReductionEngine._ROOT_CODES is None:
+            TrioReductionEngine._ROOT_CODES = VectorizedTrigate.encode(list(map(list, self._ROOT_INDEX)))
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            pool = self._pools.get(self.workers)
+            if pool is None:
+                pool = self._pools[self.workers] = ThreadPoolExecutor(max_workers=self.workers,
+                                                                      thread_name_prefix="aurora-reduce")
+            return pool
+
+    @staticmethod
+    def root_of(item) -> list:
+        """Raíz de un tensor tal como la lee compute_full_fractal (o el propio vector)."""
+        if isinstance(item, (list, tuple)):
+            return item
+        nivel_3 = getattr(item, 'nivel_3', None)
+        return nivel_3[0] if nivel_3 else [0, 0, 0]
+
+    def encode_roots(self, items) -> Optional['np.ndarray']:
+        """Códigos (n, 3) de las raíces; None si alguna no es un vector ternario de 3."""
+        index = self._ROOT_INDEX
+        try:
+            rows = np.fromiter((index[tuple(self.root_of(item))] for item in items), dtype=np.int8)
+        except (KeyError, TypeError):
+            return None
+        return self._ROOT_CODES[rows]
+
+    def _trios(self, codes: 'np.ndarray', meta: bool) -> Tuple['np.ndarray', Optional['np.ndarray']]:
+        """M_emergent (y MetaM) de cada trío de un bloque de nodos."""
+        pad = -len(codes) % 3
+        if pad:
+            codes = np.concatenate([codes, np.zeros((pad, 3), dtype=np.int8)])
+        trios = codes.reshape(-1, 3, 3)
+        A, B, C = trios[:, 0], trios[:, 1], trios[:, 2]
+        vt = self.vt
+        M_AB = vt.infer(A, B, 1)
+        M_BC = vt.infer(B, C, 1)
+        M_emergent = vt.infer(M_AB, M_BC, 1)
+        if not meta:
+            return M_emergent, None
+        M_intermediate = vt.infer(M_emergent, vt.infer(C, A, 1), 1)
+        return M_emergent, vt.infer(M_intermediate, M_emergent, 1)
+
+    def _level(self, codes: 'np.ndarray', meta: bool = False) -> Tuple['np.ndarray', Optional['np.ndarray']]:
+        n_trios = -(-len(codes) // 3)
+        if self.workers <= 1 or n_trios < self.PARALLEL_MIN_TRIOS:
+            return self._trios(codes, meta)
+        # Bloques de tríos completos: solo el último puede necesitar relleno
+        step = -(-n_trios // self.workers) * 3
+        parts = list(self._executor().map(
+            lambda start: self._trios(codes[start:start + step], meta), range(0, len(codes), step)
+        ))
+        M_emergent = np.concatenate([m for m, _ in parts])
+        return M_emergent, (np.concatenate([x for _, x in parts]) if meta else None)
+
+    def reduce_codes(self, codes: 'np.ndarray', levels: Optional[int] = None) -> Tuple['np.ndarray', Optional['np.ndarray']]:
+        """
+        Reducir nodos (n, 3) hasta uno solo (levels=None, devuelve también el
+        MetaM del último trío) o exactamente `levels` niveles.
+        """
+        meta = None
+        if levels is None:
+            while len(codes) > 1:
+                codes, meta = self._level(codes, meta=len(codes) <= 3)
+        else:
+            for _ in range(levels):
+                codes, _ = self._level(codes)
+        return codes, meta
+
+    def _tensor(self, root: 'np.ndarray', meta: 'np.ndarray') -> FractalTensor:
+        M_emergent = self.vt.decode(root)
+        MetaM = self.vt.decode(meta)
+        return FractalTensor(nivel_3=[M_emergent], Ms=M_emergent, Ss=list(MetaM), MetaM=MetaM)
+
+    def reduce(self, tensors: List[FractalTensor]) -> Optional[FractalTensor]:
+        """Arquetipo de una familia (>= 2); None si hay raíces no ternarias."""
+        if len(tensors) < 2:
+            raise ValueError("reduce: se necesitan al menos 2 tensores")
+        codes = self.encode_roots(tensors)
+        if codes is None:
+            return None
+        root, meta = self.reduce_codes(codes)
+        return self._tensor(root[0], meta[0])
+
+    def reduce_stream(self, items, block_levels: Optional[int] = None) -> Tuple[FractalTensor, int]:
+        """
+        Arquetipo de un iterable de tensores o raíces (>= 2) sin mantenerlo en
+        memoria. Devuelve (arquetipo, número de elementos).
+        """
+        k = block_levels or self.STREAM_BLOCK_LEVELS
+        block = 3 ** k
+        nodes, buffer, count = [], [], 0
+
+        def reduce_block(chunk):
+            codes = self.encode_roots(chunk)
+            if codes is None:
+                raise ValueError("reduce_stream: las raíces deben ser vectores ternarios de 3 posiciones")
+            return self.reduce_codes(codes, levels=k)[0][0]
+
+        for item in items:
+            if len(buffer) == block:
+                nodes.append(reduce_block(buffer))
+                buffer = []
+            buffer.append(item)
+            count += 1
+
+        if count < 2:
+            raise ValueError(f"reduce_stream: se necesitan al menos 2 elementos ({count} recibidos)")
+        if not nodes:
+            codes = self.encode_roots(buffer)
+            if codes is None:
+                raise ValueError("reduce_stream: las raíces deben ser vectores ternarios de 3 posiciones")
+            root, meta = self.reduce_codes(codes)
+        else:
+            # Más de un bloque: el árbol completo tiene más de k niveles
+            nodes.append(reduce_block(buffer))
+            root, meta = self.reduce_codes(np.stack(nodes))
+        return self._tensor(root[0], meta[0]), count
+
+
 class Evolver:
     """
     Motor de visión fractal unificada para Arquetipos, Dinámicas y Relatores.
@@ -490,6 +1563,7 @@ class Evolver:
     
     def __init__(self):
         self.base_transcender = Transcender()
+        self.reduction_engine = TrioReductionEngine() if np is not None else None
 
     def _perform_full_tensor_synthesis(self, tensors: List[FractalTensor]) -> FractalTensor:
         """
@@ -497,7 +1571,12 @@ class Evolver:
         """
         if not tensors:
             return FractalTensor(nivel_3=[[0, 0, 0]])
+        if len(tensors) > 1 and self.reduction_engine is not None:
+            archetype = self.reduction_engine.reduce(tensors)
+            if archetype is not None:
+                return archetype
         
+        # Ruta escalar: raíces no ternarias o sin NumPy
         current_level_tensors = list(tensors)
         while len(current_level_tensors) > 1:
             next_level_tensors = []
@@ -519,6 +1598,21 @@ class Evolver:
             return FractalTensor(nivel_3=[[0, 0, 0]]) if not tensor_family else tensor_family[0]
         return self._perform_full_tensor_synthesis(tensor_family)
 
+    def compute_fractal_archetype_stream(self, tensor_stream, block_levels: Optional[int] = None) -> FractalTensor:
+        """
+        ARQUETIPO de una familia de cualquier tamaño (iterable de tensores o
+        raíces), reducida por bloques sin materializarla. Mismo resultado que
+        compute_fractal_archetype sobre la lista completa.
+        """
+        iterator = iter(tensor_stream)
+        head = list(itertools.islice(iterator, 2))
+        if len(head) < 2 or self.reduction_engine is None:
+            family = [t if isinstance(t, FractalTensor) else FractalTensor(nivel_3=[list(t)])
+                      for t in itertools.chain(head, iterator)]
+            return self.compute_fractal_archetype(family)
+        archetype, _ = self.reduction_engine.reduce_stream(itertools.chain(head, iterator), block_levels)
+        return archetype
+
 class RecursiveDeductionNetwork:
     """
     Red recursiva de deducción: resuelve NULLs propagando coherencia
@@ -590,29 +1684,17 @@ class RecursiveDeductionNetwork:
         logger.info(f"Backward pass: deducing NULLs in {tensor.nivel_3[0]}")
         
         root = tensor.nivel_3[0] if tensor.nivel_3 else [None, None, None]
-        
-        # 1. Buscar arquetipo similar en KB
-        archetype = None
-        universe = self.kb._get_space(space_id)
-        
-        # Buscar arquetipos con patrón similar (NULLs como wildcards)
-        for key, candidate in universe.storage.items():
-            if not hasattr(candidate, 'nivel_3') or not candidate.nivel_3:
-                continue
-            
-            candidate_root = candidate.nivel_3[0]
-            match = True
-            
-            # Match donde no haya NULL en query
-            for i, val in enumerate(root):
-                if val is not None and i < len(candidate_root):
-                    if candidate_root[i] != val:
-                        match = False
-                        break
-            
-            if match:
-                archetype = candidate
-                break
+        tensor.nivel_3[0] = self._deduce_root(root, space_id)
+        return tensor
+    
+    def _deduce_root(self, root: list, space_id: str) -> list:
+        """
+        Paso backward sobre una raíz: depende solo de la raíz, del espacio y
+        del estado de la KB (recursive_solve_batch lo memoiza por raíz).
+        """
+        # 1. Buscar arquetipo similar en KB (NULLs como wildcards, índice O(1))
+        universe = self.kb.snapshot(space_id)
+        archetype = universe.find_archetype_by_pattern(root)
         
         # 2. Rellenar NULLs usando arquetipo
         if archetype:
@@ -628,17 +1710,15 @@ class RecursiveDeductionNetwork:
                 else:
                     deduced_root.append(0)  # Fallback
             
-            tensor.nivel_3[0] = deduced_root
+            root = deduced_root
         
         # 3. Armonizar para garantizar coherencia
         harmonized = self.armonizador.harmonize(
-            tensor.nivel_3[0], 
+            root, 
             archetype=archetype,
             space_id=space_id
         )
-        tensor.nivel_3[0] = harmonized["output"]
-        
-        return tensor
+        return harmonized["output"]
     
     def recursive_solve(
         self, 
@@ -694,6 +1774,100 @@ class RecursiveDeductionNetwork:
             'converged': False,
             'trace': trace
         }
+    
+    def recursive_solve_batch(
+        self,
+        incomplete_tensors: List[FractalTensor],
+        space_id: str = "default"
+    ) -> List[Dict[str, Any]]:
+        """
+        Resuelve N tensores incompletos a la vez, con el mismo resultado por
+        entrada que recursive_solve (sin modificar los tensores de entrada).
+        
+        - Los patrones repetidos (mismo nivel_3) se resuelven una sola vez.
+        - Los tensores salen del conjunto activo al converger.
+        - Cada raíz distinta se deduce una sola vez por lote: el paso backward
+          solo depende de la raíz y de la KB, y solo modifica nivel_3[0].
+        """
+        # Agrupar entradas por patrón
+        patterns: Dict[Tuple, int] = {}
+        owners: List[int] = []
+        roots: List[Tuple] = []
+        fixed_nulls: List[int] = []
+        fixed_totals: List[int] = []
+        fallback: Dict[int, Dict[str, Any]] = {}
+        for index, tensor in enumerate(incomplete_tensors):
+            if not tensor.nivel_3:
+                # Sin raíz: mismo comportamiento que la ruta individual
+                fallback[index] = self.recursive_solve(tensor.derive(), space_id)
+                owners.append(-1)
+                continue
+            key = tuple(tuple(row) for row in tensor.nivel_3)
+            if key not in patterns:
+                patterns[key] = len(roots)
+                roots.append(key[0])
+                fixed_nulls.append(sum(row.count(None) for row in key[1:]))
+                fixed_totals.append(sum(len(row) for row in key[1:]))
+            owners.append(patterns[key])
+        
+        def coherence_of(u: int) -> float:
+            # La jerarquía se regenera desde la raíz en cada forward, así que
+            # la coherencia es la proporción de valores resueltos
+            total = fixed_totals[u] + len(roots[u])
+            resolved = total - fixed_nulls[u] - roots[u].count(None)
+            return resolved / total if total > 0 else 0.0
+        
+        n = len(roots)
+        traces = [[f"Starting recursive deduction in space '{space_id}'"] for _ in range(n)]
+        iterations = [self.config.MAX_ITERATIONS] * n
+        coherences = [0.0] * n
+        converged = [False] * n
+        deduced: Dict[Tuple, Tuple] = {}
+        
+        active = list(range(n))
+        for iteration in range(self.config.MAX_ITERATIONS):
+            if not active:
+                break
+            # Forward + coherencia
+            still_active = []
+            for u in active:
+                coherence = coherence_of(u)
+                coherences[u] = coherence
+                traces[u].append(f"Iteration {iteration+1}: coherence={coherence:.2f}")
+                if coherence >= self.config.COHERENCE_THRESHOLD:
+                    traces[u].append(f"✅ Converged at iteration {iteration+1}")
+                    iterations[u] = iteration + 1
+                    converged[u] = True
+                else:
+                    still_active.append(u)
+            active = still_active
+            
+            # Backward: una deducción por raíz distinta
+            for u in active:
+                root = roots[u]
+                if root not in deduced:
+                    deduced[root] = tuple(self._deduce_root(list(root), space_id))
+                roots[u] = deduced[root]
+            logger.debug(f"Batch iteration {iteration+1}: {len(active)} active, {len(deduced)} roots deduced")
+        
+        for u in active:
+            coherences[u] = coherence_of(u)
+            traces[u].append(f"⚠️ Max iterations reached. Final coherence={coherences[u]:.2f}")
+        
+        results = []
+        for index, tensor in enumerate(incomplete_tensors):
+            u = owners[index]
+            if u < 0:
+                results.append(fallback[index])
+                continue
+            results.append({
+                'resolved_tensor': tensor.derive(root=roots[u]),
+                'iterations': iterations[u],
+                'final_coherence': coherences[u],
+                'converged': converged[u],
+                'trace': list(traces[u])
+            })
+        return results
 
 
 class Extender:
@@ -708,10 +1882,21 @@ class Extender:
     Ahora integra RecursiveDeductionNetwork para resolver NULLs iterativamente.
     """
     
-    def __init__(self, knowledge_base: FractalKnowledgeBase):
+    # Entradas máximas del memo LUT de extend_fractal (LRU)
+    LUT_MAX_ENTRIES = 4096
+    
+    def __init__(self, knowledge_base: FractalKnowledgeBase, lut_max_entries: int = None):
         self.kb = knowledge_base
         self.transcender = Transcender()
-        self._lut_tables = {}
+        # (space_id, query) -> (generación de la KB, tensor resultante, método)
+        self._lut_tables: "OrderedDict[Tuple, Tuple[int, FractalTensor, str]]" = OrderedDict()
+        self._lut_lock = threading.Lock()  # memo LUT y contadores: consultas en paralelo (query_batch)
+        self.lut_max_entries = lut_max_entries or self.LUT_MAX_ENTRIES
+        self.lut_stats = {'hits': 0, 'misses': 0, 'invalidated': 0, 'evicted': 0}
+        self.expert_stats = {
+            name: {'calls': 0, 'hits': 0, 'time_ms': 0.0}
+            for name in ('archetype', 'dynamics', 'relator')
+        }
         self.armonizador = Armonizador(knowledge_base=self.kb)
         self.recursive_network = RecursiveDeductionNetwork(kb=self.kb)
 
@@ -747,9 +1932,29 @@ class Extender:
         logger.info("Fractal reconstruction complete.")
         return [tensor_A, tensor_B, tensor_C]
 
+    def fractal_reconstruct_batch(self, Ms, MetaM) -> Tuple[Any, Any, Any]:
+        """
+        Versión vectorizada de fractal_reconstruct para arrays (..., 3).
+
+        Aplica la misma cascada de deducción inversa a todos los pares
+        (Ms, MetaM) a la vez y devuelve los arrays A, B, C en códigos int8
+        de VectorizedTrigate (NULL = 2).
+        """
+        vt = VectorizedTrigate()
+        Ms, MetaM = vt.encode(Ms), vt.encode(MetaM)
+
+        M_intermediate, _ = vt.synthesize(Ms, MetaM)
+        M_AB = vt.deduce_a(M=1, R=M_intermediate, B=0)
+        M_BC = np.zeros_like(M_AB)
+
+        A = vt.deduce_a(M=1, R=M_AB, B=0)
+        B = vt.deduce_b(M=1, R=M_AB, A=A)
+        C = vt.deduce_b(M=1, R=M_BC, A=B)
+        return A, B, C
+
     def _validate_archetype(self, ss_query: list, space_id: str) -> Tuple[bool, Optional[FractalTensor]]:
         """Experto Arquetipo como método."""
-        universe = self.kb._get_space(space_id)
+        universe = self.kb.snapshot(space_id)
         ss_key = tuple(int(x) if x in (0, 1) else 0 for x in ss_query[:3])
         logger.debug(f"Looking up archetype with ss_key={ss_key} in space={space_id}")
         
@@ -772,54 +1977,82 @@ class Extender:
 
     def _project_dynamics(self, ss_query: list, space_id: str) -> Tuple[bool, Optional[FractalTensor]]:
         """Experto Dinámica como método."""
-        universe = self.kb._get_space(space_id)
-        best, best_sim = None, -1.0
-        
-        # Buscar en todos los arquetipos almacenados
-        for key, archetype in universe.storage.items():
-            if hasattr(archetype, 'nivel_3') and archetype.nivel_3:
-                archetype_ss = archetype.nivel_3[0]
-                sim = sum(1 for a, b in zip(archetype_ss, ss_query) if a == b) / len(ss_query)
-                if sim > best_sim:
-                    best_sim, best = sim, archetype
+        universe = self.kb.snapshot(space_id)
+        # Mejor coincidencia posicional desde el índice del universo
+        best, matches = universe.best_positional_match(ss_query)
+        best_sim = matches / len(ss_query) if ss_query else 0.0
         
         if best and best_sim > 0.7:
             return True, best
         return False, None
 
     def _contextualize_relations(self, ss_query: list, space_id: str) -> Tuple[bool, Optional[FractalTensor]]:
-        """Experto Relator como método."""
-        universe = self.kb._get_space(space_id)
+        """
+        Experto Relator como método.
+
+        Devuelve el arquetipo original; extend_fractal deriva una copia
+        COW que preserva la raíz de la consulta.
+        """
+        universe = self.kb.snapshot(space_id)
         if not universe.storage:
             logger.debug("No archetypes in universe")
             return False, None
         
-        best, best_score = None, float('-inf')
-        for key, archetype in universe.storage.items():
-            if not hasattr(archetype, 'nivel_3') or not archetype.nivel_3:
-                continue
-            
-            archetype_ss = archetype.nivel_3[0]
-            rel = self.transcender.relate_vectors(ss_query, archetype_ss)
-            score = sum(1 for bit in rel if bit == 0)
-            if score > best_score:
-                best_score, best = score, archetype
-        
+        best, best_score = universe.best_relation_match(ss_query)
         if best:
-            # Create a deep copy to avoid modifying the original
-            from copy import deepcopy
-            result = deepcopy(best)
-            result.nivel_3[0] = list(ss_query[:3])  # Explicitly preserve root
-            logger.debug(f"Contextualized with score={best_score}, root preserved={result.nivel_3[0]}")
-            return True, result
+            logger.debug(f"Contextualized with score={best_score}")
+            return True, best
         
         logger.debug("No relational match found")
         return False, None
 
     def lookup_lut(self, space_id: str, ss_query: list) -> Optional[FractalTensor]:
-        """Lookup in LUT tables."""
-        lut_key = f"{space_id}:{tuple(ss_query)}"
-        return self._lut_tables.get(lut_key)
+        """
+        Lookup in LUT tables.
+
+        Las entradas se guardan con la generación de la KB en que se
+        calcularon; si la KB ha cambiado desde entonces se descartan.
+        """
+        entry = self._lut_entry(space_id, ss_query)
+        return entry[1] if entry else None
+
+    def _lut_entry(self, space_id: str, ss_query: list) -> Optional[Tuple[int, FractalTensor, str]]:
+        lut_key = (space_id, tuple(ss_query))
+        with self._lut_lock:
+            entry = self._lut_tables.get(lut_key)
+            if entry is None:
+                self.lut_stats['misses'] += 1
+                return None
+            if entry[0] != self.kb.generation:
+                del self._lut_tables[lut_key]
+                self.lut_stats['invalidated'] += 1
+                self.lut_stats['misses'] += 1
+                return None
+            self._lut_tables.move_to_end(lut_key)
+            self.lut_stats['hits'] += 1
+            return entry
+
+    def _lut_store(self, space_id: str, ss_query, generation: int, tensor: FractalTensor, method: str):
+        """Guarda un resultado en el memo LUT acotado (expulsa el menos usado)."""
+        lut_key = (space_id, tuple(ss_query))
+        with self._lut_lock:
+            self._lut_tables[lut_key] = (generation, tensor.derive(), method)
+            self._lut_tables.move_to_end(lut_key)
+            while len(self._lut_tables) > self.lut_max_entries:
+                self._lut_tables.popitem(last=False)
+                self.lut_stats['evicted'] += 1
+
+    def invalidate_lut(self, space_id: Optional[str] = None) -> int:
+        """Descarta entradas del memo LUT (de un espacio o todas)."""
+        with self._lut_lock:
+            if space_id is None:
+                removed = len(self._lut_tables)
+                self._lut_tables.clear()
+                return removed
+            stale = [key for key in self._lut_tables if key[0] == space_id]
+            for key in stale:
+                del self._lut_tables[key]
+            return len(stale)
 
     def extend_fractal_recursive(self, input_ss, contexto: dict) -> dict:
         """
@@ -830,9 +2063,9 @@ class Extender:
         """
         space_id = contexto.get('space_id', 'default')
         
-        # Crear tensor desde input
+        # Crear tensor desde input (copia COW: la deducción no modifica el del llamador)
         if hasattr(input_ss, 'nivel_3'):
-            tensor = input_ss
+            tensor = input_ss.derive() if isinstance(input_ss, FractalTensor) else input_ss
         else:
             # Normalizar query a vector ternario con NULLs
             ss_query = input_ss if isinstance(input_ss, (list, tuple)) else [0, 0, 0]
@@ -849,6 +2082,31 @@ class Extender:
             'log': result['trace']
         }
     
+    def extend_fractal_recursive_batch(self, inputs: list, contexto: dict) -> List[dict]:
+        """
+        Versión por lotes de extend_fractal_recursive: resuelve todas las
+        entradas con RecursiveDeductionNetwork.recursive_solve_batch.
+        """
+        space_id = contexto.get('space_id', 'default')
+        tensors = []
+        for input_ss in inputs:
+            if isinstance(input_ss, FractalTensor):
+                tensors.append(input_ss)
+            else:
+                ss_query = input_ss if isinstance(input_ss, (list, tuple)) else [0, 0, 0]
+                tensors.append(FractalTensor(nivel_3=[list(ss_query)]))
+        
+        return [
+            {
+                'reconstructed_tensor': result['resolved_tensor'],
+                'reconstruction_method': f"recursive_deduction (iter={result['iterations']})",
+                'coherence': result['final_coherence'],
+                'converged': result['converged'],
+                'log': result['trace']
+            }
+            for result in self.recursive_network.recursive_solve_batch(tensors, space_id)
+        ]
+    
     def extend_fractal(self, input_ss, contexto: dict) -> dict:
         """
         Orquestador Principal.
@@ -882,47 +2140,65 @@ class Extender:
         
         space_id = contexto.get('space_id', 'default')
         
+        # Memo LUT: consultas repetidas con la KB sin cambios
+        entry = self._lut_entry(space_id, ss_query)
+        if entry is not None:
+            log.append(f"✅ reconstrucción por LUT ({entry[2]}).")
+            return {
+                "reconstructed_tensor": entry[1].derive(),
+                "reconstruction_method": "reconstrucción por LUT",
+                "log": log
+            }
+        generation = self.kb.generation
+        query_key = tuple(ss_query)
+        
+        # Orden de precedencia fijo: el relator siempre acierta si hay
+        # arquetipos, así que reordenar cambiaría la respuesta
         STEPS = [
-            lambda q, s: (self.lookup_lut(s, q) is not None, self.lookup_lut(s, q)),
-            self._validate_archetype,
-            self._project_dynamics,
-            self._contextualize_relations
+            ('archetype', self._validate_archetype),
+            ('dynamics', self._project_dynamics),
+            ('relator', self._contextualize_relations)
         ]
         METHODS = [
-            "reconstrucción por LUT",
             "reconstrucción por arquetipo (axioma)",
             "proyección por dinámica (raíz preservada)",
             "contextualización por relator (raíz preservada)"
         ]
         
-        for step, method in zip(STEPS, METHODS):
+        for (expert, step), method in zip(STEPS, METHODS):
+            stats = self.expert_stats[expert]
+            start = time.perf_counter()
             ok, tensor = step(ss_query, space_id)
-            if ok and tensor is not None:
+            hit = ok and tensor is not None
+            with self._lut_lock:
+                stats['calls'] += 1
+                stats['time_ms'] += (time.perf_counter() - start) * 1000
+                if hit:
+                    stats['hits'] += 1
+            if hit:
                 log.append(f"✅ {method}.")
                 
                 # Si tensor es lista, seleccionar el más cercano
                 if isinstance(tensor, list):
                     tensor = tensor[0] if tensor else FractalTensor(nivel_3=[ss_query])
                 
-                # For dynamic/relator, preserve root
+                # For dynamic/relator, preserve root (copy-on-write: the
+                # archetype in the KB is shared, only the root is replaced)
                 if method.startswith("proyección") or method.startswith("contextualización"):
-                    from copy import deepcopy
-                    result = deepcopy(tensor)
-                    result.nivel_3[0] = ss_query
-                    root_vector = result.nivel_3[0]
+                    root_vector = ss_query
                     harm = self.armonizador.harmonize(root_vector, archetype=root_vector, space_id=space_id)
-                    result.nivel_3[0] = harm["output"]
+                    result = tensor.derive(root=harm["output"])
+                    self._lut_store(space_id, query_key, generation, result, method)
                     return {
                         "reconstructed_tensor": result,
                         "reconstruction_method": method + " + armonizador",
                         "log": log
                     }
                 
-                from copy import deepcopy
-                tensor_c = deepcopy(tensor)
-                root_vector = tensor_c.nivel_3[0] if tensor_c.nivel_3 else ss_query
+                root_vector = tensor.nivel_3[0] if tensor.nivel_3 else ss_query
                 harm = self.armonizador.harmonize(root_vector, archetype=root_vector, space_id=space_id)
-                tensor_c.nivel_3[0] = harm["output"]
+                tensor_c = tensor.derive(root=harm["output"])
+                self._lut_store(space_id, query_key, generation, tensor_c, method)
                 return {
                     "reconstructed_tensor": tensor_c,
                     "reconstruction_method": method + " + armonizador",
@@ -952,6 +2228,27 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
+
+class _QuietThreadFilter(logging.Filter):
+    """Drops records logged from threads inside quiet(); other threads keep logging."""
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not getattr(self._local, 'depth', 0)
+
+    def enter(self) -> None:
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+
+    def exit(self) -> None:
+        self._local.depth -= 1
+
+
+_quiet_threads = _QuietThreadFilter()
+logger.addFilter(_quiet_threads)
+
 Vector = List[Optional[int]]
 
 
@@ -1017,20 +2314,20 @@ class Regrewire(AdjustmentStep):
         # Search in default space and across universes for close archetypes
         candidates = []
         try:
-            candidates += kb._get_space('default').find_archetype_by_ss(query)
+            candidates += kb.snapshot('default').find_archetype_by_ss(query)
         except Exception:
             pass
-        for space_id in getattr(kb, 'universes', {}).keys():
+        for space_id in list(getattr(kb, 'universes', {}).keys()):
             try:
-                candidates += kb._get_space(space_id).find_archetype_by_ss(query)
+                candidates += kb.snapshot(space_id).find_archetype_by_ss(query)
             except Exception:
                 pass
 
         # Fallback: allow partial matching where None in query acts as a wildcard
         if not candidates:
             try:
-                for space_id in getattr(kb, 'universes', {}).keys():
-                    space = kb._get_space(space_id)
+                for space_id in list(getattr(kb, 'universes', {}).keys()):
+                    space = kb.snapshot(space_id)
                     for key, arche in space.ss_index.items():
                         try:
                             key_list = list(key)
@@ -1099,6 +2396,15 @@ class Metatune(AdjustmentStep):
         return tuned
 
 
+class _ArchetypeView:
+    """Minimal archetype stand-in (root + summary) used to build harmonize LUTs."""
+    __slots__ = ('nivel_3', 'nivel_1')
+
+    def __init__(self, root: Vector, summary: int):
+        self.nivel_3 = [list(root)]
+        self.nivel_1 = [summary]
+
+
 class Armonizador:
     """Triadic-aware harmonizer that enforces autosimilarity across fractal levels.
 
@@ -1107,13 +2413,85 @@ class Armonizador:
     - Applies MicroShift, Regrewire, Metatune sequentially
     - Stops early when ambiguity <= thresholds
     - Always returns ternary vector (0,1,None) of length 3
+
+    Length-3 ternary inputs are served from an exhaustive LUT keyed by
+    (vector, archetype root, nivel_1 summary) per tau thresholds. Entries
+    whose path reaches Regrewire are KB-dependent and fall back to the
+    step pipeline when a KB is attached.
     """
 
+    _HARMONIZE_LUTS: Dict[Tuple, Dict[Tuple, Tuple]] = {}
+    _LUT_LOCK = threading.Lock()
+    _DEFAULT_STEPS = (MicroShift, Regrewire, Metatune)
+
     def __init__(self, knowledge_base=None, *, tau_1: int = 1, tau_2: int = 2, tau_3: int = 3):
         self.kb = knowledge_base
         self.tau_1, self.tau_2, self.tau_3 = tau_1, tau_2, tau_3
         self.steps = [MicroShift(), Regrewire(), Metatune()]
 
+    @classmethod
+    def _harmonize_lut(cls, taus: Tuple) -> Dict[Tuple, Tuple]:
+        """Get (building on first use) the exhaustive harmonize LUT for some thresholds."""
+        table = cls._HARMONIZE_LUTS.get(taus)
+        if table is not None:
+            return table
+        with cls._LUT_LOCK:
+            table = cls._HARMONIZE_LUTS.get(taus)
+            if table is None:
+                table = cls._build_harmonize_lut(taus)
+                cls._HARMONIZE_LUTS[taus] = table
+        return table
+
+    @classmethod
+    def _build_harmonize_lut(cls, taus: Tuple) -> Dict[Tuple, Tuple]:
+        """Run the KB-free step pipeline over all 27 x 27 x 9 (vector, root, summary) states."""
+        tau_1, tau_2, tau_3 = taus
+        probe = cls(None, tau_1=tau_1, tau_2=tau_2, tau_3=tau_3)
+        states = (0, 1, None)
+        summaries = (None,) + tuple(range(8))
+        table = {}
+
+        # Only this thread is silenced: the build logs ~6.5k step traces
+        _quiet_threads.enter()
+        try:
+            for vec in itertools.product(states, repeat=3):
+                for root in itertools.product(states, repeat=3):
+                    for summary in summaries:
+                        archetype = list(root) if summary is None else _ArchetypeView(root, summary)
+                        res = probe._harmonize_steps(list(vec), archetype)
+                        table[(vec, root, summary)] = (
+                            tuple(res["output"]),
+                            res["score"],
+                            tuple(res["adjustments"]),
+                            'regrewire' in res["adjustments"],
+                        )
+        finally:
+            _quiet_threads.exit()
+
+        logger.debug(f"Harmonize LUT built for taus={taus}: {len(table)} entries", extra={'ambiguity': 0})
+        return table
+
+    @staticmethod
+    def _lut_key(tensor: Vector, archetype: Union['FractalTensor', Vector]) -> Optional[Tuple]:
+        """LUT key (vector, root, summary) or None when the archetype shape is not tabulated."""
+        vec = tuple(tensor)[:3]
+        if len(vec) < 3:
+            vec += (None,) * (3 - len(vec))
+
+        if hasattr(archetype, 'nivel_3'):
+            if not archetype.nivel_3:
+                return None
+            root = tuple(archetype.nivel_3[0])
+            nivel_1 = getattr(archetype, 'nivel_1', None)
+            summary = nivel_1[0] if nivel_1 else None
+        else:
+            root = tuple(archetype) if archetype else (0, 0, 0)
+            summary = None
+
+        if len(root) != 3:
+            return None
+        return (vec, root, summary)
+
     @staticmethod
     def ambiguity_score(t: Vector, a: Union['FractalTensor', Vector, None]) -> AmbiguityScore:
         # Normalize archetype root
@@ -1145,12 +2523,46 @@ class Armonizador:
     def harmonize(self, tensor: Vector, *, archetype: Union['FractalTensor', Vector, None] = None, space_id: str = "default") -> Dict[str, Any]:
         # Resolve archetype using KB when not provided
         if archetype is None and self.kb:
-            found = self.kb._get_space(space_id).find_archetype_by_ss(tensor)
+            found = self.kb.snapshot(space_id).find_archetype_by_ss(tensor)
             archetype = found[0] if found else None
 
         if archetype is None:
             archetype = [0, 0, 0]
 
+        # Fast path: exhaustive LUT for the default KB-independent pipeline
+        if tuple(type(step) for step in self.steps) == self._DEFAULT_STEPS:
+            key = self._lut_key(tensor, archetype)
+            if key is not None:
+                try:
+                    entry = self._harmonize_lut((self.tau_1, self.tau_2, self.tau_3)).get(key)
+                except TypeError:
+                    entry = None
+                if entry is not None and not (entry[3] and self.kb is not None):
+                    output, score, adjustments, _ = entry
+                    return {"output": list(output), "score": score, "adjustments": list(adjustments)}
+
+        return self._harmonize_steps(tensor, archetype)
+
+    def harmonize_batch(self, tensors: List[Vector], *, archetype: Union['FractalTensor', Vector, None] = None,
+                        space_id: str = "default") -> List[Dict[str, Any]]:
+        """
+        harmonize() over many vectors. Within a batch the result depends only
+        on the vector, so each distinct vector (at most 27 ternary roots) is
+        harmonized once and the result is copied to its repetitions.
+        """
+        memo: Dict[Tuple, Dict[str, Any]] = {}
+        results = []
+        for tensor in tensors:
+            key = tuple(tensor)
+            entry = memo.get(key)
+            if entry is None:
+                entry = memo[key] = self.harmonize(list(tensor), archetype=archetype, space_id=space_id)
+            results.append({"output": list(entry["output"]), "score": entry["score"],
+                            "adjustments": list(entry["adjustments"])})
+        return results
+
+    def _harmonize_steps(self, tensor: Vector, archetype: Union['FractalTensor', Vector]) -> Dict[str, Any]:
+        """Apply MicroShift -> Regrewire -> Metatune with tau early stopping."""
         # Normalize input vector
         vec = list(tensor)[:3] + [None] * max(0, 3 - len(tensor))
         result = vec
@@ -1182,15 +2594,204 @@ class Armonizador:
 
         return {"output": final, "score": score, "adjustments": adjustments}
 
+class EthicalMerkleTree:
+    """
+    Merkle signature of a tensor cluster.
+
+    Leaf = SHA256(0x00 + packed root), where the root (nivel_3[0]) is packed
+    as one byte per trit (0, 1, NULL = 2). Node = SHA256(0x01 + left + right).
+    The tree is an array heap with power-of-two capacity; an empty right
+    subtree promotes its sibling, so the root does not depend on the
+    capacity (same shape as RFC 6962). append() and update() only rehash
+    the path to the root: O(log n).
+    """
+
+    _TRITS = {0: 0, 1: 1, None: 2}
+    EMPTY_ROOT = hashlib.sha256(b'').digest()
+
+    def __init__(self, cluster=()):
+        self._size = 0
+        self._capacity = 1
+        self._nodes: List[Optional[bytes]] = [None, None]
+        self.extend(cluster)
+
+    @staticmethod
+    def root_of(item) -> list:
+        """Root vector of a tensor (or the vector itself)."""
+        nivel_3 = getattr(item, 'nivel_3', None)
+        if nivel_3 is None:
+            return item
+        return nivel_3[0] if nivel_3 else []
+
+    @classmethod
+    def pack_root(cls, root) -> bytes:
+        """One byte per trit; roots with other values fall back to their repr."""
+        try:
+            return b'\x00' + bytes(cls._TRITS[v] for v in root)
+        except (KeyError, TypeError):
+            return b'\x01' + repr(list(root)).encode()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _leaf_digest(packed: bytes) -> bytes:
+        return hashlib.sha256(b'\x00' + packed).digest()
+
+    @classmethod
+    def leaf_hash(cls, item) -> bytes:
+        """Leaf hash of a tensor or root vector (for verifiers)."""
+        return cls._leaf_digest(cls.pack_root(cls.root_of(item)))
+
+    @staticmethod
+    def combine(left: Optional[bytes], right: Optional[bytes]) -> Optional[bytes]:
+        if right is None:
+            return left
+        return hashlib.sha256(b'\x01' + left + right).digest()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def root(self) -> bytes:
+        return self._nodes[1] if self._size else self.EMPTY_ROOT
+
+    def hexdigest(self) -> str:
+        return self.root.hex()
+
+    def _grow(self) -> None:
+        """Double the capacity: the current tree becomes the left subtree."""
+        old, capacity = self._nodes, self._capacity
+        nodes: List[Optional[bytes]] = [None] * (4 * capacity)
+        width = 1
+        while width <= capacity:
+            nodes[2 * width:3 * width] = old[width:2 * width]
+            width *= 2
+        nodes[1] = nodes[2]
+        self._nodes, self._capacity = nodes, 2 * capacity
+
+    def _rehash(self, lo: int, hi: int) -> None:
+        """Recompute the ancestors of heap nodes lo..hi (one level at a time)."""
+        nodes, combine = self._nodes, self.combine
+        while lo > 1:
+            lo //= 2
+            hi //= 2
+            for i in range(lo, hi + 1):
+                nodes[i] = combine(nodes[2 * i], nodes[2 * i + 1])
+
+    def append(self, item) -> int:
+        """Add a tensor (or root) as the next leaf; returns its index."""
+        self.extend([item])
+        return self._size - 1
+
+    def extend(self, cluster) -> None:
+        """Add many leaves, hashing each affected internal node once."""
+        leaves = [self.leaf_hash(item) for item in cluster]
+        if not leaves:
+            return
+        size = self._size + len(leaves)
+        while self._capacity < size:
+            self._grow()
+        start = self._capacity + self._size
+        self._nodes[start:start + len(leaves)] = leaves
+        self._size = size
+        self._rehash(start, start + len(leaves) - 1)
+
+    def update(self, index: int, item) -> None:
+        """Replace leaf `index` (e.g. after harmonizing that tensor)."""
+        if not 0 <= index < self._size:
+            raise IndexError(f"leaf {index} out of range ({self._size} leaves)")
+        node = self._capacity + index
+        self._nodes[node] = self.leaf_hash(item)
+        self._rehash(node, node)
+
+    def _node_index(self, level: int, position: int) -> int:
+        if level < 0 or (1 << level) > self._capacity or not 0 <= position << level < self._size:
+            raise IndexError(f"no subtree at level {level}, position {position}")
+        return (self._capacity >> level) + position
+
+    def subtree(self, level: int = 0, position: int = 0) -> bytes:
+        """Hash of the aligned subtree over leaves [position * 2**level, (position + 1) * 2**level)."""
+        return self._nodes[self._node_index(level, position)]
+
+    def proof(self, index: int, level: int = 0) -> List[Tuple[bool, bytes]]:
+        """
+        Audit path from a leaf (level 0) or aligned subtree to the root:
+        (sibling_is_left, sibling_hash) pairs; empty siblings are skipped.
+        """
+        node = self._node_index(level, index)
+        path = []
+        while node > 1:
+            sibling = self._nodes[node ^ 1]
+            if sibling is not None:
+                path.append((bool(node & 1), sibling))
+            node //= 2
+        return path
+
+    @classmethod
+    def verify(cls, subtree_hash: bytes, proof: List[Tuple[bool, bytes]], root: bytes) -> bool:
+        """Check a leaf or subtree hash against a root with its audit path."""
+        digest = subtree_hash
+        for sibling_is_left, sibling in proof:
+            digest = cls.combine(sibling, digest) if sibling_is_left else cls.combine(digest, sibling)
+        return digest == root
+
+
+def compute_merkle_signature(cluster) -> str:
+    """Merkle root (hex) of a cluster of tensors or roots."""
+    return EthicalMerkleTree(cluster).hexdigest()
+
+def compute_merkle_signatures(clusters) -> List[str]:
+    """
+    Merkle roots of many clusters: leaves come from a shared digest cache
+    and each cluster is reduced level by level without building a heap.
+    """
+    combine = EthicalMerkleTree.combine
+    signatures = []
+    for cluster in clusters:
+        level = [EthicalMerkleTree.leaf_hash(item) for item in cluster]
+        if not level:
+            signatures.append(EthicalMerkleTree.EMPTY_ROOT.hex())
+            continue
+        while len(level) > 1:
+            level = [combine(level[i], level[i + 1] if i + 1 < len(level) else None)
+                     for i in range(0, len(level), 2)]
+        signatures.append(level[0].hex())
+    return signatures
+
+
 class TensorPoolManager:
-    """Pool manager for tensor collections."""
+    """
+    Pool manager for tensor collections.
+
+    The pool's Merkle signature is built on first request and then kept up
+    to date incrementally by add_tensor / update_tensor.
+    """
     
     def __init__(self):
         self.tensors = []
+        self._merkle: Optional[EthicalMerkleTree] = None
     
     def add_tensor(self, tensor: FractalTensor):
         """Add tensor to pool."""
         self.tensors.append(tensor)
+        if self._merkle is not None:
+            self._merkle.append(tensor)
+    
+    def update_tensor(self, index: int, tensor: Optional[FractalTensor] = None):
+        """Replace (or re-sign after an in-place change) the tensor at index."""
+        if tensor is not None:
+            self.tensors[index] = tensor
+        if self._merkle is not None:
+            self._merkle.update(index, self.tensors[index])
+    
+    @property
+    def merkle(self) -> EthicalMerkleTree:
+        if self._merkle is None:
+            self._merkle = EthicalMerkleTree(self.tensors)
+        return self._merkle
+    
+    def signature(self) -> str:
+        """Merkle root (hex) of the pooled tensors."""
+        return self.merkle.hexdigest()
 
 # ===============================================================================
 # PATTERN 0: ETHICAL FRACTAL CLUSTER GENERATION
@@ -1205,30 +2806,33 @@ def compute_ethical_signature(cluster):
     """Compute ethical signature via SHA256 (fractal hash)."""
     return hashlib.sha256(str([t.nivel_3[0] for t in cluster]).encode()).hexdigest()
 
+def compute_ethical_signatures(roots):
+    """compute_ethical_signature([t]) for many roots: one SHA256 per distinct root."""
+    cache = {}
+    signatures = []
+    for root in roots:
+        key = tuple(root)
+        signature = cache.get(key)
+        if signature is None:
+            signature = cache[key] = hashlib.sha256(str([root]).encode()).hexdigest()
+        signatures.append(signature)
+    return signatures
+
 def golden_ratio_select(N, seed):
     """Select indices using golden ratio stepping (PHI-based fractal)."""
     return [(seed + i * int(max(1, round(N * PHI)))) % N for i in range(3)]
 
-def _create_tensor(i, input_data, space_id, kb, entropy_seed):
-    """Atomic tensor creation with ethical constraints (recursive base case)."""
-    if input_data and i < len(input_data):
-        vec = apply_ethical_constraint(input_data[i], space_id, kb)
-        tensor = FractalTensor(nivel_3=[vec])
-    else:
-        tensor = FractalTensor.random(space_constraints=space_id) if hasattr(FractalTensor.random, '__code__') and 'space_constraints' in FractalTensor.random.__code__.co_varnames else FractalTensor.random()
-    
-    tensor.metadata.update({
-        "ethical_hash": compute_ethical_signature([tensor]),
-        "entropy_seed": entropy_seed,
-        "space_id": space_id
-    })
-    return tensor
-
-def _harmonize_tensor(tensor, armonizador, space_id):
-    """Atomic harmonization (recursive base case)."""
-    harmonized = armonizador.harmonize(tensor.nivel_3[0], space_id=space_id)
-    tensor.nivel_3[0] = harmonized["output"]
-    return tensor
+def _random_levels(rng, count):
+    """count random nivel_3 (3x3 bits) from a single block of the call's RNG."""
+    if count <= 0:
+        return []
+    n = 9 * count
+    bits = rng.getrandbits(n)
+    if np is not None:
+        flat = np.unpackbits(np.frombuffer(bits.to_bytes((n + 7) // 8, 'big'), dtype=np.uint8))[-n:]
+        return flat.reshape(count, 3, 3).tolist()
+    digits = format(bits, f'0{n}b')
+    return [[[int(c) for c in digits[j + r:j + r + 3]] for r in (0, 3, 6)] for j in range(0, n, 9)]
 
 def pattern0_create_fractal_cluster(
     *,
@@ -1239,23 +2843,37 @@ def pattern0_create_fractal_cluster(
     entropy_seed=PHI,
     depth_max=3,
 ):
-    """Generate ethical fractal cluster using Pattern 0 (recursive/fractal approach)."""
-    random.seed(int(entropy_seed * 1e9))
+    """
+    Generate ethical fractal cluster using Pattern 0 (recursive/fractal approach).
+
+    Thread-safe: randomness comes from a per-call random.Random seeded with
+    entropy_seed (same seed -> same cluster), never from the global RNG.
+    Random roots are drawn as one block, harmonized with
+    Armonizador.harmonize_batch and signed once per distinct root.
+    """
+    rng = random.Random(int(entropy_seed * 1e9))
     
     # Context initialization (reusable fractal components)
     kb = context.get('kb') if context and 'kb' in context else FractalKnowledgeBase()
     armonizador = context.get('armonizador') if context and 'armonizador' in context else Armonizador(knowledge_base=kb)
     pool = context.get('pool') if context and 'pool' in context else TensorPoolManager()
     
-    # Recursive tensor generation + harmonization (single pass, fractal pipeline)
-    tensors = [
-        _harmonize_tensor(
-            _create_tensor(i, input_data, space_id, kb, entropy_seed),
-            armonizador,
-            space_id
-        )
-        for i in range(num_tensors)
-    ]
+    # Tensor generation: constrained input rows first, random block for the rest
+    given = min(len(input_data), num_tensors) if input_data else 0
+    tensors = [FractalTensor(nivel_3=[apply_ethical_constraint(input_data[i], space_id, kb)]) for i in range(given)]
+    tensors += [FractalTensor(nivel_3=nivel_3) for nivel_3 in _random_levels(rng, num_tensors - given)]
+    
+    # Signatures of the generated roots, then batched harmonization
+    roots = [tensor.nivel_3[0] for tensor in tensors]
+    signatures = compute_ethical_signatures(roots)
+    harmonized = armonizador.harmonize_batch(roots, space_id=space_id)
+    for tensor, signature, result in zip(tensors, signatures, harmonized):
+        tensor.metadata.update({
+            "ethical_hash": signature,
+            "entropy_seed": entropy_seed,
+            "space_id": space_id
+        })
+        tensor.nivel_3[0] = result["output"]
     
     # Pool management (side effect isolation)
     for tensor in tensors:
@@ -1271,14 +2889,22 @@ def pattern0_create_fractal_cluster(
 __all__ = [
     'FractalTensor',
     'Trigate', 
+    'VectorizedTrigate',
+    'TernaryBitplane',
+    'BitplaneTrigate',
     'TernaryLogic',
     'Evolver',
+    'TrioReductionEngine',
     'Extender', 
     'FractalKnowledgeBase',
+    'KBChangeEvent',
     'Armonizador',
     'TensorPoolManager',
+    'EthicalMerkleTree',
     'Transcender',
-    'pattern0_create_fractal_cluster'
+    'pattern0_create_fractal_cluster',
+    'compute_merkle_signature',
+    'compute_merkle_signatures'
 ]
 
 # Compatibility aliases
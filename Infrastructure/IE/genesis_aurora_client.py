@@ -238,7 +238,7 @@ class GenesisAuroraClient:
                 space_id: {
                     "archetypes": len(universe.storage)
                 }
-                for space_id, universe in self.aurora.kb.universes.items()
+                for space_id, universe in list(self.aurora.kb.universes.items())
             }
         }
         
@@ -0,0 +1,431 @@
+"""
+Aurora KB Binary: formato columnar versionado de la Knowledge Base
+==================================================================
+
+Un archivo .akb contiene un segmento por universo, alineado a página para
+poder abrirlo con mmap y cargar solo los universos que se consultan.
+
+Layout (little-endian):
+
+    cabecera    MAGIC(6) | version u16 | n_universos u32 | reservado u32 |
+                generación global u64 (desde la versión 2)
+    directorio  por universo: len u16 | space_id utf-8 | offset u64 | length u64
+    segmentos   SEGMENT_MAGIC(4) | n_secciones u32 |
+                por sección: nombre 8s | offset u64 | length u64 (relativos al segmento)
+                datos de cada sección alineados a 8 bytes
+
+Secciones de un segmento (columnas sobre los arquetipos del universo;
+primero los de storage, en su orden, luego los que solo referencian
+ms_index / name_index):
+
+    keys   claves Ss de storage (vectores)
+    rows   filas de nivel_3 por arquetipo (u32) + las filas (vectores)
+    Ms, Ss, MetaM   vectores por arquetipo (pueden ser None)
+    msidx  índice Ms precalculado: claves (vectores) + fila u32
+    names  índice de nombres precalculado: fila u32 + utf-8
+    meta   metadata no vacía en JSON {fila: dict}
+    gen    generación del universo u64 (desde la versión 2)
+
+Las generaciones se guardan para que una KB recargada siga numerando sus
+cambios donde los dejó (los clientes cachean por generación). Los
+archivos de la versión 1 se leen con generación 0.
+
+Los vectores se guardan como longitudes int16 (-1 = vector None) y códigos
+trit uint8 con la codificación de VectorizedTrigate (0, 1, NULL = 2).
+nivel_9 / nivel_1 no se guardan: se derivan de nivel_3 al leerlos.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from array import array
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+try:
+    from .core import FractalKnowledgeBase, FractalTensor, _SingleUniverseKB
+except ImportError:
+    from core import FractalKnowledgeBase, FractalTensor, _SingleUniverseKB
+
+MAGIC = b'AURKB\x00'
+SEGMENT_MAGIC = b'AKSG'
+FORMAT_VERSION = 2
+NULL_CODE = 2
+PAGE_SIZE = 4096
+
+_HEADER = struct.Struct('<6sHII')
+_GENERATION = struct.Struct('<Q')
+_DIR_ENTRY = struct.Struct('<QQ')
+_SEGMENT_HEADER = struct.Struct('<4sI')
+_SECTION_ENTRY = struct.Struct('<8sQQ')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+# ===============================================================================
+# COLUMN CODECS
+# ===============================================================================
+
+def _le(arr: array) -> bytes:
+    if _BIG_ENDIAN:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if _BIG_ENDIAN:
+        arr.byteswap()
+    return arr
+
+
+def _encode_vectors(vectors: List[Optional[list]]) -> bytes:
+    """Vectores ternarios -> u32 n | int16 longitudes | uint8 códigos."""
+    lengths = array('h')
+    codes = bytearray()
+    for vector in vectors:
+        if vector is None:
+            lengths.append(-1)
+            continue
+        lengths.append(len(vector))
+        for v in vector:
+            if v is None:
+                codes.append(NULL_CODE)
+            elif v in (0, 1):
+                codes.append(int(v))
+            else:
+                raise ValueError(f"Binary KB format stores ternary values only, got {v!r}")
+    return struct.pack('<I', len(vectors)) + _le(lengths) + bytes(codes)
+
+
+def _decode_vectors(data) -> Tuple[List[Optional[list]], int]:
+    """Inverse of _encode_vectors; returns (vectors, bytes consumed)."""
+    (count,) = struct.unpack_from('<I', data, 0)
+    pos = 4
+    lengths = _from_le('h', data[pos:pos + 2 * count])
+    pos += 2 * count
+    decode = (0, 1, None)
+    vectors: List[Optional[list]] = []
+    codes = bytes(data[pos:pos + sum(l for l in lengths if l > 0)])
+    cursor = 0
+    for length in lengths:
+        if length < 0:
+            vectors.append(None)
+            continue
+        vectors.append([decode[c] for c in codes[cursor:cursor + length]])
+        cursor += length
+    return vectors, pos + cursor
+
+
+def _encode_u32(values: List[int]) -> bytes:
+    return struct.pack('<I', len(values)) + _le(array('I', values))
+
+
+def _decode_u32(data) -> Tuple[array, int]:
+    (count,) = struct.unpack_from('<I', data, 0)
+    return _from_le('I', data[4:4 + 4 * count]), 4 + 4 * count
+
+
+def _encode_strings(values: List[str]) -> bytes:
+    encoded = [v.encode('utf-8') for v in values]
+    return _encode_u32([len(e) for e in encoded]) + b''.join(encoded)
+
+
+def _decode_strings(data) -> List[str]:
+    lengths, pos = _decode_u32(data)
+    values = []
+    for length in lengths:
+        values.append(bytes(data[pos:pos + length]).decode('utf-8'))
+        pos += length
+    return values
+
+
+# ===============================================================================
+# SEGMENTS (ONE PER UNIVERSE)
+# ===============================================================================
+
+def _pad(size: int, alignment: int) -> int:
+    return (-size) % alignment
+
+
+def encode_universe(universe: _SingleUniverseKB) -> bytes:
+    """Serializa un universo como segmento columnar."""
+    tensors = list(universe.storage.values())
+    rows_of = {id(t): i for i, t in enumerate(tensors)}
+    for archetype in list(universe.ms_index.values()) + list(universe.name_index.values()):
+        if id(archetype) not in rows_of:
+            rows_of[id(archetype)] = len(tensors)
+            tensors.append(archetype)
+
+    row_counts = [len(t.nivel_3) for t in tensors]
+    all_rows = [list(row) for t in tensors for row in t.nivel_3]
+    metadata = {str(i): t.metadata for i, t in enumerate(tensors) if getattr(t, 'metadata', None)}
+    ms_keys = list(universe.ms_index.keys())
+    name_keys = list(universe.name_index.keys())
+
+    sections = [
+        ('keys', _encode_vectors([list(k) for k in universe.storage.keys()])),
+        ('rows', _encode_u32(row_counts) + _encode_vectors(all_rows)),
+        ('Ms', _encode_vectors([getattr(t, 'Ms', None) for t in tensors])),
+        ('Ss', _encode_vectors([getattr(t, 'Ss', None) for t in tensors])),
+        ('MetaM', _encode_vectors([getattr(t, 'MetaM', None) for t in tensors])),
+        ('msidx', _encode_vectors([list(k) for k in ms_keys])
+                  + _encode_u32([rows_of[id(universe.ms_index[k])] for k in ms_keys])),
+        ('names', _encode_u32([rows_of[id(universe.name_index[n])] for n in name_keys])
+                  + _encode_strings(name_keys)),
+        ('meta', json.dumps(metadata, default=str).encode('utf-8')),
+        ('gen', _GENERATION.pack(universe.generation)),
+    ]
+
+    header_size = _SEGMENT_HEADER.size + _SECTION_ENTRY.size * len(sections)
+    offset = header_size + _pad(header_size, 8)
+    table, body = [], bytearray(b'\0' * (offset - header_size))
+    for name, data in sections:
+        table.append(_SECTION_ENTRY.pack(name.encode('ascii'), offset, len(data)))
+        body += data + b'\0' * _pad(len(data), 8)
+        offset += len(data) + _pad(len(data), 8)
+    return _SEGMENT_HEADER.pack(SEGMENT_MAGIC, len(sections)) + b''.join(table) + bytes(body)
+
+
+def decode_universe(segment, space_id: str, kb: Optional[FractalKnowledgeBase] = None) -> _SingleUniverseKB:
+    """Reconstruye un universo desde su segmento (bytes o memoryview)."""
+    magic, n_sections = _SEGMENT_HEADER.unpack_from(segment, 0)
+    if magic != SEGMENT_MAGIC:
+        raise ValueError(f"Corrupt KB segment for universe '{space_id}'")
+    sections = {}
+    for i in range(n_sections):
+        name, offset, length = _SECTION_ENTRY.unpack_from(
+            segment, _SEGMENT_HEADER.size + i * _SECTION_ENTRY.size
+        )
+        sections[name.rstrip(b'\0').decode('ascii')] = segment[offset:offset + length]
+
+    keys, _ = _decode_vectors(sections['keys'])
+    row_counts, pos = _decode_u32(sections['rows'])
+    all_rows, _ = _decode_vectors(sections['rows'][pos:])
+    Ms, _ = _decode_vectors(sections['Ms'])
+    Ss, _ = _decode_vectors(sections['Ss'])
+    MetaM, _ = _decode_vectors(sections['MetaM'])
+    metadata = json.loads(bytes(sections['meta']).decode('utf-8'))
+
+    tensors = []
+    cursor = 0
+    for i, count in enumerate(row_counts):
+        tensor = FractalTensor(nivel_3=all_rows[cursor:cursor + count], Ms=Ms[i], Ss=Ss[i], MetaM=MetaM[i])
+        cursor += count
+        if str(i) in metadata:
+            tensor.metadata = metadata[str(i)]
+        tensors.append(tensor)
+
+    ms_keys, pos = _decode_vectors(sections['msidx'])
+    ms_rows, _ = _decode_u32(sections['msidx'][pos:])
+    name_rows, pos = _decode_u32(sections['names'])
+    names = _decode_strings(sections['names'][pos:])
+
+    universe = _SingleUniverseKB(space_id, kb=kb)
+    universe.restore(
+        zip(keys, tensors),
+        ms_items=[(k, tensors[r]) for k, r in zip(ms_keys, ms_rows)],
+        name_items=[(n, tensors[r]) for n, r in zip(names, name_rows)]
+    )
+    if 'gen' in sections:
+        (universe.generation,) = _GENERATION.unpack_from(sections['gen'], 0)
+    return universe
+
+
+# ===============================================================================
+# FILE LEVEL
+# ===============================================================================
+
+def save(kb: FractalKnowledgeBase, path: str) -> None:
+    """Escribe la KB completa (escritura atómica vía archivo temporal)."""
+    # Snapshots: consistentes aunque otros hilos sigan escribiendo
+    segments = [(space_id, encode_universe(universe.snapshot())) for space_id, universe in list(kb.universes.items())]
+    # Leída después de los snapshots: nunca menor que la de su contenido
+    generation = kb.generation
+
+    directory_size = sum(2 + len(s.encode('utf-8')) + _DIR_ENTRY.size for s, _ in segments)
+    offset = _HEADER.size + _GENERATION.size + directory_size
+    offset += _pad(offset, PAGE_SIZE)
+    entries, layout = [], []
+    for space_id, data in segments:
+        name = space_id.encode('utf-8')
+        entries.append(struct.pack('<H', len(name)) + name + _DIR_ENTRY.pack(offset, len(data)))
+        layout.append((offset, data))
+        offset += len(data) + _pad(len(data), PAGE_SIZE)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(segments), 0))
+        f.write(_GENERATION.pack(generation))
+        f.write(b''.join(entries))
+        for segment_offset, data in layout:
+            f.write(b'\0' * (segment_offset - f.tell()))
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class KBReader:
+    """Lector de un archivo .akb mapeado en memoria (solo lectura)."""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.directory: Dict[str, Tuple[int, int]] = {}
+        self.generation = 0
+
+        magic, version, n_universes, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an Aurora binary KB")
+        if version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"KB format version {version} is newer than supported ({FORMAT_VERSION})")
+        pos = _HEADER.size
+        if version >= 2:
+            (self.generation,) = _GENERATION.unpack_from(self._mm, pos)
+            pos += _GENERATION.size
+        for _ in range(n_universes):
+            (name_len,) = struct.unpack_from('<H', self._mm, pos)
+            space_id = bytes(self._mm[pos + 2:pos + 2 + name_len]).decode('utf-8')
+            pos += 2 + name_len
+            self.directory[space_id] = _DIR_ENTRY.unpack_from(self._mm, pos)
+            pos += _DIR_ENTRY.size
+
+    def read_universe(self, space_id: str, kb: Optional[FractalKnowledgeBase] = None) -> _SingleUniverseKB:
+        offset, length = self.directory[space_id]
+        view = memoryview(self._mm)[offset:offset + length]
+        try:
+            return decode_universe(view, space_id, kb)
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+
+class MappedUniverses(dict):
+    """
+    Mapping de universos que carga cada segmento al primer acceso.
+
+    Se comporta como el dict FractalKnowledgeBase.universes: los universos
+    aún no cargados cuentan para `in`, len() e iteración; values()/items()
+    cargan los que falten. El mmap se cierra cuando ya no queda ninguno.
+    """
+
+    def __init__(self, reader: KBReader, kb: FractalKnowledgeBase):
+        super().__init__()
+        self._reader = reader
+        self._kb = kb
+        self._pending = dict.fromkeys(reader.directory)
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> List[str]:
+        return list(self._pending)
+
+    def _page_in(self, space_id: str) -> _SingleUniverseKB:
+        with self._lock:
+            if dict.__contains__(self, space_id):
+                return dict.__getitem__(self, space_id)
+            universe = self._reader.read_universe(space_id, self._kb)
+            dict.__setitem__(self, space_id, universe)
+            del self._pending[space_id]
+            if not self._pending:
+                self._reader.close()
+            return universe
+
+    def __getitem__(self, space_id):
+        if space_id in self._pending:
+            return self._page_in(space_id)
+        return dict.__getitem__(self, space_id)
+
+    def __setitem__(self, space_id, universe):
+        with self._lock:
+            self._pending.pop(space_id, None)
+            dict.__setitem__(self, space_id, universe)
+
+    def __delitem__(self, space_id):
+        with self._lock:
+            if space_id in self._pending:
+                del self._pending[space_id]
+            else:
+                dict.__delitem__(self, space_id)
+
+    def __contains__(self, space_id):
+        return space_id in self._pending or dict.__contains__(self, space_id)
+
+    def __iter__(self):
+        return iter(list(dict.keys(self)) + list(self._pending))
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._pending)
+
+    def get(self, space_id, default=None):
+        return self[space_id] if space_id in self else default
+
+    def setdefault(self, space_id, default=None):
+        if space_id not in self:
+            self[space_id] = default
+        return self[space_id]
+
+    def pop(self, space_id, *default):
+        if space_id in self:
+            universe = self[space_id]
+            del self[space_id]
+            return universe
+        if default:
+            return default[0]
+        raise KeyError(space_id)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[space_id] for space_id in list(self)]
+
+    def items(self):
+        return [(space_id, self[space_id]) for space_id in list(self)]
+
+    def copy(self):
+        return dict(self.items())
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def __repr__(self):
+        return f"MappedUniverses(loaded={list(dict.keys(self))}, pending={self.pending})"
+
+
+def open_kb(path: str) -> FractalKnowledgeBase:
+    """Abre la KB mapeada en memoria: cada universo se carga al tocarlo."""
+    kb = FractalKnowledgeBase()
+    reader = KBReader(path)
+    kb.generation = reader.generation
+    if not reader.directory:
+        reader.close()
+        return kb
+    kb.universes = MappedUniverses(reader, kb)
+    return kb
+
+
+def load(path: str, spaces: Optional[List[str]] = None) -> FractalKnowledgeBase:
+    """Carga completa o parcial (solo `spaces`) de un archivo .akb."""
+    kb = FractalKnowledgeBase()
+    reader = KBReader(path)
+    kb.generation = reader.generation
+    try:
+        for space_id in reader.directory:
+            if spaces is None or space_id in spaces:
+                kb.universes[space_id] = reader.read_universe(space_id, kb)
+    finally:
+        reader.close()
+    return kb
@@ -0,0 +1,529 @@
+"""
+Aurora KB WAL: log de escritura anticipada (write-ahead log) de la KB
+=====================================================================
+
+Cada mutación de la KB (add / replace / bulk por universo) se añade como
+un registro al final del segmento de log activo ANTES de aplicarse en
+memoria (gancho write-ahead de la KB): si el registro no se puede
+escribir, la escritura se rechaza con la excepción y la KB no cambia. Una
+escritura cuesta O(1) independientemente del tamaño de la KB. Periódicamente el log
+se compacta en un snapshot (formato binario de kb_binary) y los segmentos
+cubiertos se borran; al arrancar se carga el último snapshot y se
+reaplica la cola del log.
+
+Layout del directorio:
+
+    snapshot-<lsn>.akb   estado con todos los registros con LSN < lsn,
+                         con sus generaciones (por universo y global)
+                         (snapshot-<lsn>.pkl si la KB no es ternaria)
+    wal-<lsn>.log        registros a partir de ese LSN, en orden
+
+Registro (little-endian):
+
+    length u32 | crc32 u32 | lsn u64 | payload JSON utf-8 (length bytes)
+
+El crc32 cubre lsn + payload. Un registro truncado o con crc inválido al
+final del último segmento es una escritura interrumpida por un crash: se
+descarta y el archivo se trunca ahí.
+
+Modos de sincronización (fsync):
+
+    'always'  fsync en cada registro antes de aplicar la escritura
+    'group'   group commit: un hilo de fondo hace un único fsync por lote
+              cada commit_interval segundos; wait_for_sync=True hace que
+              cada escritor espere a que su lote sea durable. Si un fsync
+              falla el WAL queda inutilizable y rechaza las escrituras
+    'none'    solo flush al sistema operativo (tests, datos desechables)
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import pickle
+import re
+import struct
+import threading
+import zlib
+
+try:
+    from .core import CoherenceError, FractalKnowledgeBase, FractalTensor, KBChangeEvent
+    from . import kb_binary
+except ImportError:
+    from core import CoherenceError, FractalKnowledgeBase, FractalTensor, KBChangeEvent
+    import kb_binary
+
+logger = logging.getLogger("aurora.wal")
+
+_RECORD_HEADER = struct.Struct('<IIQ')
+_LSN = struct.Struct('<Q')
+_SEGMENT_RE = re.compile(r'^wal-(\d+)\.log$')
+_SNAPSHOT_RE = re.compile(r'^snapshot-(\d+)\.(akb|pkl)$')
+SYNC_MODES = ('always', 'group', 'none')
+
+
+class WALCorruptionError(Exception):
+    """Registro inválido en mitad del log (no es una cola interrumpida)."""
+    pass
+
+
+# ===============================================================================
+# RECORD CODEC
+# ===============================================================================
+
+def _encode_tensor(tensor: FractalTensor) -> Dict[str, Any]:
+    """Datos base del arquetipo; nivel_9 / nivel_1 se derivan al reaplicar."""
+    return {
+        'nivel_3': tensor.nivel_3,
+        'Ms': getattr(tensor, 'Ms', None),
+        'Ss': getattr(tensor, 'Ss', None),
+        'MetaM': getattr(tensor, 'MetaM', None),
+        'metadata': getattr(tensor, 'metadata', None) or {},
+    }
+
+
+def _decode_tensor(data: Dict[str, Any]) -> FractalTensor:
+    tensor = FractalTensor(nivel_3=data['nivel_3'], Ms=data.get('Ms'), Ss=data.get('Ss'), MetaM=data.get('MetaM'))
+    tensor.metadata = data.get('metadata') or {}
+    return tensor
+
+
+def _event_payload(event: KBChangeEvent) -> Dict[str, Any]:
+    if event.type == 'bulk':
+        return {
+            'op': 'bulk',
+            'space': event.space_id,
+            'entries': [
+                {'Ss': list(ss), 'name': name, 'tensor': _encode_tensor(tensor)}
+                for ss, tensor, name in event.entries or ()
+            ],
+        }
+    return {
+        'op': 'add',
+        'space': event.space_id,
+        'Ss': list(event.Ss),
+        'name': event.name,
+        'tensor': _encode_tensor(event.archetype),
+    }
+
+
+def encode_record(lsn: int, payload: Dict[str, Any]) -> bytes:
+    data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    crc = zlib.crc32(data, zlib.crc32(_LSN.pack(lsn)))
+    return _RECORD_HEADER.pack(len(data), crc, lsn) + data
+
+
+def read_records(path: str) -> Tuple[List[Tuple[int, Dict[str, Any]]], int, bool]:
+    """
+    Leer los registros válidos de un segmento. Devuelve (registros,
+    offset del último registro válido, cola_inválida).
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    records = []
+    offset = 0
+    while offset < len(data):
+        if offset + _RECORD_HEADER.size > len(data):
+            return records, offset, True
+        length, crc, lsn = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        body = data[start:start + length]
+        if len(body) < length or zlib.crc32(body, zlib.crc32(_LSN.pack(lsn))) != crc:
+            return records, offset, True
+        try:
+            records.append((lsn, json.loads(body.decode('utf-8'))))
+        except ValueError:
+            return records, offset, True
+        offset = start + length
+    return records, offset, False
+
+
+def apply_record(kb: FractalKnowledgeBase, payload: Dict[str, Any]) -> None:
+    """Reaplicar un registro sobre la KB (misma ruta que la escritura original)."""
+    universe = kb._get_space(payload['space'])
+    if payload['op'] == 'bulk':
+        entries = payload['entries']
+        universe.add_archetypes_bulk(
+            [_decode_tensor(e['tensor']) for e in entries],
+            [e['Ss'] for e in entries],
+            names=[e['name'] for e in entries],
+            strict=False,
+        )
+    elif payload['op'] == 'add':
+        universe.add_archetype(_decode_tensor(payload['tensor']), payload['Ss'], name=payload['name'])
+    else:
+        raise WALCorruptionError(f"Operación WAL desconocida: {payload['op']!r}")
+
+
+# ===============================================================================
+# WRITE-AHEAD LOG
+# ===============================================================================
+
+class KBWriteAheadLog:
+    """
+    Log de mutaciones de una FractalKnowledgeBase con group commit,
+    compactación en snapshots y recuperación tras crash.
+
+    Se engancha a la KB como gancho write-ahead (set_write_ahead): cada
+    escritura validada (add_archetype, add_archetypes_bulk, también directa
+    sobre un universo) se registra antes de aplicarse, y un fallo al
+    registrarla aborta la escritura. Usar open() para recuperar un
+    directorio existente.
+
+    La compactación automática (cada compact_every registros) se ejecuta en
+    el hilo que escribe; si otro hilo ya está compactando se omite. El
+    snapshot se toma con los locks de todos los universos (un instante) y
+    se escribe a disco bloqueando solo los appends al log.
+    """
+
+    def __init__(self, directory: str, kb: FractalKnowledgeBase, sync: str = 'group',
+                 commit_interval: float = 0.01, compact_every: int = 10000,
+                 wait_for_sync: bool = False, next_lsn: int = 1):
+        if sync not in SYNC_MODES:
+            raise ValueError(f"sync debe ser uno de {SYNC_MODES}")
+        self.directory = str(directory)
+        self.kb = kb
+        self.sync_mode = sync
+        self.commit_interval = commit_interval
+        self.compact_every = compact_every
+        self.wait_for_sync = wait_for_sync
+        self.stats = {'records': 0, 'fsyncs': 0, 'checkpoints': 0, 'replayed': 0, 'truncated_bytes': 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._cond = threading.Condition(threading.Lock())
+        self._next_lsn = next_lsn
+        self._written_lsn = next_lsn - 1
+        self._synced_lsn = next_lsn - 1
+        self._since_checkpoint = 0
+        self._checkpoint_lock = threading.Lock()
+        self._closed = False
+        self._error: Optional[BaseException] = None  # fallo de E/S irrecuperable
+        self._file = self._open_segment(next_lsn)
+        self._synced_offset = self._file.tell()
+
+        self._flusher = None
+        if sync == 'group':
+            self._flusher = threading.Thread(target=self._flush_loop, name="aurora-wal-flusher", daemon=True)
+            self._flusher.start()
+        kb.set_write_ahead(self._write_ahead)
+        self._token = kb.subscribe(self._after_change)
+
+    # -------------------------------------------------------------------------
+    # Apertura y recuperación
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def open(cls, directory: str, kb: Optional[FractalKnowledgeBase] = None, **kwargs) -> 'KBWriteAheadLog':
+        """
+        Recuperar la KB de `directory` (último snapshot + cola del log) y
+        seguir registrando sobre ella. Si el directorio está vacío se usa
+        `kb` (o una KB nueva) y se escribe su snapshot inicial.
+        """
+        directory = str(directory)
+        os.makedirs(directory, exist_ok=True)
+        snapshots, segments = cls._scan(directory)
+
+        if not snapshots and not segments:
+            kb = kb if kb is not None else FractalKnowledgeBase()
+            wal = cls(directory, kb, **kwargs)
+            if any(u.storage for u in kb.universes.values()):
+                wal.checkpoint()
+            return wal
+
+        if kb is not None:
+            logger.warning(f"WAL en {directory} no vacío: se ignora la KB recibida y se recupera del disco")
+        snapshot_lsn, kb = cls._load_snapshot(directory, snapshots)
+
+        replayed, truncated, last_lsn = 0, 0, snapshot_lsn - 1
+        for i, (first_lsn, name) in enumerate(segments):
+            path = os.path.join(directory, name)
+            records, valid_end, torn = read_records(path)
+            if torn:
+                if i != len(segments) - 1:
+                    raise WALCorruptionError(f"Registro inválido en mitad del log: {name}")
+                truncated = os.path.getsize(path) - valid_end
+                with open(path, 'r+b') as f:
+                    f.truncate(valid_end)
+                    f.flush()
+                    os.fsync(f.fileno())
+                logger.warning(f"WAL {name}: cola interrumpida descartada ({truncated} bytes)")
+            for lsn, payload in records:
+                if lsn < snapshot_lsn:
+                    continue  # ya incluido en el snapshot
+                if lsn != last_lsn + 1:
+                    raise WALCorruptionError(f"Hueco en el log: LSN {last_lsn + 1} esperado, {lsn} encontrado")
+                try:
+                    apply_record(kb, payload)
+                except CoherenceError as e:
+                    # La escritura original fue aceptada; solo puede fallar si el
+                    # snapshot ya la incluía con otro orden. Se conserva el estado.
+                    logger.warning(f"WAL LSN {lsn}: {e}")
+                last_lsn = lsn
+                replayed += 1
+
+        wal = cls(directory, kb, next_lsn=last_lsn + 1, **kwargs)
+        wal.stats['replayed'] = replayed
+        wal.stats['truncated_bytes'] = truncated
+        logger.info(f"WAL recuperado desde {directory}: snapshot LSN {snapshot_lsn}, {replayed} registros reaplicados")
+        return wal
+
+    @staticmethod
+    def _scan(directory: str) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        snapshots, segments = [], []
+        for name in os.listdir(directory):
+            match = _SNAPSHOT_RE.match(name)
+            if match:
+                snapshots.append((int(match.group(1)), name))
+                continue
+            match = _SEGMENT_RE.match(name)
+            if match:
+                segments.append((int(match.group(1)), name))
+        return sorted(snapshots), sorted(segments)
+
+    @staticmethod
+    def _load_snapshot(directory: str, snapshots: List[Tuple[int, str]]) -> Tuple[int, FractalKnowledgeBase]:
+        if not snapshots:
+            return 1, FractalKnowledgeBase()
+        lsn, name = snapshots[-1]
+        path = os.path.join(directory, name)
+        if name.endswith('.akb'):
+            kb = kb_binary.load(path)
+        else:
+            with open(path, 'rb') as f:
+                kb = pickle.load(f)
+        # Snapshots anteriores sin generación global: al menos la suma de las
+        # de los universos (como FractalKnowledgeBase.__setstate__)
+        kb.generation = max(kb.generation, sum(u.generation for u in kb.universes.values()))
+        return lsn, kb
+
+    # -------------------------------------------------------------------------
+    # Escritura
+    # -------------------------------------------------------------------------
+
+    def _open_segment(self, first_lsn: int):
+        self._path = os.path.join(self.directory, f"wal-{first_lsn:016d}.log")
+        f = open(self._path, 'ab')
+        self._fsync_directory()
+        return f
+
+    def _write_ahead(self, event: KBChangeEvent) -> None:
+        """Gancho de la KB: registrar (y esperar al fsync) antes de aplicar."""
+        lsn = self.append(_event_payload(event))
+        if self.wait_for_sync and self.sync_mode == 'group' and not self.wait_durable(lsn):
+            raise self._error or RuntimeError("WAL cerrado")
+
+    def _after_change(self, event: KBChangeEvent) -> None:
+        # Compactar solo con la escritura ya aplicada: el snapshot debe
+        # incluir todos los registros anteriores a su LSN
+        if self.compact_every and self._since_checkpoint >= self.compact_every:
+            # Sin bloquear: este hilo tiene el lock de su universo
+            if self._checkpoint_lock.acquire(blocking=False):
+                try:
+                    self._checkpoint_locked()
+                finally:
+                    self._checkpoint_lock.release()
+
+    def append(self, payload: Dict[str, Any]) -> int:
+        """Añadir un registro al log; devuelve su LSN."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WAL cerrado")
+            if self._error is not None:
+                raise RuntimeError(f"WAL inutilizable tras un error de E/S: {self._error}") from self._error
+            lsn = self._next_lsn
+            offset = self._file.tell()
+            try:
+                self._file.write(encode_record(lsn, payload))
+                if self.sync_mode == 'always':
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                elif self.sync_mode == 'none':
+                    self._file.flush()
+            except BaseException:
+                # Registro a medias: fuera del log, o reaparecería al recuperar
+                self._truncate_locked(offset)
+                raise
+            self._next_lsn += 1
+            self._written_lsn = lsn
+            self._since_checkpoint += 1
+            self.stats['records'] += 1
+            if self.sync_mode == 'always':
+                self._synced_lsn = lsn
+                self._synced_offset = self._file.tell()
+                self.stats['fsyncs'] += 1
+            self._cond.notify_all()
+        return lsn
+
+    def _truncate_locked(self, offset: int) -> None:
+        """Recortar el segmento activo a `offset`; si no se puede, WAL inutilizable."""
+        try:
+            try:
+                self._file.close()
+            except OSError:
+                pass  # el buffer pendiente es justo lo que se recorta
+            os.truncate(self._path, offset)
+            self._file = open(self._path, 'ab')
+        except OSError as e:
+            self._error = e
+            logger.error(f"WAL {self._path}: no se pudo descartar un registro fallido: {e}")
+
+    def _sync_locked(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced_lsn = self._written_lsn
+        self._synced_offset = self._file.tell()
+        self.stats['fsyncs'] += 1
+        self._cond.notify_all()
+
+    def _flush_loop(self) -> None:
+        with self._cond:
+            while not self._closed and self._error is None:
+                if self._written_lsn == self._synced_lsn:
+                    self._cond.wait()
+                    continue
+                # Ventana de agrupación: los registros que lleguen mientras
+                # tanto comparten el mismo fsync
+                self._cond.wait(self.commit_interval)
+                if self._written_lsn > self._synced_lsn and not self._closed:
+                    try:
+                        self._sync_locked()
+                    except OSError as e:
+                        # Los escritores que no esperaron ya aplicaron su cambio:
+                        # el log no refleja la KB y no puede aceptar más escrituras
+                        logger.error(f"WAL {self._path}: fsync fallido, escrituras rechazadas: {e}")
+                        self._truncate_locked(self._synced_offset)
+                        self._error = e
+                        self._cond.notify_all()
+
+    def wait_durable(self, lsn: int, timeout: Optional[float] = None) -> bool:
+        """Esperar a que el registro `lsn` esté en disco (fsync)."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._synced_lsn >= lsn or self._closed or self._error is not None, timeout
+            ) and self._synced_lsn >= lsn
+
+    def sync(self) -> None:
+        """Barrera de durabilidad: fsync inmediato de todo lo escrito."""
+        with self._cond:
+            if not self._closed and self._written_lsn > self._synced_lsn:
+                self._sync_locked()
+
+    @property
+    def durable_lsn(self) -> int:
+        return self._synced_lsn
+
+    # -------------------------------------------------------------------------
+    # Compactación
+    # -------------------------------------------------------------------------
+
+    def checkpoint(self) -> int:
+        """
+        Compactar: snapshot de la KB con todo lo registrado, segmento de log
+        nuevo y borrado de los segmentos y snapshots anteriores. Devuelve
+        el LSN del snapshot. No llamar desde un suscriptor de la KB.
+        """
+        with self._checkpoint_lock:
+            return self._checkpoint_locked()
+
+    def _capture(self) -> Tuple[int, Dict[str, Any], int]:
+        """
+        Snapshots de todos los universos, el LSN de corte y la generación
+        global: con los locks de los universos (ningún escritor a medias; la
+        generación se incrementa dentro de ellos) y después el del log.
+        """
+        locked = {}
+        try:
+            while True:
+                for space_id, universe in list(self.kb.universes.items()):
+                    if space_id not in locked:
+                        universe._lock.acquire()
+                        locked[space_id] = universe
+                self._cond.acquire()
+                if all(space_id in locked for space_id in list(self.kb.universes)):
+                    break
+                # Universo creado mientras tanto: bloquearlo también
+                self._cond.release()
+            try:
+                if self._closed:
+                    raise RuntimeError("WAL cerrado")
+                snapshots = {space_id: u.snapshot() for space_id, u in locked.items()}
+                return self._next_lsn, snapshots, self.kb.generation
+            except BaseException:
+                self._cond.release()
+                raise
+        finally:
+            for universe in locked.values():
+                universe._lock.release()
+
+    def _checkpoint_locked(self) -> int:
+        lsn, snapshots, generation = self._capture()
+        try:
+            # Los escritores esperan en append (LSN >= lsn) hasta rotar el segmento
+            self._sync_locked()
+            frozen = FractalKnowledgeBase()
+            frozen.universes = snapshots
+            frozen.generation = generation
+            base = os.path.join(self.directory, f"snapshot-{lsn:016d}")
+            try:
+                kb_binary.save(frozen, base + '.akb')
+            except ValueError:
+                # Valores no ternarios: snapshot pickle (misma atomicidad)
+                with open(base + '.pkl.tmp', 'wb') as f:
+                    pickle.dump(frozen, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(base + '.pkl.tmp', base + '.pkl')
+            self._fsync_directory()
+
+            self._file.close()
+            self._file = self._open_segment(lsn)
+            snapshot_files, segments = self._scan(self.directory)
+            for first_lsn, name in segments:
+                if first_lsn < lsn:
+                    os.remove(os.path.join(self.directory, name))
+            for snapshot_lsn, name in snapshot_files:
+                if snapshot_lsn < lsn:
+                    os.remove(os.path.join(self.directory, name))
+            self._fsync_directory()
+            self._since_checkpoint = 0
+            self.stats['checkpoints'] += 1
+        finally:
+            self._cond.release()
+        logger.info(f"WAL compactado en snapshot LSN {lsn}")
+        return lsn
+
+    def _fsync_directory(self) -> None:
+        if os.name != 'posix':
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self, checkpoint: bool = False) -> None:
+        """Dejar de registrar: fsync final (y snapshot si checkpoint=True)."""
+        if self._closed:
+            return
+        self.kb.set_write_ahead(None)
+        self.kb.unsubscribe(self._token)
+        if checkpoint:
+            self.checkpoint()
+        with self._cond:
+            self._sync_locked()
+            self._closed = True
+            self._cond.notify_all()
+            self._file.close()
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def __enter__(self) -> 'KBWriteAheadLog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self):
+        return (f"KBWriteAheadLog({self.directory!r}, sync={self.sync_mode!r}, "
+                f"next_lsn={self._next_lsn}, durable_lsn={self._synced_lsn})")
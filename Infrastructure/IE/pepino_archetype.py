@@ -27,6 +27,7 @@ from core import (
     Armonizador,
     Trigate,
     pattern0_create_fractal_cluster,
+    compute_merkle_signature,
     PHI
 )
 from typing import Dict, List, Any
@@ -168,32 +169,50 @@ def resolve_ethical_dilemma(
             'similarity_to_pepino': Score de similitud [0-1]
             'iterations': Número de iteraciones para convergencia
     """
+    return resolve_ethical_dilemmas([dilemma_tensor], kb, space_id)[0]
+
+
+def resolve_ethical_dilemmas(
+    dilemma_tensors: List[FractalTensor],
+    kb: FractalKnowledgeBase,
+    space_id: str = 'ethics'
+) -> List[Dict[str, Any]]:
+    """
+    Resuelve varios dilemas éticos a la vez con la red recursiva por lotes
+    (los dilemas repetidos se resuelven una sola vez).
+    
+    Returns:
+        Lista con un Dict por dilema, en el formato de resolve_ethical_dilemma
+    """
     # Asegurar que Pepino está registrado
-    if space_id not in kb.universes or 'pepino_master' not in kb._get_space(space_id).name_index:
+    if kb.get_archetype(space_id, 'pepino_master') is None:
         print(f"⚠️ Pepino no encontrado en {space_id}, registrando...")
         register_pepino(kb, [space_id])
     
     # Resolver usando red recursiva
     network = RecursiveDeductionNetwork(kb)
-    result = network.recursive_solve(dilemma_tensor, space_id)
-    
-    # Calcular similitud con Pepino
+    results = network.recursive_solve_batch(dilemma_tensors, space_id)
     pepino = get_pepino_tensor()
-    final = result['resolved_tensor'].nivel_3[0]
-    similarity = sum(1 for a, b in zip(final, pepino.nivel_3[0]) if a == b) / 3
-    
-    # Generar explicación
-    guidance = _generate_guidance(final, similarity)
     
-    return {
-        'resolved_tensor': result['resolved_tensor'],
-        'guidance': guidance,
-        'guidance_text': guidance,  # ✅ Agregar para Test 5
-        'similarity_to_pepino': similarity,
-        'iterations': result['iterations'],
-        'converged': result['converged'],
-        'trace': result['trace']
-    }
+    resolutions = []
+    for result in results:
+        # Calcular similitud con Pepino
+        final = result['resolved_tensor'].nivel_3[0]
+        similarity = sum(1 for a, b in zip(final, pepino.nivel_3[0]) if a == b) / 3
+        
+        # Generar explicación
+        guidance = _generate_guidance(final, similarity)
+        
+        resolutions.append({
+            'resolved_tensor': result['resolved_tensor'],
+            'guidance': guidance,
+            'guidance_text': guidance,  # ✅ Agregar para Test 5
+            'similarity_to_pepino': similarity,
+            'iterations': result['iterations'],
+            'converged': result['converged'],
+            'trace': result['trace']
+        })
+    return resolutions
 
 
 def _generate_guidance(tensor: List[int], similarity: float) -> str:
@@ -290,6 +309,11 @@ def create_pepino_cluster(
         
         cluster.append(tensor)
     
+    # Firma Merkle del clúster completo (cada lección es una hoja)
+    cluster_signature = compute_merkle_signature(cluster)
+    for tensor in cluster:
+        tensor.metadata['cluster_signature'] = cluster_signature
+    
     return cluster
 
 
@@ -305,7 +329,7 @@ def validate_pepino_integrity(kb: FractalKnowledgeBase, space_id: str = 'ethics'
         True si Pepino está correctamente registrado y su tensor es válido
     """
     try:
-        space = kb._get_space(space_id)
+        space = kb.snapshot(space_id)
         pepino_stored = space.find_archetype_by_name('pepino_master')
         
         if not pepino_stored:
@@ -0,0 +1,108 @@
+"""
+Test de los endpoints por lotes de la API (create / store / query / extend)
+
+Valida que los resultados vuelven en el orden de entrada con errores por
+elemento, que cada lote equivale a las llamadas simples una a una, y que
+se rechazan los lotes vacíos o demasiado grandes.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import aurora_api
+from aurora_api import (
+    ExtendQuery, ExtendQueryBatch, KBStoreBatch, KBStoreItem, TensorCreate,
+    TensorCreateBatch, TensorQuery, TensorQueryBatch
+)
+
+# Los singletons del gateway se construyen en el arranque de la app
+aurora_api.init_gateway()
+
+USER = {"user_id": "batch_user", "peer_id": "peer_batch"}
+
+
+def _store_items():
+    return [
+        KBStoreItem(archetype_name=f"a{i}", space_id="s",
+                    tensor_data={"nivel_3": [[i & 1, (i >> 1) & 1, 1]], "Ss": [i & 1, (i >> 1) & 1, 1], "MetaM": [0, 0, 1]})
+        for i in range(4)
+    ] + [
+        # Mismo Ms que a1 con otro MetaM: incoherente
+        KBStoreItem(archetype_name="conflicto", space_id="s",
+                    tensor_data={"nivel_3": [[1, 0, 1]], "Ss": [0, 0, 0], "MetaM": [1, 1, 1]}),
+        KBStoreItem(archetype_name="otro", space_id="t", tensor_data={"nivel_3": [[0, 1, 0]]}),
+    ]
+
+
+def test_create_and_store_batch():
+    """Lote de tensores y de arquetipos: orden, errores por elemento y un bump por espacio."""
+    created = asyncio.run(aurora_api.create_tensors_batch(
+        TensorCreateBatch(items=[TensorCreate(nivel_3=[[1, 0, 1]]), TensorCreate(random=True), TensorCreate()]),
+        current_user=USER
+    ))
+    assert created["count"] == 3 and created["failed"] == 0
+    assert [r["index"] for r in created["results"]] == [0, 1, 2]
+    assert created["results"][0]["tensor"]["nivel_3"][0] == [1, 0, 1]
+    assert len({r["tensor_key"] for r in created["results"]}) == 3
+
+    stored = asyncio.run(aurora_api.store_archetypes_batch(KBStoreBatch(items=_store_items()), current_user=USER))
+    results = stored["results"]
+    assert stored["failed"] == 1 and not results[4]["success"]
+    assert "Coherence violation" in results[4]["error"]
+    assert all(r["success"] for i, r in enumerate(results) if i != 4)
+    assert results[0]["generation"] == 1 and results[5]["space_id"] == "t"
+    print(f"✅ Lotes create/store: {stored['count']} elementos, {stored['failed']} con error")
+
+
+def test_query_and_extend_batch_match_single_calls():
+    """Cada elemento del lote = la llamada simple equivalente, en el mismo orden."""
+    asyncio.run(aurora_api.store_archetypes_batch(KBStoreBatch(items=_store_items()), current_user=USER))
+
+    queries = [
+        TensorQuery(space_id="s", archetype_name="a2"),
+        TensorQuery(space_id="s", Ms_query=[1, 0, 1]),
+        TensorQuery(space_id="s", archetype_name="nadie"),
+        TensorQuery(space_id="t"),
+    ]
+    batch = asyncio.run(aurora_api.query_archetypes_batch(TensorQueryBatch(items=queries), current_user=USER))
+    for query, result in zip(queries, batch["results"]):
+        single = asyncio.run(aurora_api.query_archetype(query, current_user=USER))
+        assert {k: v for k, v in result.items() if k != "index"} == single
+    assert [r["success"] for r in batch["results"]] == [True, True, False, False]
+
+    extends = [
+        ExtendQuery(ss_query=[1, 0, 1], space_id="s"),
+        ExtendQuery(ss_query=[0, 1, 1], space_id="s", use_recursive=True),
+        ExtendQuery(ss_query=[1, 0, 1], space_id="s"),
+        ExtendQuery(ss_query=[1, 1, 1], space_id="s", use_recursive=True),
+    ]
+    batch = asyncio.run(aurora_api.extend_fractal_batch(ExtendQueryBatch(items=extends), current_user=USER))
+    assert batch["failed"] == 0 and [r["index"] for r in batch["results"]] == [0, 1, 2, 3]
+    for query, result in zip(extends, batch["results"]):
+        single = asyncio.run(aurora_api.extend_fractal(query, current_user=USER))
+        assert result["result"]["tensor"]["nivel_3"] == single["result"]["tensor"]["nivel_3"]
+    print("✅ Lotes query/extend = llamadas simples")
+
+
+def test_batch_size_limits():
+    """Lote vacío → 400; lote mayor que MAX_BATCH_ITEMS → 413."""
+    limit, aurora_api.MAX_BATCH_ITEMS = aurora_api.MAX_BATCH_ITEMS, 2
+    try:
+        with pytest.raises(HTTPException) as empty:
+            asyncio.run(aurora_api.query_archetypes_batch(TensorQueryBatch(items=[]), current_user=USER))
+        with pytest.raises(HTTPException) as large:
+            asyncio.run(aurora_api.create_tensors_batch(
+                TensorCreateBatch(items=[TensorCreate()] * 3), current_user=USER
+            ))
+    finally:
+        aurora_api.MAX_BATCH_ITEMS = limit
+    assert empty.value.status_code == 400 and large.value.status_code == 413
+    print("✅ Límites de tamaño de lote")
+
+
+if __name__ == "__main__":
+    test_create_and_store_batch()
+    test_query_and_extend_batch_match_single_calls()
+    test_batch_size_limits()
@@ -0,0 +1,68 @@
+"""
+Test de los endpoints de gobernanza económica de la API (aurora_api)
+
+Valida que las lecturas del coordinador económico pasan por su carril
+"economics" (esperan a la mutación en curso en vez de leer a la vez en el
+event loop) y que devuelven copias, no las estructuras vivas.
+"""
+
+import asyncio
+import threading
+
+import aurora_api
+
+# Los singletons del gateway se construyen en el arranque de la app
+aurora_api.init_gateway()
+
+USER = {"user_id": "econ_user", "peer_id": "peer_econ"}
+
+
+def test_reads_share_the_economics_lane():
+    """Una lectura espera a la mutación que ocupa el carril y recibe una copia."""
+    coordinator = aurora_api.economics_coordinator
+    release = threading.Event()
+    order = []
+
+    def slow_mutation():
+        release.wait(5)
+        coordinator.supplies["MERIT"] += 1
+        order.append("mutation")
+
+    async def scenario():
+        mutation = asyncio.ensure_future(aurora_api.execution.run("economics", slow_mutation))
+        await asyncio.sleep(0.05)
+        read = asyncio.ensure_future(aurora_api.get_token_supplies(current_user=USER))
+        await asyncio.sleep(0.05)
+        waiting = not read.done()
+        release.set()
+        await mutation
+        response = await read
+        order.append("read")
+        return waiting, response
+
+    before = coordinator.supplies["MERIT"]
+    waiting, response = asyncio.run(scenario())
+    assert waiting and order == ["mutation", "read"]
+    assert response["supplies"]["MERIT"] == before + 1
+    assert response["supplies"] is not coordinator.supplies
+    print("✅ Lecturas económicas serializadas con las mutaciones")
+
+
+def test_governance_endpoints_return_copies():
+    """Políticas, histórico y métricas responden con copias."""
+    asyncio.run(aurora_api.register_user_model(current_user=USER))
+    policies = asyncio.run(aurora_api.get_current_policies(current_user=USER))
+    nombre = next(iter(policies["politicas"]))
+
+    history = asyncio.run(aurora_api.get_policy_history(nombre, current_user=USER))
+    assert history["num_cambios"] >= 1
+
+    metrics = asyncio.run(aurora_api.get_metrics(current_user=USER))
+    assert metrics["economics"]["gobernanza"]["total_modelos"] >= 1
+    assert metrics["economics"]["supplies"] is not aurora_api.economics_coordinator.supplies
+    print(f"✅ Endpoints de gobernanza: {nombre} con {history['num_cambios']} cambios")
+
+
+if __name__ == "__main__":
+    test_reads_share_the_economics_lane()
+    test_governance_endpoints_return_copies()
@@ -0,0 +1,148 @@
+"""
+Test del pool de motores por usuario de la API (api_engines)
+
+Valida que los motores se reutilizan entre peticiones (con su memo LUT
+caliente), que los préstamos concurrentes no comparten motor, y que los
+límites por usuario, el presupuesto global y la inactividad los expulsan.
+Un motor prestado a un worker solo vuelve al pool cuando el worker termina,
+aunque la petición se cancele antes, y no vuelve si entretanto se soltó su
+usuario.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from core import FractalKnowledgeBase, FractalTensor
+from api_engines import EnginePool
+from api_executor import ExecutionLayer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _kb():
+    kb = FractalKnowledgeBase()
+    kb.add_archetype('s', 'a', FractalTensor(nivel_3=[[1, 0, 1]], Ms=[1, 0, 1], MetaM=[0, 0, 1]), [1, 0, 1])
+    return kb
+
+
+def test_reuse_keeps_caches_warm():
+    """La segunda petición reutiliza el Extender y acierta en su LUT."""
+    pool = EnginePool()
+    kb = _kb()
+    with pool.lease('u', kb) as extender:
+        extender.extend_fractal([1, 0, 1], {'space_id': 's'})
+    with pool.lease('u', kb) as again:
+        result = again.extend_fractal([1, 0, 1], {'space_id': 's'})
+    assert again is extender
+    assert result['reconstruction_method'] == "reconstrucción por LUT"
+    assert pool.stats['created'] == 1 and pool.stats['reused'] == 1
+    print(f"✅ Motor reutilizado: {pool.summary()}")
+
+
+def test_concurrent_leases_and_bounds():
+    """Préstamos simultáneos → motores distintos; sobrantes y KB reemplazada se descartan."""
+    pool = EnginePool(max_per_user=2, max_engines=3)
+    kb = _kb()
+    with pool.lease('u', kb) as a, pool.lease('u', kb) as b, pool.lease('u', kb) as c:
+        assert len({id(a), id(b), id(c)}) == 3
+    assert pool.summary()['idle'] == 2 and pool.stats['discarded'] == 1
+
+    # Presupuesto global: el usuario menos reciente cede sus motores
+    for user in ('v', 'w'):
+        with pool.lease(user, _kb()):
+            pass
+    assert pool.summary()['idle'] == 3 and pool.stats['evicted'] == 1
+
+    # Una KB nueva para el mismo usuario invalida sus motores
+    with pool.lease('u', FractalKnowledgeBase()) as fresh:
+        assert fresh is not a and fresh is not b
+    print(f"✅ Límites del pool: {pool.summary()}")
+
+
+def test_idle_eviction():
+    """Los motores ociosos más de idle_seconds desaparecen (sweep u oportunista)."""
+    clock = _Clock()
+    pool = EnginePool(idle_seconds=60, clock=clock)
+    kb = _kb()
+    with pool.lease('u', kb):
+        pass
+    clock.now = 30
+    with pool.lease('v', kb):
+        pass
+    clock.now = 80
+    assert pool.sweep() == 1 and pool.summary()['users'] == 1
+
+    clock.now = 200  # el barrido oportunista de lease() limpia a 'v'
+    with pool.lease('w', kb):
+        assert pool.summary()['idle'] == 0
+    assert pool.stats['evicted'] == 2
+    print("✅ Expulsión por inactividad")
+
+
+def test_checkout_returns_after_cancelled_worker():
+    """Petición cancelada: el motor sigue prestado hasta que acaba su worker."""
+    pool = EnginePool()
+    layer = ExecutionLayer(thread_workers=2)
+    kb = _kb()
+    release = threading.Event()
+
+    def job(extender):
+        release.wait(5)
+        return extender.extend_fractal([1, 0, 1], {'space_id': 's'})
+
+    async def scenario():
+        extender, give_back = pool.checkout('u', kb)
+        request = asyncio.ensure_future(layer.run("extend", job, extender, on_done=give_back))
+        await asyncio.sleep(0.05)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        during = pool.summary()['in_use']
+        other, give_other = pool.checkout('u', kb)  # no puede ser el mismo motor
+        give_other()
+        release.set()
+        while pool.summary()['in_use']:
+            await asyncio.sleep(0.01)
+        give_back()  # devolver dos veces no cuenta
+        return extender, other, during
+
+    extender, other, during = asyncio.run(scenario())
+    layer.shutdown()
+    assert during == 1 and other is not extender
+    assert pool.summary()['in_use'] == 0 and pool.summary()['idle'] == 2
+    print(f"✅ Motor devuelto al terminar el worker: {pool.summary()}")
+
+
+def test_drop_user_discards_leased_engines():
+    """Un motor prestado cuando se suelta su usuario no vuelve al pool."""
+    pool = EnginePool()
+    kb = _kb()
+    with pool.lease('u', kb) as kept:
+        pass
+    extender, give_back = pool.checkout('u', kb)
+    assert extender is kept
+    with pool.lease('v', kb):
+        assert pool.drop_user('u') == 0  # nada ocioso: el motor de 'u' está prestado
+    give_back()
+    summary = pool.summary()
+    assert summary['idle'] == 1 and summary['in_use'] == 0  # solo el de 'v'
+    assert pool.stats['discarded'] == 1 and pool._leased == {}
+    with pool.lease('u', kb) as fresh:
+        assert fresh is not extender
+    print(f"✅ Motores prestados descartados tras drop_user: {pool.summary()}")
+
+
+if __name__ == "__main__":
+    test_reuse_keeps_caches_warm()
+    test_concurrent_leases_and_bounds()
+    test_idle_eviction()
+    test_checkout_returns_after_cancelled_worker()
+    test_drop_user_discards_leased_engines()
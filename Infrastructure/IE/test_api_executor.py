@@ -0,0 +1,140 @@
+"""
+Test de la capa de ejecución de la API (api_executor)
+
+Valida que el trabajo sale del event loop, que se respeta el límite de
+concurrencia por endpoint con métricas de tiempo en cola, y que los
+trabajos pesados dan el mismo resultado en el pool de procesos, que una
+petición cancelada no libera su hueco antes de que el worker termine, y que
+importar aurora_api (como hacen los workers spawn) no construye el gateway.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from api_executor import ExecutionLayer, parse_limits, pattern0_job
+
+
+def test_loop_stays_responsive():
+    """Un trabajo bloqueante no detiene otras corrutinas del loop."""
+    layer = ExecutionLayer(thread_workers=2)
+
+    async def scenario():
+        slow = asyncio.ensure_future(layer.run("extend", time.sleep, 0.3))
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)  # equivale a atender /health mientras tanto
+        tick = time.perf_counter() - start
+        await slow
+        return tick
+
+    tick = asyncio.run(scenario())
+    layer.shutdown()
+    assert tick < 0.2
+    print(f"✅ Loop libre durante el trabajo: tick {tick * 1000:.1f} ms")
+
+
+def test_endpoint_limit_and_queue_metrics():
+    """Nunca más de `limit` trabajos a la vez; los que esperan suman tiempo en cola."""
+    layer = ExecutionLayer(thread_workers=8, limits={"extend": 2})
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def job(i):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        return i * 2
+
+    async def scenario():
+        return await asyncio.gather(*(layer.run("extend", job, i) for i in range(6)))
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8, 10]
+    stats = layer.stats()["endpoints"]["extend"]
+    layer.shutdown()
+    assert running["max"] == 2
+    assert stats["completed"] == 6 and stats["in_flight"] == 0 and stats["limit"] == 2
+    assert stats["queue_ms"]["max_ms"] >= 90  # el último lote espera a dos rondas
+    assert stats["run_ms"]["p50_ms"] >= 40
+    print(f"✅ Límite por endpoint: cola p99 {stats['queue_ms']['p99_ms']:.1f} ms")
+
+
+def test_errors_and_process_pool():
+    """Las excepciones llegan al handler; pattern0 en proceso = llamada directa."""
+    layer = ExecutionLayer(thread_workers=1, process_workers=1)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await layer.run("kb", fail)
+        return await layer.run("pattern0", pattern0_job, "ética", 5, kind="process")
+
+    remote = asyncio.run(scenario())
+    stats = layer.stats()["endpoints"]
+    layer.shutdown()
+    assert remote == pattern0_job("ética", 5)
+    assert stats["kb"]["failed"] == 1 and stats["pattern0"]["completed"] == 1
+    assert parse_limits("extend=4, pattern0=1") == {"extend": 4, "pattern0": 1}
+    print(f"✅ Pool de procesos: firma {remote['cluster_signature'][:16]}…")
+
+
+def test_cancelled_request_keeps_slot_until_worker_ends():
+    """Cancelar la petición no libera el hueco: el siguiente espera al worker."""
+    layer = ExecutionLayer(thread_workers=4, limits={"extend": 1})
+    release = threading.Event()
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def job():
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        release.wait(5)
+        with lock:
+            running["now"] -= 1
+        return "ok"
+
+    async def scenario():
+        first = asyncio.ensure_future(layer.run("extend", job))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        second = asyncio.ensure_future(layer.run("extend", job))
+        await asyncio.sleep(0.05)
+        in_flight = layer.stats()["endpoints"]["extend"]["in_flight"]
+        release.set()
+        return in_flight, await second
+
+    in_flight, result = asyncio.run(scenario())
+    stats = layer.stats()["endpoints"]["extend"]
+    layer.shutdown()
+    assert result == "ok" and running["max"] == 1
+    assert in_flight == 1 and stats["in_flight"] == 0
+    print("✅ Cancelación: el hueco se libera al terminar el worker")
+
+
+def test_import_does_not_build_gateway():
+    """Los workers spawn reimportan el módulo principal: importar no crea singletons."""
+    code = "import aurora_api; assert aurora_api.execution is None and aurora_api.residency is None"
+    done = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+    assert done.returncode == 0, done.stderr[-500:]
+    print("✅ Importar aurora_api no construye el gateway")
+
+
+if __name__ == "__main__":
+    test_loop_stays_responsive()
+    test_endpoint_limit_and_queue_metrics()
+    test_errors_and_process_pool()
+    test_cancelled_request_keeps_slot_until_worker_ends()
+    test_import_does_not_build_gateway()
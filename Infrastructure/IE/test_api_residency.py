@@ -0,0 +1,215 @@
+"""
+Test de la residencia de KB por usuario en la API (api_residency)
+
+Valida que al superar el presupuesto se vuelcan a disco las KB menos
+usadas y se recargan intactas, que las KB fijadas o recientes no se
+expulsan, que con WAL la expulsión es un checkpoint, y que el barrido de
+la API elimina las sesiones expiradas. Los volcados huérfanos se borran
+solo al arrancar y por defecto cada gestor vuelca en un directorio privado.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from core import FractalTensor
+from api_residency import KBResidencyManager
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fill(kb, n, space='s'):
+    for i in range(n):
+        root = [i & 1, (i >> 1) & 1, (i >> 2) & 1]
+        kb.add_archetype(space, f'a{i}', FractalTensor(nivel_3=[root], Ms=root, MetaM=[0, 0, 1]), [i, 0, 1])
+
+
+def _state(kb):
+    return {s: [(k, t.nivel_3, t.Ms) for k, t in u.storage.items()] for s, u in kb.universes.items()}
+
+
+def test_lru_spill_and_reload(tmp_path):
+    """Por encima del presupuesto se vuelca la KB LRU; la siguiente petición la recarga."""
+    evicted = []
+    budget = KBResidencyManager.ARCHETYPE_BYTES * 10
+    manager = KBResidencyManager(budget, str(tmp_path), on_evict=evicted.append)
+    for user in ('ana', 'bo'):
+        _fill(manager.get(user), 4)
+    expected = _state(manager.get('ana'))  # 'bo' pasa a ser el LRU
+
+    _fill(manager.get('cy'), 4)
+    manager.enforce_budget()
+    assert evicted == ['bo'] and 'bo' not in manager and len(manager) == 2
+    assert len(os.listdir(tmp_path)) == 1
+
+    # Recarga transparente (y 'ana', ahora LRU, sale para hacer sitio)
+    bo = manager.get('bo')
+    assert [k for k, *_ in _state(bo)['s']] == [(i, 0, 1) for i in range(4)]
+    assert bo.generation == 4 and bo.universe_generation('s') == 4  # la numeración sigue
+    assert evicted == ['bo', 'ana'] and _state(manager.get('ana')) == expected
+    assert manager.stats['loaded'] == 2
+
+    # KB ternaria: volcado binario (.akb), que también conserva las generaciones
+    dan = manager.get('dan')
+    for i in range(3):
+        root = [i & 1, (i >> 1) & 1, 1]
+        dan.add_archetype('s', f'd{i}', FractalTensor(nivel_3=[root], Ms=root, MetaM=[0, 0, 1]), root)
+    assert manager.evict('dan') and any(name.endswith('.akb') for name in os.listdir(tmp_path))
+    dan = manager.get('dan')
+    assert dan.generation == 3 and dan.universe_generation('s') == 3
+    print(f"✅ Volcado LRU y recarga: {manager.summary()}")
+
+
+def test_pins_idle_sweep_and_concurrent_reload(tmp_path):
+    """Fijadas nunca salen; sweep expulsa ociosas; recargas simultáneas dan la misma KB."""
+    clock = _Clock()
+    manager = KBResidencyManager(0, str(tmp_path), idle_seconds=60, clock=clock)
+    kb = manager.pin('u')
+    _fill(kb, 3)
+    assert manager.sweep() == 0 and 'u' in manager  # presupuesto 0, pero fijada
+    manager.unpin('u')
+    manager.memory_budget_bytes = 10 ** 9
+
+    clock.now = 30
+    _fill(manager.pin('v'), 2)
+    manager.unpin('v')
+    clock.now = 80
+    assert manager.sweep() == 1 and 'u' not in manager and 'v' in manager
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get('u'))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(kb) for kb in results}) == 1 and manager.stats['loaded'] == 1
+    print("✅ Fijadas, barrido por inactividad y recarga concurrente")
+
+
+def test_wal_residency(tmp_path):
+    """Con WAL, expulsar cierra el log con checkpoint y recargar lo reabre."""
+    manager = KBResidencyManager(10 ** 9, str(tmp_path / 'spill'), wal_root=str(tmp_path / 'wal'))
+    _fill(manager.get('w'), 5)
+    expected = _state(manager.get('w'))
+    assert manager.evict('w')
+
+    reloaded = manager.get('w')
+    assert _state(reloaded) == expected
+    _fill(reloaded, 6, space='t')
+    manager.close()
+    again = KBResidencyManager(10 ** 9, str(tmp_path / 'spill'), wal_root=str(tmp_path / 'wal'))
+    assert len(again.get('w').universes['t'].storage) == 6
+    print("✅ Residencia con WAL")
+
+
+def test_stale_spills_removed_and_sessions_swept(tmp_path):
+    """Volcados de otro proceso: se borran al arrancar, no al construir; el barrido quita sesiones expiradas."""
+    stale = tmp_path / ('0' * 32 + '.akb')
+    stale.write_bytes(b'viejo')
+    (tmp_path / 'notas.txt').write_text('ajeno')
+    manager = KBResidencyManager(1, str(tmp_path))
+    assert stale.exists()
+    assert manager.remove_stale_spills() == 1
+    assert sorted(os.listdir(tmp_path)) == ['notas.txt']
+
+    # Por defecto: directorio privado (0700) que close() borra
+    private = KBResidencyManager(0)
+    _fill(private.get('u'), 4)
+    private.get('v')
+    assert os.stat(private.spill_dir).st_mode & 0o777 == 0o700
+    assert os.listdir(private.spill_dir)
+    with pytest.raises(RuntimeError):
+        private.remove_stale_spills()  # ya volcó: sus volcados no son huérfanos
+    private.close()
+    assert not os.path.exists(private.spill_dir)
+
+    import aurora_api
+    now = datetime.utcnow()
+    aurora_api.active_sessions.update({
+        'viejo': {'expires_at': (now - timedelta(minutes=1)).isoformat()},
+        'vigente': {'expires_at': (now + timedelta(hours=1)).isoformat()},
+    })
+    assert aurora_api.sweep_expired_sessions() == 1
+    assert 'vigente' in aurora_api.active_sessions and 'viejo' not in aurora_api.active_sessions
+    print("✅ Volcados huérfanos y sesiones expiradas")
+
+
+def test_pins_follow_workers_on_cancel(tmp_path):
+    """Petición cancelada: la KB sigue fijada hasta que acaba su worker, y una recarga cancelada no deja pin."""
+    import asyncio
+    import aurora_api
+    aurora_api.init_gateway()
+    manager = KBResidencyManager(10 ** 9, str(tmp_path))
+    previous, aurora_api.residency = aurora_api.residency, manager
+    release = threading.Event()
+
+    def slow_write(kb):
+        release.wait(5)
+        _fill(kb, 3)
+
+    async def cancelled_write():
+        async def request():
+            async with aurora_api.user_kb('w') as kb:
+                await aurora_api.execution.run("kb", slow_write, kb, on_done=aurora_api.kb_worker_done('w'))
+        task = asyncio.ensure_future(request())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        during = manager.evict('w')
+        release.set()
+        while manager.summary()['pinned']:
+            await asyncio.sleep(0.01)
+        return during
+
+    slow_load = threading.Event()
+    load = manager._load
+
+    def delayed_load(user_id):
+        slow_load.wait(5)
+        return load(user_id)
+
+    async def cancelled_reload():
+        async def request():
+            async with aurora_api.user_kb('w'):
+                pass
+        task = asyncio.ensure_future(request())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        slow_load.set()
+        while 'w' not in manager:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+    try:
+        assert asyncio.run(cancelled_write()) is False  # el worker aún escribía
+        assert manager.evict('w')
+        assert len(manager.get('w').universes['s'].storage) == 3
+        assert manager.evict('w')
+        manager._load = delayed_load
+        asyncio.run(cancelled_reload())
+        assert manager.summary()['pinned'] == 0 and manager.evict('w')
+    finally:
+        aurora_api.residency = previous
+    print("✅ Pins atados al worker, también al cancelar")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_lru_spill_and_reload, test_pins_idle_sweep_and_concurrent_reload,
+                 test_wal_residency, test_stale_spills_removed_and_sessions_swept,
+                 test_pins_follow_workers_on_cancel):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
@@ -314,5 +314,70 @@ def test_armonizador():
     return resultados
 
 
+def test_armonizar_lote_acotado():
+    """
+    Armonización con presupuesto: respeta el límite de operaciones,
+    corrige por severidad y retoma el backlog en la siguiente llamada
+    """
+    evolver = Evolver()
+    armonizador = crear_armonizador_desde_evolver(evolver)
+    
+    tensores = []
+    for valores in [(1, 2, 3), (6, 5, 4), (0, 0, 0), (7, 7, 7)]:
+        t = TensorFFE()
+        for i in range(3):
+            t.nivel_1[i] = VectorFFE(*valores)
+        t.reconstruir_jerarquia()
+        t.nivel_abstraccion = 3
+        tensores.append(t)
+    
+    # Sembrar incoherencias de severidad conocida
+    total = armonizador.encolar_incoherencias(
+        [
+            Incoherencia(
+                tipo=TipoIncoherencia.ARQUETIPO_DEBIL,
+                tensor_origen=tensores[0],
+                nivel_severidad=severidad,
+                descripcion=f"severidad {severidad}"
+            )
+            for severidad in (0.2, 0.9, 0.5)
+        ],
+        espacio_logico="acotado"
+    )
+    
+    reporte = armonizador.armonizar_lote_acotado(
+        espacio_logico="acotado",
+        max_operaciones=1
+    )
+    assert reporte["operaciones"] == 1
+    assert reporte["presupuesto_agotado"]
+    assert reporte["pendientes"] == total - 1
+    severidades = [b["severidad"] for b in reporte["backlog"]]
+    assert 0.9 not in severidades, "La más severa debe procesarse primero"
+    assert severidades == sorted(severidades, reverse=True)
+    
+    # Presupuesto de tiempo agotado: no se procesa nada
+    reporte_cero = armonizador.armonizar_lote_acotado(
+        espacio_logico="acotado",
+        presupuesto_ms=0
+    )
+    assert reporte_cero["operaciones"] == 0
+    assert reporte_cero["pendientes"] == total - 1
+    
+    # Sin límites: drena el resto del backlog
+    reporte_final = armonizador.armonizar_lote_acotado(espacio_logico="acotado")
+    assert reporte_final["completo"]
+    assert armonizador.pendientes_en("acotado") == 0
+    
+    # Lote nuevo: las incoherencias detectadas entran en la cola
+    reporte_lote = armonizador.armonizar_lote_acotado(
+        tensores,
+        espacio_logico="lote",
+        max_operaciones=0
+    )
+    assert reporte_lote["pendientes"] == reporte_lote["incoherencias_nuevas"]
+
+
 if __name__ == "__main__":
     resultados = test_armonizador()
+    test_armonizar_lote_acotado()
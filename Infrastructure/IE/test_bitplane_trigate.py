@@ -0,0 +1,90 @@
+"""
+Test del motor ternario por bitplanes
+
+Valida que TernaryBitplane/BitplaneTrigate reproducen posición a posición
+las operaciones escalares de TernaryLogic y las LUTs de Trigate sobre
+vectores largos con NULLs, y que interoperan con FractalTensor.nivel_3.
+"""
+
+import random
+
+from core import (
+    Trigate,
+    TernaryLogic,
+    TernaryBitplane,
+    BitplaneTrigate,
+    FractalTensor
+)
+
+
+def _random_vector(rng, n, null_rate=0.25):
+    return [None if rng.random() < null_rate else rng.randint(0, 1) for _ in range(n)]
+
+
+def test_roundtrip_and_nivel_3():
+    """Empaquetado/desempaquetado sin pérdida e interoperabilidad con nivel_3."""
+    rng = random.Random(3)
+    vec = _random_vector(rng, 301)
+    bp = TernaryBitplane.from_list(vec)
+    assert bp.to_list() == vec
+    assert bp.null_count() == vec.count(None)
+
+    tensor = FractalTensor(nivel_3=[[1, None, 0], [0, 1, 1], [None, None, 1]])
+    packed = TernaryBitplane.from_nivel_3(tensor.nivel_3)
+    assert packed.length == 9
+    assert packed.to_nivel_3() == tensor.nivel_3
+
+    print("✅ Roundtrip list/nivel_3")
+
+
+def test_logic_and_modes_match_scalar():
+    """XOR/XNOR y los cuatro modos de Trigate coinciden posición a posición."""
+    rng = random.Random(5)
+    trigate = Trigate()
+    bt = BitplaneTrigate()
+    n = 500
+    x, y, z = (_random_vector(rng, n) for _ in range(3))
+    X, Y, Z = (TernaryBitplane.from_list(v) for v in (x, y, z))
+
+    assert bt.ternary_xor(X, Y).to_list() == [TernaryLogic.ternary_xor(a, b) for a, b in zip(x, y)]
+    assert bt.ternary_xnor(X, Y).to_list() == [TernaryLogic.ternary_xnor(a, b) for a, b in zip(x, y)]
+
+    modes = {
+        'infer': Trigate._LUT_INFER,
+        'learn': Trigate._LUT_LEARN,
+        'deduce_a': Trigate._LUT_DEDUCE_A,
+        'deduce_b': Trigate._LUT_DEDUCE_B,
+    }
+    for name, lut in modes.items():
+        got = getattr(bt, name)(X, Y, Z).to_list()
+        assert got == [lut[(a, b, c)] for a, b, c in zip(x, y, z)], name
+
+    M, S = bt.synthesize(X, Y)
+    assert M.to_list() == trigate.synthesize(x, y)[0]
+    assert S.to_list() == trigate.synthesize(x, y)[1]
+
+    vectors = [_random_vector(rng, n, 0.05) for _ in range(6)]
+    expected, expected_history = trigate.recursive_synthesis(vectors)
+    result, history = bt.recursive_synthesis([TernaryBitplane.from_list(v) for v in vectors])
+    assert result.to_list() == expected
+    assert [h.to_list() for h in history] == expected_history
+
+    print("✅ Bitplanes == lógica escalar")
+
+
+def test_length_mismatch_raises():
+    """Longitudes distintas se rechazan como en Trigate."""
+    a = TernaryBitplane.from_list([1, 0, 1])
+    b = TernaryBitplane.from_list([1, 0])
+    try:
+        BitplaneTrigate.ternary_xor(a, b)
+    except ValueError:
+        print("✅ ValueError en longitudes distintas")
+        return
+    raise AssertionError("Debe rechazar longitudes distintas")
+
+
+if __name__ == '__main__':
+    test_roundtrip_and_nivel_3()
+    test_logic_and_modes_match_scalar()
+    test_length_mismatch_raises()
@@ -0,0 +1,69 @@
+"""
+Test de FractalTensor copy-on-write
+
+Valida que derive() comparte las filas sin copiarlas y aísla los cambios
+de nivel, que extend_fractal no modifica los arquetipos de la KB y que
+compute_full_fractal no altera sus entradas.
+"""
+
+import copy
+
+from core import Extender, FractalTensor, FractalKnowledgeBase, Transcender
+
+
+def test_derive_shares_rows_and_isolates_changes():
+    """derive() comparte filas, pero reemplazar la raíz no toca el original."""
+    original = FractalTensor(nivel_3=[[1, 0, 1], [0, 1, 0], [1, 1, 1]])
+    original.metadata['origen'] = 'kb'
+    summary = original.nivel_1
+
+    derived = original.derive(root=[0, 0, 1])
+    assert derived.nivel_3[1] is original.nivel_3[1]
+    assert derived.nivel_3[0] == [0, 0, 1]
+    assert original.nivel_3[0] == [1, 0, 1]
+    assert original.nivel_1 == summary
+    assert derived.nivel_1 != summary
+
+    derived.metadata['origen'] = 'derivado'
+    derived.nivel_3[2] = [0, 0, 0]
+    assert original.metadata['origen'] == 'kb'
+    assert original.nivel_3[2] == [1, 1, 1]
+    assert copy.copy(original).nivel_3 == original.nivel_3
+    print("✅ derive() copy-on-write")
+
+
+def test_extend_fractal_leaves_archetype_untouched():
+    """Las proyecciones preservan la raíz de la consulta sin mutar la KB."""
+    kb = FractalKnowledgeBase()
+    archetype = FractalTensor(nivel_3=[[1, 1, 0], [0, 1, 1]])
+    archetype.Ms = [1, 1, 0]
+    archetype.MetaM = [0, 0, 1]
+    kb.add_archetype('cow', 'arq', archetype, Ss=[0, 0, 0])
+
+    # Sin arquetipo por Ss ni coincidencia exacta de raíz -> relator
+    result = Extender(kb).extend_fractal([0, 1, 1], {'space_id': 'cow'})
+    tensor = result['reconstructed_tensor']
+    assert result['reconstruction_method'].startswith("contextualización")
+    assert tensor is not archetype
+    assert tensor.nivel_3[1] is archetype.nivel_3[1]
+    assert archetype.nivel_3[0] == [1, 1, 0]
+    print(f"✅ extend_fractal: {tensor.nivel_3[0]} sin modificar el arquetipo")
+
+
+def test_compute_full_fractal_does_not_mutate_inputs():
+    """Los tensores sin estructura se leen como neutros, no se reescriben."""
+    A = FractalTensor(nivel_3=[[1, 0, 1]])
+    B = FractalTensor(nivel_3=[[0, 1, 1]])
+    C = FractalTensor(nivel_3=[[1, 1, 0]])
+    C.nivel_3 = []
+
+    Transcender().compute_full_fractal(A, B, C)
+    assert C.nivel_3 == []
+    assert A.nivel_3 == [[1, 0, 1]]
+    print("✅ compute_full_fractal sin efectos sobre las entradas")
+
+
+if __name__ == "__main__":
+    test_derive_shares_rows_and_isolates_changes()
+    test_extend_fractal_leaves_archetype_untouched()
+    test_compute_full_fractal_does_not_mutate_inputs()
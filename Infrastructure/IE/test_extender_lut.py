@@ -0,0 +1,96 @@
+"""
+Test del memo LUT de Extender.extend_fractal
+
+Valida que las consultas repetidas se sirven desde el LUT con el mismo
+resultado, que un cambio en la KB invalida las entradas, que el LUT está
+acotado (LRU) y que los contadores no pierden cuentas con hilos.
+"""
+
+import threading
+
+from core import Extender, FractalTensor, FractalKnowledgeBase
+
+
+def _kb():
+    kb = FractalKnowledgeBase()
+    archetype = FractalTensor(nivel_3=[[1, 0, 1]])
+    archetype.Ms = [1, 0, 1]
+    archetype.MetaM = [0, 1, 0]
+    kb.add_archetype('lut', 'arq', archetype, Ss=[1, 0, 1])
+    return kb
+
+
+def test_repeated_query_served_from_lut():
+    """La segunda consulta idéntica no recorre los expertos."""
+    extender = Extender(_kb())
+    contexto = {'space_id': 'lut'}
+
+    first = extender.extend_fractal([1, 0, 1], contexto)
+    calls = extender.expert_stats['archetype']['calls']
+    second = extender.extend_fractal([1, 0, 1], contexto)
+
+    assert second['reconstruction_method'] == "reconstrucción por LUT"
+    assert extender.expert_stats['archetype']['calls'] == calls
+    assert second['reconstructed_tensor'].nivel_3 == first['reconstructed_tensor'].nivel_3
+    # El resultado devuelto es independiente de la entrada del LUT
+    second['reconstructed_tensor'].nivel_3[0] = [0, 0, 0]
+    third = extender.extend_fractal([1, 0, 1], contexto)
+    assert third['reconstructed_tensor'].nivel_3 == first['reconstructed_tensor'].nivel_3
+    print(f"✅ LUT: {extender.lut_stats}")
+
+
+def test_kb_change_invalidates_lut():
+    """Añadir un arquetipo cambia la generación y descarta el memo."""
+    kb = _kb()
+    extender = Extender(kb)
+    contexto = {'space_id': 'lut'}
+
+    extender.extend_fractal([0, 1, 1], contexto)
+    other = FractalTensor(nivel_3=[[0, 1, 1]])
+    other.Ms = [0, 1, 1]
+    other.MetaM = [1, 1, 0]
+    kb.add_archetype('lut', 'otro', other, Ss=[0, 1, 1])
+
+    result = extender.extend_fractal([0, 1, 1], contexto)
+    assert result['reconstruction_method'] != "reconstrucción por LUT"
+    assert extender.lut_stats['invalidated'] == 1
+    print("✅ Cambio de KB invalida el LUT")
+
+
+def test_lut_is_bounded():
+    """El LUT expulsa las entradas menos usadas al superar el límite."""
+    extender = Extender(_kb(), lut_max_entries=2)
+    for query in ([1, 0, 1], [1, 1, 1], [0, 0, 1]):
+        extender.extend_fractal(query, {'space_id': 'lut'})
+    assert len(extender._lut_tables) == 2
+    assert extender.lut_stats['evicted'] == 1
+    assert extender.lookup_lut('lut', [1, 0, 1]) is None
+    print("✅ LUT acotado")
+
+
+def test_counters_exact_under_threads():
+    """Cada fallo del LUT recorre el experto de arquetipos: las cuentas cuadran en paralelo."""
+    extender = Extender(_kb(), lut_max_entries=1)  # casi todo falla en el LUT
+    contexto = {'space_id': 'lut'}
+    queries = [[1, 0, 1], [0, 1, 1], [1, 1, 0], [0, 0, 1]]
+
+    def worker():
+        for i in range(200):
+            extender.extend_fractal(queries[i % len(queries)], contexto)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = extender.expert_stats['archetype']
+    assert stats['calls'] == extender.lut_stats['misses']
+    assert extender.lut_stats['hits'] + extender.lut_stats['misses'] == 8 * 200
+    print(f"✅ Contadores con hilos: {stats['calls']} llamadas al experto")
+
+
+if __name__ == "__main__":
+    test_repeated_query_served_from_lut()
+    test_kb_change_invalidates_lut()
+    test_lut_is_bounded()
+    test_counters_exact_under_threads()
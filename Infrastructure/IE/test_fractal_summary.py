@@ -0,0 +1,106 @@
+"""
+Test del resumen determinista nivel_1 y la jerarquía perezosa de FractalTensor
+
+Valida que nivel_1[2] no depende de PYTHONHASHSEED, que nivel_9/nivel_1 se
+construyen al leerse y se invalidan al reasignar nivel_3, y que la
+persistencia migra KBs con resúmenes antiguos.
+"""
+
+import json
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+from core import FractalTensor, FractalKnowledgeBase
+from aurora_engine import KnowledgeBasePersistence
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_summary_is_seed_independent():
+    """El mismo tensor tiene el mismo nivel_1 con distintos PYTHONHASHSEED."""
+    script = (
+        "from core import FractalTensor;"
+        "print(FractalTensor(nivel_3=[[1, None, 0], [0, 1, 1]]).nivel_1)"
+    )
+    outputs = set()
+    for seed in ('1', '2', '3'):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        out = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=HERE, env=env, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        outputs.add(out)
+    assert len(outputs) == 1, outputs
+
+    # Código base 3 de [1, None, 0] = 1*9 + 2*3 + 0 = 15 -> 15 % 8 = 7
+    assert FractalTensor.root_summary([1, None, 0]) == 7
+    print("✅ nivel_1 determinista entre procesos")
+
+
+def test_lazy_hierarchy():
+    """Los niveles derivados se construyen al leerse y se invalidan con nivel_3."""
+    tensor = FractalTensor(nivel_3=[[1, 0, 1]])
+    assert tensor._nivel_1 is None and tensor._nivel_9 is None
+    assert tensor.nivel_1 == [2, 1, FractalTensor.root_summary([1, 0, 1])]
+
+    tensor.nivel_3 = [[1, 1, 1], [0, 0, 0], [1, 0, 0]]
+    assert tensor._nivel_1 is None
+    assert tensor.nivel_1[0:2] == [3, 3]
+    assert tensor.nivel_9 == [tensor.nivel_3]
+
+    # Asignación explícita (p.ej. desde persistencia) se respeta
+    tensor.nivel_1 = [5, 1, 0]
+    assert tensor.nivel_1 == [5, 1, 0]
+    tensor._generate_hierarchy()
+    assert tensor.nivel_1[0] == 3
+    print("✅ Jerarquía perezosa")
+
+
+def test_persistence_migration(tmp_path):
+    """KBs con resumen antiguo se regeneran; pickles antiguos se migran."""
+    path = Path(tmp_path) / "kb_summary_migration.json"
+
+    kb = FractalKnowledgeBase()
+    arch = FractalTensor(nivel_3=[[0, 1, 1]])
+    arch.MetaM = [1, 1, 0]
+    kb.add_archetype('space', 'arch', arch, [0, 1, 1])
+    KnowledgeBasePersistence.save_kb(kb, str(path))
+
+    # Simular archivo de la versión 1: sin summary_version y nivel_1 arbitrario
+    data = json.loads(path.read_text())
+    for tensor_data in data['space']['storage'].values():
+        tensor_data.pop('summary_version')
+        tensor_data['nivel_1'] = [2, 1, 6]
+    path.write_text(json.dumps(data))
+
+    migrated = KnowledgeBasePersistence.migrate_kb(str(path))
+    loaded = migrated.get_archetype_by_ms('space', [0, 1, 1])
+    assert loaded.nivel_1 == [2, 1, FractalTensor.root_summary([0, 1, 1])]
+    saved = json.loads(path.read_text())
+    assert all(
+        t['summary_version'] == FractalTensor.SUMMARY_VERSION
+        for t in saved['space']['storage'].values()
+    )
+
+    # Pickle con atributos planos (formato anterior)
+    legacy = FractalTensor.__new__(FractalTensor)
+    legacy.__dict__.update({
+        'nivel_3': [[1, 0, 0]], 'nivel_9': [[[1, 0, 0]]], 'nivel_1': [1, 1, 4],
+        'metadata': {}, 'Ms': [1, 0, 0], 'Ss': None, 'MetaM': None
+    })
+    restored = pickle.loads(pickle.dumps(legacy))
+    assert restored.nivel_3 == [[1, 0, 0]]
+    assert restored.nivel_1 == [1, 1, FractalTensor.root_summary([1, 0, 0])]
+    print("✅ Migración de KBs persistidas")
+
+
+if __name__ == '__main__':
+    test_summary_is_seed_independent()
+    test_lazy_hierarchy()
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_persistence_migration(Path(tmp))
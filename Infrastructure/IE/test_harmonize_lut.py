@@ -0,0 +1,97 @@
+"""
+Test de la LUT exhaustiva de core.Armonizador.harmonize
+
+Valida que la tabla precomputada (vector, raíz del arquetipo, resumen nivel_1)
+reproduce exactamente la secuencia MicroShift → Regrewire → Metatune, y que
+los casos dependientes de la KB siguen resolviéndose con Regrewire.
+Construir una tabla solo silencia el log del hilo que la construye.
+"""
+
+import itertools
+import logging
+import threading
+
+from core import Armonizador, FractalKnowledgeBase, FractalTensor
+
+logging.getLogger('aurora.armonizador').setLevel(logging.ERROR)
+
+STATES = (0, 1, None)
+
+
+def test_lut_matches_step_pipeline():
+    """Todas las combinaciones tabuladas coinciden con el pipeline de pasos."""
+    for kb in (None, FractalKnowledgeBase()):
+        armonizador = Armonizador(knowledge_base=kb)
+        for vec in itertools.product(STATES, repeat=3):
+            for root in itertools.product(STATES, repeat=3):
+                for archetype in (list(root), FractalTensor(nivel_3=[list(root)])):
+                    fast = armonizador.harmonize(list(vec), archetype=archetype)
+                    slow = armonizador._harmonize_steps(list(vec), archetype)
+                    assert fast == slow, f"{vec} / {root}: {fast} != {slow}"
+
+    print("✅ LUT == MicroShift → Regrewire → Metatune")
+
+
+def test_lut_respects_thresholds_and_kb():
+    """Cada terna tau tiene su tabla; Regrewire sigue consultando la KB."""
+    strict = Armonizador(tau_1=0, tau_2=0, tau_3=0)
+    lax = Armonizador()
+    strict.harmonize([1, None, 0])
+    lax.harmonize([1, None, 0])
+    assert (0, 0, 0) in Armonizador._HARMONIZE_LUTS
+    assert (1, 2, 3) in Armonizador._HARMONIZE_LUTS
+
+    # Con KB, los casos que llegan a Regrewire usan el arquetipo almacenado
+    kb = FractalKnowledgeBase()
+    arch = FractalTensor(nivel_3=[[1, 1, 0]])
+    arch.Ms = [1, 1, 0]
+    arch.MetaM = [0, 0, 1]
+    kb.add_archetype('default', 'arch_110', arch, [1, 1, 0])
+
+    with_kb = Armonizador(knowledge_base=kb, tau_1=0, tau_2=0, tau_3=0)
+    archetype = FractalTensor(nivel_3=[[0, 0, 0]])
+    archetype.nivel_1 = [5, 1, 0]
+    result = with_kb.harmonize([1, 1, None], archetype=archetype)
+    assert result == with_kb._harmonize_steps([1, 1, None], archetype)
+    assert 'regrewire' in result['adjustments']
+
+    # Arquetipos fuera de la tabla (longitud != 3) usan el camino completo
+    odd = with_kb.harmonize([1, 0], archetype=[1, 0, 1, 1])
+    assert len(odd['output']) == 3
+
+    print("✅ Umbrales y fallback a KB correctos")
+
+
+def test_lut_build_only_silences_its_thread():
+    """Durante la construcción, los errores de otros hilos se siguen registrando."""
+    records = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    log = logging.getLogger('aurora.armonizador')
+    handler, level = _Capture(), log.level
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    try:
+        builder = threading.Thread(target=Armonizador._build_harmonize_lut, args=((0.5, 0.5, 0.5),))
+        builder.start()
+        logged = 0
+        while builder.is_alive() or not logged:
+            log.error("fallo de suscriptor", extra={'ambiguity': 0})
+            logged += 1
+        builder.join()
+    finally:
+        log.removeHandler(handler)
+        log.setLevel(level)
+    mine = [r for r in records if r.thread == threading.get_ident()]
+    assert len(mine) == logged
+    assert all(r.levelno >= logging.ERROR for r in records)  # nada de las trazas de la construcción
+    print(f"✅ Construcción silenciosa solo en su hilo ({logged} errores registrados)")
+
+
+if __name__ == '__main__':
+    test_lut_matches_step_pipeline()
+    test_lut_respects_thresholds_and_kb()
+    test_lut_build_only_silences_its_thread()
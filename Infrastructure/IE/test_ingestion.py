@@ -0,0 +1,152 @@
+"""
+Test del pipeline de ingesta asíncrona (IngestionPipeline)
+
+Valida que la ingesta por micro-lotes deja la KB igual que learn() en
+serie, que la cola llena ejerce contrapresión sobre el productor, que
+los errores de síntesis y de coherencia llegan a su Future y que ninguna
+familia aceptada queda sin resolver al cerrar.
+"""
+
+import threading
+
+import pytest
+
+from core import FractalKnowledgeBase, FractalTensor
+from aurora_engine import Aurora, AuroraCognitiveCycle, BackpressureError, IngestionPipeline
+
+
+def _families():
+    families = []
+    for i in range(40):
+        roots = [[(i >> b) & 1, (i + b) & 1, (i * b) & 1] for b in range(3)]
+        families.append(([FractalTensor(nivel_3=[r]) for r in roots], f's{i % 3}'))
+    return families
+
+
+def _state(kb):
+    return {s: [(k, t.Ms, t.MetaM) for k, t in u.storage.items()] for s, u in kb.universes.items()}
+
+
+def test_pipeline_matches_sequential_learn():
+    """Micro-lotes por espacio: mismo estado que learn() en orden de llegada."""
+    reference = AuroraCognitiveCycle(enable_metrics=False)
+    for tensors, space in _families():
+        reference.learn(tensors, space)
+
+    cycle = AuroraCognitiveCycle()
+    pipeline = IngestionPipeline(cycle, batch_window=0.01, workers=2)
+    futures = [pipeline.submit(tensors, space) for tensors, space in _families()]
+    assert pipeline.flush(timeout=10)
+    assert all(f.result()['status'] == 'success' for f in futures)
+    assert _state(cycle.kb) == _state(reference.kb)
+    assert pipeline.stats['completed'] == 40 and pipeline.stats['batches'] < 40
+    assert cycle.metrics.get_summary()['operations_by_type'] == {'learn': 40}
+    pipeline.close()
+    print(f"✅ Ingesta por lotes equivalente: {pipeline.stats}")
+
+
+def test_backpressure():
+    """Con la cola llena submit bloquea o lanza BackpressureError."""
+    cycle = AuroraCognitiveCycle(enable_metrics=False)
+    gate = threading.Event()
+    synthesize = cycle._synthesize
+
+    def slow_synthesize(tensors, space_id):
+        gate.wait()
+        return synthesize(tensors, space_id)
+
+    cycle._synthesize = slow_synthesize
+    pipeline = IngestionPipeline(cycle, max_pending=2, workers=1)
+    family = [FractalTensor(nivel_3=[[1, 0, 1]]), FractalTensor(nivel_3=[[0, 1, 1]])]
+    futures = [pipeline.submit(family, 'a'), pipeline.submit(family, 'b')]
+    assert pipeline.pressure == 1.0
+    with pytest.raises(BackpressureError):
+        pipeline.submit(family, 'c', block=False)
+    with pytest.raises(BackpressureError):
+        pipeline.submit(family, 'c', timeout=0.05)
+
+    gate.set()
+    futures.append(pipeline.submit(family, 'c', timeout=5))
+    pipeline.close()
+    assert [f.result()['space_id'] for f in futures] == ['a', 'b', 'c']
+    assert pipeline.stats['rejected'] == 2 and pipeline.pending == 0
+    print("✅ Contrapresión sobre el productor")
+
+
+def test_errors_reach_futures():
+    """Excepción de síntesis → excepción del Future; conflicto de coherencia → status error."""
+    cycle = AuroraCognitiveCycle(kb=FractalKnowledgeBase(), enable_metrics=False)
+
+    def synthesize(archetype, space_id):
+        if archetype is None:
+            raise ValueError("familia vacía")
+        return archetype
+
+    cycle._synthesize = synthesize
+    pipeline = IngestionPipeline(cycle, batch_window=0.05)
+    ok = pipeline.submit(FractalTensor(nivel_3=[[1, 0, 1]], Ms=[1, 0, 1], MetaM=[0, 0, 1]), 'x')
+    conflict = pipeline.submit(FractalTensor(nivel_3=[[1, 0, 1]], Ms=[1, 0, 1], MetaM=[1, 1, 1]), 'x')
+    broken = pipeline.submit(None, 'x')
+    pipeline.close()
+
+    assert ok.result()['status'] == 'success'
+    assert conflict.result()['status'] == 'error' and 'Coherence' in conflict.result()['error']
+    with pytest.raises(ValueError):
+        broken.result()
+    assert pipeline.stats['failed'] == 2
+    print("✅ Errores entregados a cada Future")
+
+
+def test_close_races_and_abort():
+    """submit() concurrente con close(): todo Future aceptado se resuelve."""
+    cycle = AuroraCognitiveCycle(enable_metrics=False)
+    pipeline = IngestionPipeline(cycle, max_pending=4096, workers=2)
+    family = [FractalTensor(nivel_3=[[1, 0, 1]]), FractalTensor(nivel_3=[[0, 1, 1]])]
+    accepted, refused = [], []
+
+    def producer(n):
+        for i in range(300):
+            try:
+                accepted.append(pipeline.submit(family, f'p{n}_{i % 5}'))
+            except RuntimeError:
+                refused.append(i)
+
+    producers = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+    for thread in producers:
+        thread.start()
+    pipeline.close()
+    for thread in producers:
+        thread.join()
+    assert all(f.done() for f in accepted) and pipeline.pending == 0
+    assert len(accepted) + len(refused) == 1200
+
+    # close(wait=False): lo que no se llegó a insertar falla en su Future
+    gate = threading.Event()
+    slow = AuroraCognitiveCycle(enable_metrics=False)
+    synthesize = slow._synthesize
+    slow._synthesize = lambda tensors, space_id: (gate.wait(), synthesize(tensors, space_id))[1]
+    pipeline = IngestionPipeline(slow, batch_window=0, workers=1)
+    futures = [pipeline.submit(family, 'a') for _ in range(5)]
+    pipeline.close(wait=False)
+    gate.set()
+    errors = [f.exception(timeout=5) for f in futures]
+    assert any(isinstance(e, RuntimeError) for e in errors) and pipeline.flush(timeout=5)
+    print(f"✅ Cierre concurrente: {len(accepted)} aceptadas, {len(refused)} rechazadas")
+
+
+def test_aurora_learn_async():
+    """Aurora.learn_async encola y close() drena antes de cerrar."""
+    aurora = Aurora()
+    future = aurora.learn_async([[1, 0, 1], [0, 1, 1]], 'async')
+    aurora.close()
+    assert future.done() and future.result()['status'] == 'success'
+    assert len(aurora.kb.snapshot('async').storage) == 1
+    print("✅ Aurora.learn_async")
+
+
+if __name__ == "__main__":
+    test_pipeline_matches_sequential_learn()
+    test_backpressure()
+    test_errors_reach_futures()
+    test_close_races_and_abort()
+    test_aurora_learn_async()
@@ -0,0 +1,99 @@
+"""
+Test del formato binario columnar de la KB (kb_binary)
+
+Valida el ida y vuelta completo (orden de storage, vectores con NULLs,
+índices de nombres y Ms, metadata, generaciones), la carga parcial y la
+apertura mapeada en memoria que solo carga los universos que se tocan.
+"""
+
+import pickle
+
+import pytest
+
+from core import FractalKnowledgeBase, FractalTensor
+from aurora_engine import KnowledgeBasePersistence
+
+
+def _kb():
+    kb = FractalKnowledgeBase()
+    for space, offset in (('alpha', 0), ('beta', 1), ('gamma', 0)):
+        for i in range(6):
+            root = [(i + offset) & 1, (i >> 1) & 1, None if i == 3 else (i >> 2) & 1]
+            tensor = FractalTensor(nivel_3=[root, [1, 0, 1]], Ms=[i & 1, (i >> 1) & 1, (i >> 2) & 1],
+                                   Ss=None if i == 2 else [1, None, 0], MetaM=[0, i & 1, 1])
+            if i == 1:
+                tensor.metadata = {'origen': space, 'peso': 0.5}
+            kb.add_archetype(space, f'{space}_{i}', tensor, [i & 1, None, (i >> 1) & 1])
+    return kb
+
+
+def _snapshot(universe):
+    return {
+        'storage': [(k, t.nivel_3, t.Ms, t.Ss, t.MetaM, t.metadata) for k, t in universe.storage.items()],
+        'names': {n: (t.nivel_3, t.Ms) for n, t in universe.name_index.items()},
+        'ms': {k: (t.nivel_3, t.MetaM) for k, t in universe.ms_index.items()},
+    }
+
+
+def test_binary_roundtrip(tmp_path):
+    """save_kb/load_kb en binario reproducen universos e índices."""
+    kb = _kb()
+    path = str(tmp_path / 'kb.akb')
+    KnowledgeBasePersistence.save_kb(kb, path, format='binary')
+    loaded = KnowledgeBasePersistence.load_kb(path, format='binary')
+
+    assert list(loaded.universes) == list(kb.universes)
+    for space_id, universe in kb.universes.items():
+        assert _snapshot(loaded.universes[space_id]) == _snapshot(universe)
+        for query in ([1, None, None], [None, 0, None], [None, None, None]):
+            expected = universe.find_archetype_by_pattern(query)
+            found = loaded.universes[space_id].find_archetype_by_pattern(query)
+            assert (found and found.nivel_3) == (expected and expected.nivel_3)
+        assert loaded.universe_generation(space_id) == universe.generation == 6
+    assert loaded.generation == kb.generation == 18
+    print("✅ Ida y vuelta binaria")
+
+
+def test_partial_and_mapped_loading(tmp_path):
+    """open_kb solo carga los universos tocados; load_kb admite subconjuntos."""
+    kb = _kb()
+    path = str(tmp_path / 'kb.akb')
+    KnowledgeBasePersistence.save_kb(kb, path, format='binary')
+
+    partial = KnowledgeBasePersistence.load_kb(path, format='binary', spaces=['beta'])
+    assert list(partial.universes) == ['beta']
+
+    mapped = KnowledgeBasePersistence.open_kb(path)
+    assert len(mapped.universes) == 3 and 'gamma' in mapped.universes
+    assert mapped.universes.pending == ['alpha', 'beta', 'gamma']
+
+    archetype = mapped.get_archetype('beta', 'beta_1')
+    assert archetype.metadata == {'origen': 'beta', 'peso': 0.5}
+    assert mapped.universes.pending == ['alpha', 'gamma']
+
+    # Las escrituras sobre un universo cargado siguen notificando a la KB
+    new = FractalTensor(nivel_3=[[0, 0, 0]], Ms=[0, 0, 0], MetaM=[0, 0, 1])
+    mapped.add_archetype('beta', 'nuevo', new, [0, 0, 0])
+    assert mapped.generation == 19 and mapped.universe_generation('beta') == 7
+
+    restored = pickle.loads(pickle.dumps(mapped))
+    assert type(restored.universes) is dict and len(restored.universes) == 3
+    print("✅ Carga parcial y mapeada")
+
+
+def test_non_ternary_values_rejected(tmp_path):
+    """El formato binario solo admite valores 0, 1 y NULL."""
+    kb = FractalKnowledgeBase()
+    kb.add_archetype('x', 'raro', FractalTensor(nivel_3=[[5, 0, 1]], MetaM=[0, 0, 0]), [1, 1, 1])
+    with pytest.raises(ValueError):
+        KnowledgeBasePersistence.save_kb(kb, str(tmp_path / 'kb.akb'), format='binary')
+    print("✅ Valores no ternarios rechazados")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_binary_roundtrip, test_partial_and_mapped_loading, test_non_ternary_values_rejected):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
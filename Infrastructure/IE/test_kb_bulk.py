@@ -0,0 +1,98 @@
+"""
+Test de ingesta masiva de arquetipos (add_archetypes_bulk)
+
+Valida que la ingesta en bloque deja la KB en el mismo estado que
+add_archetype fila a fila, que los conflictos de coherencia se reportan
+juntos y que load_kb la usa.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from core import CoherenceError, FractalKnowledgeBase, FractalTensor
+from aurora_engine import KnowledgeBasePersistence
+
+
+def _rows(seed, count):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        ms = [rng.choice([0, 1]) for _ in range(3)]
+        # MetaM determinado por Ms: filas coherentes entre sí
+        metam = [ms[0] ^ ms[1], ms[1] ^ ms[2], ms[2]]
+        ss = [rng.choice([0, 1, None]) for _ in range(3)]
+        rows.append((ms, metam, ss, f'arq_{i % 7}' if i % 3 else None))
+    return rows
+
+
+def _tensor(ms, metam):
+    return FractalTensor(nivel_3=[list(ms), [1, 0, 1]], Ms=list(ms), MetaM=list(metam))
+
+
+def test_bulk_matches_sequential_adds():
+    """Mismo storage, índices y consultas por patrón que la ruta fila a fila."""
+    rows = _rows(37, 60)
+    sequential, bulk = FractalKnowledgeBase(), FractalKnowledgeBase()
+
+    tensors = [_tensor(ms, metam) for ms, metam, _, _ in rows]
+    for tensor, (_, _, ss, name) in zip(tensors, rows):
+        sequential.add_archetype('s', name, tensor, ss)
+    report = bulk.add_archetypes_bulk(
+        's', tensors, Ss=[r[2] for r in rows], names=[r[3] for r in rows]
+    )
+
+    seq_space, bulk_space = sequential._get_space('s'), bulk._get_space('s')
+    assert list(bulk_space.storage.items()) == list(seq_space.storage.items())
+    assert bulk_space.ms_index == seq_space.ms_index
+    assert bulk_space.name_index == seq_space.name_index
+    for query in itertools.product([0, 1, None], repeat=3):
+        assert bulk_space.find_archetype_by_pattern(query) is seq_space.find_archetype_by_pattern(query)
+    assert report['added'] == len(seq_space.storage)
+    assert report['rows'] == len(rows) and not report['conflicts']
+    print(f"✅ Bulk equivalente: {report['added']} claves, {report['replaced']} reemplazos")
+
+
+def test_conflicts_reported_together():
+    """strict=True no escribe nada; strict=False omite las filas en conflicto."""
+    kb = FractalKnowledgeBase()
+    kb.add_archetype('c', 'base', _tensor([1, 0, 1], [1, 1, 1]), [1, 0, 1])
+
+    Ms = [[1, 0, 1], [0, 1, 1], [0, 1, 1], [1, 1, 1]]
+    MetaM = [[0, 0, 0], [1, 0, 1], [0, 0, 0], [0, 0, 1]]
+
+    with pytest.raises(CoherenceError) as excinfo:
+        kb.add_archetypes_bulk('c', Ms=Ms, MetaM=MetaM)
+    assert "2 rows" in str(excinfo.value)
+    assert len(kb._get_space('c').storage) == 1
+
+    report = kb.add_archetypes_bulk('c', Ms=Ms, MetaM=MetaM, strict=False)
+    assert [c['row'] for c in report['conflicts']] == [0, 2]
+    assert report['rows'] == 2
+    assert kb.get_archetype_by_ms('c', [0, 1, 1]).MetaM == [1, 0, 1]
+    print("✅ Conflictos reportados en bloque")
+
+
+def test_load_kb_uses_bulk(tmp_path):
+    """load_kb reconstruye la KB y emite un único evento bulk por universo."""
+    kb = FractalKnowledgeBase()
+    for ms, metam, _, name in _rows(7, 20):
+        kb.add_archetype('load', name or 'anon', _tensor(ms, metam), ms)
+    path = tmp_path / 'kb.json'
+    KnowledgeBasePersistence.save_kb(kb, str(path))
+
+    loaded = KnowledgeBasePersistence.load_kb(str(path))
+    assert len(loaded._get_space('load').storage) == len(kb._get_space('load').storage)
+    assert loaded.universe_generation('load') == 1
+    print("✅ load_kb con ingesta en bloque")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_bulk_matches_sequential_adds()
+    test_conflicts_reported_together()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_load_kb_uses_bulk(Path(tmp))
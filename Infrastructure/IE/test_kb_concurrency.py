@@ -0,0 +1,165 @@
+"""
+Test de acceso concurrente a la KB
+
+Valida que las lecturas nunca crean universos, que los snapshots son
+inmutables (copy-on-write) mientras se sigue escribiendo, que lectores y
+escritores en hilos distintos no corrompen los índices ni el WAL, y que
+guardar la KB mientras otros hilos escriben es seguro.
+"""
+
+import itertools
+import threading
+
+import pytest
+
+from core import Extender, FractalKnowledgeBase, FractalTensor, RecursiveDeductionNetwork
+from kb_wal import KBWriteAheadLog
+
+
+def _archetype(root):
+    return FractalTensor(nivel_3=[list(root), [1, 0, 1]], Ms=list(root), MetaM=[0, 0, 1])
+
+
+def _check_consistent(universe):
+    """Los índices de un snapshot describen exactamente su storage."""
+    assert list(universe._storage_order) == list(universe.storage)
+    first = next(iter(universe.storage.values()), None)
+    assert universe.find_archetype_by_pattern([None, None, None]) is first
+    for key, archetype in universe.storage.items():
+        assert key in universe.wildcard_index[tuple(archetype.nivel_3[0])]
+
+
+def test_reads_never_create_spaces():
+    """get_archetype, Extender y la red recursiva no crean universos al leer."""
+    kb = FractalKnowledgeBase()
+    assert kb.get_archetype('nada', 'x') is None
+    assert kb.get_archetype_by_ms('nada', [1, 0, 1]) is None
+    assert kb.get_space('nada') is None
+    Extender(kb).extend_fractal([1, 0, 1], {'space_id': 'nada'})
+    RecursiveDeductionNetwork(kb).backward_deduce(FractalTensor(nivel_3=[[1, None, 0]]), 'nada')
+    assert kb.snapshot('nada').storage == {}
+    assert 'nada' not in kb.universes
+    print("✅ Lecturas sin efectos sobre la KB")
+
+
+def test_snapshot_isolation():
+    """Un snapshot no ve escrituras posteriores y se reutiliza si no las hay."""
+    kb = FractalKnowledgeBase()
+    kb.add_archetype('s', 'a', _archetype([1, 0, 1]), [1, 0, 1])
+    snapshot = kb.snapshot('s')
+    assert kb.snapshot('s') is snapshot
+
+    kb.add_archetype('s', 'b', _archetype([1, 1, 0]), [1, 0, 1])  # replace
+    kb.add_archetype('s', 'c', _archetype([0, 1, 1]), [0, 1, 1])
+    assert list(snapshot.storage) == [(1, 0, 1)]
+    assert snapshot.find_archetype_by_pattern([1, 1, None]) is None
+    assert snapshot.find_archetype_by_name('c') is None
+
+    current = kb.snapshot('s')
+    assert current is not snapshot and len(current.storage) == 2
+    assert current.find_archetype_by_pattern([1, 1, None]).nivel_3[0] == [1, 1, 0]
+    _check_consistent(snapshot)
+    _check_consistent(current)
+
+    with pytest.raises(RuntimeError):
+        snapshot.add_archetype(_archetype([0, 0, 0]), [0, 0, 0])
+    print("✅ Snapshots inmutables")
+
+
+def test_concurrent_readers_and_writers(tmp_path):
+    """Escritores en varios universos, lectores de snapshots y checkpoints a la vez."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='none', compact_every=50)
+    kb = wal.kb
+    roots = list(itertools.product([0, 1], repeat=3))
+    errors = []
+    done = threading.Event()
+
+    def writer(space):
+        try:
+            for i in range(120):
+                root = roots[i % len(roots)]
+                kb.add_archetype(space, f'{space}_{i}', _archetype(root), [i % 5, i % 7, i % 3])
+        except Exception as e:  # pragma: no cover - se reporta abajo
+            errors.append(e)
+
+    def reader():
+        try:
+            while not done.is_set():
+                for space in ('u0', 'u1', 'compartido'):
+                    universe = kb.snapshot(space)
+                    _check_consistent(universe)
+                    universe.best_positional_match([1, 0, 1])
+        except Exception as e:  # pragma: no cover - se reporta abajo
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(space,)) for space in ('u0', 'u1', 'compartido', 'compartido')]
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors, errors
+    assert wal.stats['checkpoints'] >= 1
+    assert kb.universe_generation('compartido') == 240
+    for space in ('u0', 'u1', 'compartido'):
+        _check_consistent(kb.snapshot(space))
+
+    recovered = KBWriteAheadLog.open(tmp_path, sync='none').kb
+    for space, universe in kb.universes.items():
+        assert list(recovered.universes[space].storage) == list(universe.storage)
+    print(f"✅ Concurrencia: {wal.stats['records']} escrituras, {wal.stats['checkpoints']} checkpoints")
+
+
+def test_save_during_writes(tmp_path):
+    """save_kb (json y pickle) lee snapshots: nunca ve diccionarios cambiando."""
+    from aurora_engine import KnowledgeBasePersistence
+
+    kb = FractalKnowledgeBase()
+    roots = list(itertools.product([0, 1], repeat=3))
+    errors = []
+    done = threading.Event()
+
+    def writer():
+        try:
+            for i in range(3000):
+                if done.is_set():
+                    break
+                kb.add_archetype(f'e{i % 40}', None, _archetype(roots[i % 8]), [i, i % 7, 1])
+        except Exception as e:  # pragma: no cover - se reporta abajo
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    saved = 0
+    try:
+        while thread.is_alive() and saved < 40:
+            for fmt in ('json', 'pickle'):
+                path = tmp_path / f'kb.{fmt}'
+                KnowledgeBasePersistence.save_kb(kb, str(path), format=fmt)
+                loaded = KnowledgeBasePersistence.load_kb(str(path), format=fmt)
+                for space in loaded.universes:
+                    _check_consistent(loaded.snapshot(space))
+                saved += 1
+    finally:
+        done.set()
+        thread.join()
+    assert not errors, errors
+    # La KB cargada de pickle sigue admitiendo escrituras
+    loaded.add_archetype('nuevo', 'x', _archetype((1, 1, 1)), [1, 1, 1])
+    print(f"✅ {saved} guardados concurrentes con escrituras")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_reads_never_create_spaces()
+    test_snapshot_isolation()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_concurrent_readers_and_writers(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_save_during_writes(Path(tmp))
@@ -0,0 +1,82 @@
+"""
+Test de generaciones y notificaciones de cambio de la KB
+
+Valida que los contadores por universo y global son monótonos, que los
+suscriptores reciben eventos add/replace filtrados por espacio y que los
+pickles conservan las generaciones sin arrastrar suscriptores.
+"""
+
+import pickle
+
+from core import FractalTensor, FractalKnowledgeBase, KBChangeEvent
+
+
+def _archetype(root, metam=(0, 0, 0)):
+    tensor = FractalTensor(nivel_3=[list(root)])
+    tensor.Ms = list(root)
+    tensor.MetaM = list(metam)
+    return tensor
+
+
+def test_generation_counters():
+    """Cada escritura incrementa su universo y la generación global."""
+    kb = FractalKnowledgeBase()
+    assert kb.generation == 0
+    assert kb.universe_generation('a') == 0
+    assert 'a' not in kb.universes  # leer la generación no crea espacios
+
+    kb.add_archetype('a', 'x', _archetype([1, 0, 1]), Ss=[1, 0, 1])
+    kb.add_archetype('b', 'y', _archetype([0, 1, 1]), Ss=[0, 1, 1])
+    # Escritura directa sobre el universo: también cuenta globalmente
+    kb._get_space('a').add_archetype(_archetype([1, 1, 1]), [1, 1, 1])
+
+    assert kb.universe_generation('a') == 2
+    assert kb.universe_generation('b') == 1
+    assert kb.generation == 3
+    print("✅ Generaciones por universo y global")
+
+
+def test_subscribers_receive_events():
+    """add/replace llegan a los suscriptores del espacio o globales."""
+    kb = FractalKnowledgeBase()
+    all_events, space_events = [], []
+    token = kb.subscribe(all_events.append)
+    kb.subscribe(space_events.append, space_id='b')
+    kb.subscribe(lambda event: 1 / 0)  # un suscriptor roto no bloquea la KB
+
+    kb.add_archetype('a', 'x', _archetype([1, 0, 1]), Ss=[1, 0, 1])
+    kb.add_archetype('b', 'y', _archetype([0, 1, 1]), Ss=[0, 1, 1])
+    kb.add_archetype('a', 'z', _archetype([1, 1, 0]), Ss=[1, 0, 1])
+
+    assert [e.type for e in all_events] == ['add', 'add', 'replace']
+    assert isinstance(all_events[-1], KBChangeEvent)
+    assert all_events[-1].space_id == 'a' and all_events[-1].Ss == (1, 0, 1)
+    assert all_events[-1].generation == 2 and all_events[-1].kb_generation == 3
+    assert [e.space_id for e in space_events] == ['b']
+
+    assert kb.unsubscribe(token)
+    assert not kb.unsubscribe(token)
+    kb.add_archetype('a', 'w', _archetype([0, 0, 1]), Ss=[0, 0, 1])
+    assert len(all_events) == 3
+    print("✅ Suscripciones add/replace")
+
+
+def test_pickle_keeps_generations():
+    """El pickle conserva generaciones, reenlaza universos y omite suscriptores."""
+    kb = FractalKnowledgeBase()
+    kb.subscribe(lambda event: None)
+    kb.add_archetype('a', 'x', _archetype([1, 0, 1]), Ss=[1, 0, 1])
+
+    restored = pickle.loads(pickle.dumps(kb))
+    assert restored.generation == 1
+    restored.add_archetype('a', 'y', _archetype([0, 1, 0]), Ss=[0, 1, 0])
+    assert restored.generation == 2
+    assert restored.universe_generation('a') == 2
+    assert restored._get_space('a').find_archetype_by_pattern([0, None, None]) is not None
+    print("✅ Pickle con generaciones")
+
+
+if __name__ == "__main__":
+    test_generation_counters()
+    test_subscribers_receive_events()
+    test_pickle_keeps_generations()
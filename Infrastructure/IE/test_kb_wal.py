@@ -0,0 +1,203 @@
+"""
+Test del write-ahead log de la KB (kb_wal)
+
+Valida que las escrituras se registran y se recuperan tras un "crash"
+(sin close), que una cola interrumpida se descarta, que la compactación
+deja un snapshot más la cola, que el group commit agrupa los fsync y que
+un registro que no se puede escribir rechaza la escritura. Las
+generaciones (por universo y global) sobreviven a la reapertura.
+"""
+
+import errno
+import os
+import threading
+
+import pytest
+
+from core import FractalKnowledgeBase, FractalTensor
+from kb_wal import KBWriteAheadLog
+
+
+def _archetype(i):
+    ms = [i & 1, (i >> 1) & 1, (i >> 2) & 1]
+    tensor = FractalTensor(nivel_3=[ms, [1, 0, None]], Ms=ms, MetaM=[ms[0] ^ ms[1], ms[2], 1])
+    tensor.metadata = {'i': i}
+    return tensor
+
+
+def _state(kb):
+    return {
+        space_id: [(k, t.nivel_3, t.Ms, t.MetaM, t.metadata) for k, t in u.storage.items()]
+        for space_id, u in kb.universes.items()
+    }
+
+
+def test_crash_recovery(tmp_path):
+    """Sin close() (crash), open() reproduce la KB: add, replace y bulk."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='always')
+    kb = wal.kb
+    for i in range(8):
+        kb.add_archetype('a' if i % 2 else 'b', f'arq_{i}', _archetype(i), [i & 1, None, (i >> 1) & 1])
+    kb.add_archetypes_bulk('c', [_archetype(i) for i in range(4)], Ss=[[i, 0, 0] for i in range(4)])
+    kb._get_space('a').add_archetype(_archetype(3), [1, None, 1], name='directo')  # replace
+    assert wal.stats['records'] == 10
+
+    recovered = KBWriteAheadLog.open(tmp_path, sync='none')
+    assert _state(recovered.kb) == _state(kb)
+    assert recovered.kb.get_archetype('a', 'directo').metadata == {'i': 3}
+    assert recovered.stats['replayed'] == 10
+    print(f"✅ Recuperación tras crash: {recovered.stats['replayed']} registros")
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    """Un registro a medio escribir al final se descarta sin perder los anteriores."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='always')
+    for i in range(3):
+        wal.kb.add_archetype('t', f'arq_{i}', _archetype(i), [i, 1, 0])
+    segment = os.path.join(tmp_path, sorted(n for n in os.listdir(tmp_path) if n.startswith('wal-'))[-1])
+    size = os.path.getsize(segment)
+    with open(segment, 'r+b') as f:
+        f.truncate(size - 5)
+
+    recovered = KBWriteAheadLog.open(tmp_path, sync='always')
+    assert len(recovered.kb._get_space('t').storage) == 2
+    assert recovered.stats['truncated_bytes'] > 0
+
+    # El log sigue siendo utilizable tras truncar
+    recovered.kb.add_archetype('t', 'nuevo', _archetype(5), [5, 1, 0])
+    again = KBWriteAheadLog.open(tmp_path, sync='none')
+    assert list(again.kb._get_space('t').storage) == [(0, 1, 0), (1, 1, 0), (5, 1, 0)]
+    print("✅ Cola interrumpida descartada")
+
+
+def test_compaction(tmp_path):
+    """compact_every genera snapshots y borra los segmentos cubiertos."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='none', compact_every=5)
+    for i in range(12):
+        wal.kb.add_archetype('k', f'arq_{i}', _archetype(i), [i & 1, (i >> 1) & 1, (i >> 2) & 1 if i < 8 else None])
+    assert wal.stats['checkpoints'] == 2
+
+    files = sorted(os.listdir(tmp_path))
+    assert files == ['snapshot-0000000000000011.akb', 'wal-0000000000000011.log']
+    recovered = KBWriteAheadLog.open(tmp_path, sync='none')
+    assert _state(recovered.kb) == _state(wal.kb)
+    assert recovered.stats['replayed'] == 2
+
+    # Una KB inicial no vacía se siembra con un snapshot
+    seed = FractalKnowledgeBase()
+    seed.add_archetype('s', 'x', _archetype(1), [1, 1, 1])
+    seeded = KBWriteAheadLog.open(tmp_path / 'seed', kb=seed, sync='none')
+    seeded.close()
+    assert _state(KBWriteAheadLog.open(tmp_path / 'seed', sync='none').kb) == _state(seed)
+    print(f"✅ Compactación: {files}")
+
+
+def test_group_commit(tmp_path):
+    """Escritores concurrentes comparten fsync y esperan a su lote."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='group', commit_interval=0.02, wait_for_sync=True)
+
+    def writer(space):
+        for i in range(10):
+            wal.append({'op': 'add', 'space': space, 'Ss': [i, 0, 0], 'name': None,
+                        'tensor': {'nivel_3': [[i & 1, 0, 0]], 'Ms': [i & 1, 0, 0], 'MetaM': [0, 0, 0]}})
+
+    threads = [threading.Thread(target=writer, args=(f'g{n}',)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Con wait_for_sync la escritura vuelve cuando su lote ya tiene fsync
+    wal.kb.add_archetype('g0', 'espera', _archetype(2), [9, 9, 9])
+    assert wal.durable_lsn == 41
+    assert wal.stats['fsyncs'] < wal.stats['records']
+    wal.close()
+
+    recovered = KBWriteAheadLog.open(tmp_path, sync='none')
+    assert sum(len(u.storage) for u in recovered.kb.universes.values()) == 41
+    print(f"✅ Group commit: {wal.stats['records']} registros, {wal.stats['fsyncs']} fsync")
+
+
+class _FullDisk:
+    """Archivo cuyo write falla como un disco lleno (ENOSPC)."""
+
+    def __init__(self, f):
+        self._f = f
+
+    def write(self, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+def test_failed_append_rejects_write(tmp_path):
+    """Si el registro no llega al log, la escritura falla y la KB no cambia."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='always')
+    kb = wal.kb
+    kb.add_archetype('s', 'ok', _archetype(1), [1, 0, 0])
+    wal._file = _FullDisk(wal._file)
+    with pytest.raises(OSError):
+        kb.add_archetype('s', 'perdido', _archetype(2), [2, 0, 0])
+    wal._file = _FullDisk(wal._file)  # el segmento se reabrió al descartar el registro
+    with pytest.raises(OSError):
+        kb.add_archetypes_bulk('s', [_archetype(3)], Ss=[[3, 0, 0]])
+    assert list(kb.universes['s'].storage) == [(1, 0, 0)] and kb.universe_generation('s') == 1
+    assert kb.get_archetype('s', 'perdido') is None
+
+    # Tras el fallo el WAL sigue sirviendo y la recuperación coincide con memoria
+    kb.add_archetype('s', 'despues', _archetype(4), [4, 0, 0])
+    recovered = KBWriteAheadLog.open(tmp_path, sync='none')
+    assert _state(recovered.kb) == _state(kb) and wal.stats['records'] == 2
+    print("✅ Registro fallido → escritura rechazada")
+
+
+def test_failed_group_fsync_rejects_writes(tmp_path, monkeypatch):
+    """Con group commit y wait_for_sync, un fsync fallido rechaza la escritura y las siguientes."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='group', commit_interval=0.001, wait_for_sync=True)
+    wal.kb.add_archetype('s', 'ok', _archetype(1), [1, 0, 0])
+
+    def failing_fsync(fd):
+        raise OSError(errno.EIO, "I/O error")
+
+    monkeypatch.setattr(os, 'fsync', failing_fsync)
+    with pytest.raises(OSError):
+        wal.kb.add_archetype('s', 'perdido', _archetype(2), [2, 0, 0])
+    with pytest.raises(RuntimeError):
+        wal.kb.add_archetype('s', 'otro', _archetype(3), [3, 0, 0])
+    monkeypatch.undo()
+    assert list(wal.kb.universes['s'].storage) == [(1, 0, 0)]
+    assert _state(KBWriteAheadLog.open(tmp_path, sync='none').kb) == _state(wal.kb)
+    print("✅ fsync fallido → WAL rechaza escrituras")
+
+
+def test_generations_survive_reopen(tmp_path):
+    """Reabrir (con y sin checkpoint) no hace retroceder las generaciones."""
+    wal = KBWriteAheadLog.open(tmp_path, sync='none')
+    for i in range(3):
+        wal.kb.add_archetype('s', f'arq_{i}', _archetype(i), [i & 1, 0, 1])
+    wal.kb.add_archetype('t', 'otro', _archetype(5), [1, 1, 1])
+    expected = (wal.kb.universe_generation('s'), wal.kb.universe_generation('t'), wal.kb.generation)
+    assert expected == (3, 1, 4)
+    wal.close()
+
+    for checkpoint in (False, True):
+        wal = KBWriteAheadLog.open(tmp_path, sync='none')
+        kb = wal.kb
+        assert (kb.universe_generation('s'), kb.universe_generation('t'), kb.generation) == expected
+        wal.close(checkpoint=checkpoint)
+
+    wal = KBWriteAheadLog.open(tmp_path, sync='none')
+    wal.kb.add_archetype('s', 'nuevo', _archetype(6), [0, 1, 0])
+    assert wal.kb.generation == 5 and wal.kb.universe_generation('s') == 4
+    wal.close()
+    print("✅ Generaciones conservadas al reabrir")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_crash_recovery, test_torn_tail_is_truncated, test_compaction, test_group_commit,
+                 test_failed_append_rejects_write, test_generations_survive_reopen):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
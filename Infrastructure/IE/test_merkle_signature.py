@@ -0,0 +1,93 @@
+"""
+Test de firmas Merkle de clústeres (EthicalMerkleTree)
+
+Valida que las actualizaciones incrementales dan la misma raíz que
+reconstruir el árbol, que la raíz no depende del orden de construcción,
+que las pruebas de hojas y subárboles verifican contra la raíz, y que
+la firma en lote y la del pool coinciden.
+"""
+
+import hashlib
+import random
+
+from core import (
+    EthicalMerkleTree,
+    FractalTensor,
+    TensorPoolManager,
+    compute_merkle_signature,
+    compute_merkle_signatures,
+    pattern0_create_fractal_cluster,
+)
+
+
+def _reference_root(roots):
+    """Definición recursiva (RFC 6962): división en la mayor potencia de 2 < n."""
+    if len(roots) == 1:
+        return EthicalMerkleTree.leaf_hash(roots[0])
+    k = 1
+    while k * 2 < len(roots):
+        k *= 2
+    return hashlib.sha256(b'\x01' + _reference_root(roots[:k]) + _reference_root(roots[k:])).digest()
+
+
+def _roots(seed, n):
+    rng = random.Random(seed)
+    return [[rng.choice([0, 1, None]) for _ in range(3)] for _ in range(n)]
+
+
+def test_incremental_matches_rebuild():
+    """append/update O(log n) == árbol reconstruido == definición recursiva."""
+    roots = _roots(1, 70)
+    tree = EthicalMerkleTree()
+    for n, root in enumerate(roots, 1):
+        tree.append(root)
+        assert tree.root == _reference_root(roots[:n])
+
+    roots[17] = [1, 1, 1]
+    tree.update(17, FractalTensor(nivel_3=[[1, 1, 1]]))
+    assert tree.root == EthicalMerkleTree(roots).root == _reference_root(roots)
+    assert compute_merkle_signatures([roots, roots[:5], []]) == [
+        tree.hexdigest(), compute_merkle_signature(roots[:5]), EthicalMerkleTree().hexdigest()
+    ]
+    # Raíces no ternarias también se firman (empaquetado alternativo)
+    assert EthicalMerkleTree([[5, 0, 1]]).root != EthicalMerkleTree([[1, 0, 1]]).root
+    print(f"✅ Incremental == reconstrucción ({len(tree)} hojas)")
+
+
+def test_leaf_and_subtree_proofs():
+    """Un par verifica una hoja o un subárbol alineado solo con su camino."""
+    roots = _roots(2, 37)
+    tree = EthicalMerkleTree(roots)
+    for index in (0, 13, 36):
+        proof = tree.proof(index)
+        assert EthicalMerkleTree.verify(EthicalMerkleTree.leaf_hash(roots[index]), proof, tree.root)
+        assert not EthicalMerkleTree.verify(EthicalMerkleTree.leaf_hash([2, 2, 2]), proof, tree.root)
+
+    # Subárbol de 8 hojas [16, 24): su hash se puede recalcular solo con esas hojas
+    subtree = tree.subtree(level=3, position=2)
+    assert subtree == EthicalMerkleTree(roots[16:24]).root
+    assert EthicalMerkleTree.verify(subtree, tree.proof(2, level=3), tree.root)
+    # Último subárbol incompleto [32, 37)
+    assert tree.subtree(level=3, position=4) == EthicalMerkleTree(roots[32:37]).root
+    print("✅ Pruebas de hoja y subárbol")
+
+
+def test_pool_signature_tracks_changes():
+    """El pool firma el clúster de Pattern 0 y sigue los cambios incrementales."""
+    pool = TensorPoolManager()
+    cluster = pattern0_create_fractal_cluster(num_tensors=40, context={'pool': pool})
+    signature = pool.signature()
+    assert signature == compute_merkle_signature(cluster)
+
+    extra = FractalTensor(nivel_3=[[0, 1, 0]])
+    pool.add_tensor(extra)
+    cluster[3].nivel_3[0] = [0, 0, 0]  # armonización en sitio
+    pool.update_tensor(3)
+    assert pool.signature() == compute_merkle_signature(cluster + [extra]) != signature
+    print("✅ Firma del pool incremental")
+
+
+if __name__ == "__main__":
+    test_incremental_matches_rebuild()
+    test_leaf_and_subtree_proofs()
+    test_pool_signature_tracks_changes()
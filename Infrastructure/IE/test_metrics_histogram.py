@@ -0,0 +1,89 @@
+"""
+Test del colector de métricas de memoria fija (MetricsCollector)
+
+Valida que los percentiles del histograma HDR quedan dentro de su error
+relativo, que la memoria no crece con el número de operaciones ni con el
+de espacios, y que el ciclo cognitivo registra latencias por operación y
+espacio.
+"""
+
+import random
+
+from core import FractalTensor
+from aurora_engine import AuroraCognitiveCycle, LatencyHistogram, MetricsCollector
+
+
+def test_histogram_percentiles():
+    """p50/p90/p99 con error relativo < 1/16 respecto a los valores exactos."""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    summary = histogram.summary()
+    for q, key in ((0.5, 'p50_ms'), (0.9, 'p90_ms'), (0.99, 'p99_ms')):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert abs(summary[key] - exact) <= exact / 16 + 0.001, (key, summary[key], exact)
+    assert summary['count'] == 20000
+    assert abs(summary['max_ms'] - max(values)) < 0.001
+    print(f"✅ Percentiles HDR: {summary}")
+
+
+def test_fixed_memory():
+    """Contadores, histogramas y muestras no crecen con las operaciones."""
+    metrics = MetricsCollector(sample_size=32, recent_size=8, seed=1)
+    for i in range(5000):
+        metrics.log_operation('query' if i % 3 else 'learn', coherence=1.0 if i % 2 else 0.5,
+                              kb_size=i, space_id=f's{i % 2}', latency_ms=i % 50)
+    assert len(metrics.sample) == 32 and len(metrics.metrics) == 8
+    assert len(metrics.latency) == 4
+    buckets = len(next(iter(metrics.latency.values())).counts)
+    assert all(len(h.counts) == buckets for h in metrics.latency.values())
+
+    summary = metrics.get_summary()
+    assert summary['total_operations'] == 5000
+    assert summary['operations_by_type'] == {'learn': 1667, 'query': 3333}
+    assert summary['avg_coherence'] == 0.75
+    assert summary['kb_size'] == {'s0': 4998, 's1': 4999}
+    assert summary['latency_ms']['query']['s1']['max_ms'] == 49
+    print(f"✅ Memoria fija: {buckets} cubetas por histograma")
+
+
+def test_bounded_spaces():
+    """Espacios más allá de max_spaces se pliegan en OTHER_SPACE sin perder muestras."""
+    metrics = MetricsCollector(max_spaces=4)
+    for i in range(1000):
+        metrics.log_operation('query', space_id=f'cliente_{i}', kb_size=i, latency_ms=1.0)
+        metrics.log_operation('query', space_id='caliente', kb_size=7, latency_ms=2.0)
+    assert len(metrics.latency) <= 5 and len(metrics.kb_size) <= 4
+
+    summary = metrics.get_summary()
+    latency = summary['latency_ms']['query']
+    assert latency['caliente']['count'] == 1000 and summary['kb_size']['caliente'] == 7
+    assert sum(h['count'] for h in latency.values()) == 2000
+    assert latency[MetricsCollector.OTHER_SPACE]['max_ms'] == 1.0
+    assert summary['folded_spaces'] == 1000 - 3
+    print(f"✅ Espacios acotados: {sorted(latency)}")
+
+
+def test_cycle_records_latency():
+    """learn, query y query_batch registran latencia por espacio."""
+    cycle = AuroraCognitiveCycle()
+    cycle.learn([FractalTensor(nivel_3=[[1, 0, 1]]), FractalTensor(nivel_3=[[1, 1, 0]])], 'a')
+    cycle.query([1, 0, 1], 'a')
+    cycle.query_batch([[0, 1, 1], [0, 1, 1], [1, None, 0]], 'b')
+
+    latency = cycle.metrics.get_summary()['latency_ms']
+    assert latency['learn']['a']['count'] == 1
+    assert latency['query']['a']['count'] == 1
+    assert latency['query']['b']['count'] == 2
+    print(f"✅ Latencias del ciclo: {latency}")
+
+
+if __name__ == "__main__":
+    test_histogram_percentiles()
+    test_fixed_memory()
+    test_bounded_spaces()
+    test_cycle_records_latency()
@@ -0,0 +1,69 @@
+"""
+Test de Pattern 0 con RNG por llamada y armonización por lotes
+
+Valida que pattern0_create_fractal_cluster es determinista por semilla sin
+tocar el RNG global (también con llamadas concurrentes), y que la
+armonización y las firmas por lotes coinciden con la ruta tensor a tensor.
+"""
+
+import random
+import threading
+
+from core import Armonizador, FractalTensor, compute_ethical_signature, pattern0_create_fractal_cluster
+
+
+def _cluster_state(cluster):
+    return [(t.nivel_3, t.metadata) for t in cluster]
+
+
+def test_per_call_rng():
+    """Misma semilla -> mismo cluster; el RNG global no se modifica."""
+    random.seed(1234)
+    state = random.getstate()
+    first = pattern0_create_fractal_cluster(num_tensors=50, entropy_seed=0.25)
+    assert random.getstate() == state
+    second = pattern0_create_fractal_cluster(num_tensors=50, entropy_seed=0.25)
+    other = pattern0_create_fractal_cluster(num_tensors=50, entropy_seed=0.5)
+    assert _cluster_state(first) == _cluster_state(second)
+    assert _cluster_state(first) != _cluster_state(other)
+    assert all(len(t.nivel_3) == 3 and all(len(row) == 3 for row in t.nivel_3) for t in first)
+
+    # Llamadas concurrentes: mismo resultado que en serie
+    seeds = [0.1 * i for i in range(1, 9)]
+    expected = {seed: _cluster_state(pattern0_create_fractal_cluster(num_tensors=200, entropy_seed=seed)) for seed in seeds}
+    results = {}
+
+    def run(seed):
+        results[seed] = _cluster_state(pattern0_create_fractal_cluster(num_tensors=200, entropy_seed=seed))
+
+    threads = [threading.Thread(target=run, args=(seed,)) for seed in seeds]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == expected
+    print("✅ RNG por llamada y concurrencia")
+
+
+def test_batch_matches_single_path():
+    """harmonize_batch y las firmas en bloque == armonizar y firmar uno a uno."""
+    cluster = pattern0_create_fractal_cluster(
+        input_data=[[1, 0, 1], [0, None, 1], [1, 0, 1]], num_tensors=300, entropy_seed=0.75
+    )
+    armonizador = Armonizador()
+    for tensor in cluster:
+        original = tensor.Ms  # raíz previa a la armonización
+        assert tensor.metadata['ethical_hash'] == compute_ethical_signature([FractalTensor(nivel_3=[original])])
+        assert tensor.nivel_3[0] == armonizador.harmonize(original)['output']
+    assert cluster[0].Ms == [1, 0, 1] and cluster[1].Ms == [0, None, 1]
+
+    vectors = [[1, 0, 1], [0, None, 1], [1, 0, 1], [1, 1, 0]]
+    batch = armonizador.harmonize_batch(vectors)
+    assert batch == [armonizador.harmonize(v) for v in vectors]
+    assert batch[0]['output'] is not batch[2]['output']
+    print(f"✅ Lote == ruta individual ({len(cluster)} tensores)")
+
+
+if __name__ == "__main__":
+    test_per_call_rng()
+    test_batch_matches_single_path()
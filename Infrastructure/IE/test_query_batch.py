@@ -0,0 +1,113 @@
+"""
+Test de consultas por lotes (AuroraCognitiveCycle.query_batch)
+
+Valida que el lote devuelve lo mismo que query() en el orden de entrada,
+que los patrones repetidos se resuelven una sola vez, que la caché se
+invalida al escribir en el universo (y solo en él) y que los resultados
+devueltos son copias independientes; close() libera los hilos del pool,
+también con lotes en curso.
+"""
+
+import threading
+
+from core import FractalTensor
+from aurora_engine import AuroraCognitiveCycle
+
+
+def _cycle(**kwargs):
+    cycle = AuroraCognitiveCycle(enable_metrics=False, **kwargs)
+    cycle.learn([FractalTensor(nivel_3=[[1, 0, 1]]), FractalTensor(nivel_3=[[1, 1, 0]])], 'a')
+    cycle.learn([FractalTensor(nivel_3=[[0, 1, 1]])], 'b')
+    return cycle
+
+
+def _view(result):
+    return result['reconstructed_tensor'].nivel_3
+
+
+def test_batch_matches_sequential():
+    """Mismos resultados que query() uno a uno, en orden, con NULLs y varios espacios."""
+    patterns = [[1, 0, 1], [1, None, 1], [0, 0, 0], [1, 0, 1], [None, 1, 1], [0, 0, 0]] * 3
+    space_ids = ['a', 'a', 'b', 'b', 'b', 'a'] * 3
+    reference = _cycle()
+    expected = [_view(reference.query(p, s)) for p, s in zip(patterns, space_ids)]
+
+    cycle = _cycle(query_workers=4)
+    cycle.PARALLEL_MIN_MISSES = 1  # forzar el pool
+    results = cycle.query_batch(patterns, space_ids=space_ids)
+    assert [_view(r) for r in results] == expected
+    assert results[6]['reconstruction_method'] == results[0]['reconstruction_method']
+    stats = cycle.query_cache_stats
+    assert stats['deduplicated'] == len(patterns) - 6 and stats['misses'] == 6
+
+    threads = list(cycle._query_pool._threads)
+    assert threads and all(t.is_alive() for t in threads)
+    cycle.close()
+    assert cycle._query_pool is None and not any(t.is_alive() for t in threads)
+    print(f"✅ Lote equivalente a consultas secuenciales: {stats}")
+
+
+def test_cache_invalidated_per_universe():
+    """Un segundo lote sale de la caché hasta que el universo cambia."""
+    cycle = _cycle()
+    cycle.query_batch([[1, 0, 1], [0, 1, 1]], space_ids=['a', 'b'])
+    cycle.query_batch([[1, 0, 1], [0, 1, 1]], space_ids=['a', 'b'])
+    assert cycle.query_cache_stats['hits'] == 2
+
+    cycle.learn([FractalTensor(nivel_3=[[0, 0, 1]])], 'a')
+    cycle.query_batch([[1, 0, 1], [0, 1, 1]], space_ids=['a', 'b'])
+    assert cycle.query_cache_stats['invalidated'] == 1
+    assert cycle.query_cache_stats['hits'] == 3
+    print("✅ Caché invalidada solo en el universo modificado")
+
+
+def test_results_are_independent():
+    """Modificar un resultado no afecta a duplicados ni a la caché."""
+    cycle = _cycle()
+    first, second = cycle.query_batch([[1, 0, 1], [1, 0, 1]], 'a')
+    first['reconstructed_tensor'].nivel_3[0] = [0, 0, 0]
+    first['log'].append('x')
+    assert second['reconstructed_tensor'].nivel_3[0] != [0, 0, 0]
+    again = cycle.query_batch([[1, 0, 1]], 'a')[0]
+    assert again['reconstructed_tensor'].nivel_3[0] == second['reconstructed_tensor'].nivel_3[0]
+    assert 'x' not in again['log']
+    print("✅ Resultados independientes")
+
+
+def test_close_during_batches():
+    """close() en paralelo con lotes: espera a los que usan el pool y ninguno falla."""
+    cycle = _cycle(query_workers=4)
+    cycle.PARALLEL_MIN_MISSES = 1
+    patterns = [[1, 0, 1], [1, 1, 0], [0, 1, 1], [0, 0, 0]]
+    expected = [_view(r) for r in _cycle().query_batch(patterns, 'a')]
+    stop = threading.Event()
+    errors = []
+
+    def closer():
+        while not stop.is_set():
+            cycle.close()
+
+    thread = threading.Thread(target=closer)
+    thread.start()
+    try:
+        for _ in range(200):
+            with cycle._query_cache_lock:
+                cycle._query_cache.clear()  # que cada lote resuelva (y use el pool)
+            try:
+                assert [_view(r) for r in cycle.query_batch(patterns, 'a')] == expected
+            except RuntimeError as e:
+                errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+    cycle.close()
+    assert not errors, errors[0]
+    assert cycle._query_pool is None and cycle._query_pool_users == 0
+    print("✅ close() concurrente con query_batch")
+
+
+if __name__ == "__main__":
+    test_batch_matches_sequential()
+    test_cache_invalidated_per_universe()
+    test_results_are_independent()
+    test_close_during_batches()
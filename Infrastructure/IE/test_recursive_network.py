@@ -245,6 +245,47 @@ def test_bidirectional_flow():
     print("\n✅ Test 6 PASSED")
 
 
+def test_batch_solve_matches_single():
+    """
+    Test 7: recursive_solve_batch equivale a recursive_solve por entrada.
+    """
+    print("\n" + "="*60)
+    print("TEST 7: Resolución por Lotes")
+    print("="*60)
+    
+    kb = FractalKnowledgeBase()
+    for i, pattern in enumerate([[1, 0, 1], [0, 1, 1], [1, 1, 0]]):
+        arch = FractalTensor(nivel_3=[pattern])
+        arch.Ms = pattern
+        arch.MetaM = [i % 2, 0, 1]
+        kb.add_archetype('batch_space', f'pattern_{i}', arch, pattern)
+    
+    inputs = [
+        [[1, None, None]],
+        [[None, 1, None]],
+        [[1, None, None]],              # repetido
+        [[None, None, None]],
+        [[0, 1, 1]],                    # ya completo
+        [[1, None], [None, 0, 1]],      # raíz corta + NULL en otra fila
+    ]
+    network = RecursiveDeductionNetwork(kb)
+    batch = network.recursive_solve_batch(
+        [FractalTensor(nivel_3=[list(r) for r in rows]) for rows in inputs], 'batch_space'
+    )
+    
+    for rows, result in zip(inputs, batch):
+        single = RecursiveDeductionNetwork(kb).recursive_solve(
+            FractalTensor(nivel_3=[list(r) for r in rows]), 'batch_space'
+        )
+        print(f"   {rows[0]} → {result['resolved_tensor'].nivel_3[0]} (iter={result['iterations']})")
+        assert result['resolved_tensor'].nivel_3 == single['resolved_tensor'].nivel_3
+        for key in ('iterations', 'final_coherence', 'converged', 'trace'):
+            assert result[key] == single[key], key
+    
+    assert batch[0]['resolved_tensor'] is not batch[2]['resolved_tensor']
+    print("\n✅ Test 7 PASSED")
+
+
 if __name__ == '__main__':
     print("\n" + "🕸️"*30)
     print("AURORA RECURSIVE DEDUCTION NETWORK - TEST SUITE")
@@ -257,6 +298,7 @@ if __name__ == '__main__':
         test_no_convergence()
         test_coherence_validation()
         test_bidirectional_flow()
+        test_batch_solve_matches_single()
         
         print("\n" + "="*60)
         print("🎉 TODOS LOS TESTS PASSED")
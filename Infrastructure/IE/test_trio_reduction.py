@@ -0,0 +1,98 @@
+"""
+Test del motor de reducción en árbol de tríos (TrioReductionEngine)
+
+Valida que la reducción vectorizada, la repartida en bloques paralelos y la
+de streaming por bloques 3**k dan el mismo arquetipo que la síntesis
+escalar de Evolver, que learn acepta familias en streaming, y que el
+motor rechaza familias de menos de 2 elementos.
+"""
+
+import random
+
+import pytest
+
+from core import Evolver, FractalTensor, TrioReductionEngine
+from aurora_engine import AuroraCognitiveCycle
+
+
+def _scalar_archetype(evolver, tensors):
+    """Reducción de referencia: compute_full_fractal trío a trío, nivel a nivel."""
+    level = list(tensors)
+    while len(level) > 1:
+        next_level = []
+        for i in range(0, len(level), 3):
+            trio = level[i:i + 3]
+            while len(trio) < 3:
+                trio.append(FractalTensor(nivel_3=[[0, 0, 0]]))
+            next_level.append(evolver.base_transcender.compute_full_fractal(*trio))
+        level = next_level
+    return level[0]
+
+
+def _family(seed, n):
+    rng = random.Random(seed)
+    return [FractalTensor(nivel_3=[[rng.choice([0, 1, None]) for _ in range(3)]]) for _ in range(n)]
+
+
+def _fields(tensor):
+    return tensor.nivel_3, tensor.Ms, tensor.Ss, tensor.MetaM
+
+
+def test_vectorized_matches_scalar():
+    """Mismo arquetipo que la ruta escalar, en memoria y en streaming."""
+    evolver = Evolver()
+    for n in (2, 3, 4, 9, 10, 28, 82, 245, 730):
+        family = _family(n, n)
+        expected = _fields(_scalar_archetype(evolver, family))
+        assert _fields(evolver.compute_fractal_archetype(family)) == expected
+        for block_levels in (1, 2, 4):
+            streamed = evolver.compute_fractal_archetype_stream(iter(family), block_levels=block_levels)
+            assert _fields(streamed) == expected
+    print("✅ Reducción vectorizada y en streaming == escalar")
+
+
+def test_parallel_levels_and_fallback():
+    """Niveles repartidos entre hilos y raíces no ternarias por la ruta escalar."""
+    family = _family(7, 3000)
+    engine = TrioReductionEngine(workers=4)
+    engine.PARALLEL_MIN_TRIOS = 8
+    parallel = engine.reduce(family)
+    assert _fields(parallel) == _fields(TrioReductionEngine(workers=1).reduce(family))
+
+    odd = [FractalTensor(nivel_3=[[5, 0, 1]]), FractalTensor(nivel_3=[[1, 1, 0]])]
+    assert engine.reduce(odd) is None
+    evolver = Evolver()
+    assert _fields(evolver.compute_fractal_archetype(odd)) == _fields(_scalar_archetype(evolver, odd))
+    print("✅ Niveles en paralelo y fallback escalar")
+
+
+def test_small_families_and_pool_size():
+    """< 2 elementos → ValueError claro; el pool tiene `workers` hilos."""
+    engine = TrioReductionEngine(workers=3)
+    for items in ([], [[1, 0, 1]]):
+        with pytest.raises(ValueError, match="al menos 2"):
+            engine.reduce_stream(iter(items))
+        with pytest.raises(ValueError, match="al menos 2"):
+            engine.reduce([FractalTensor(nivel_3=[list(root)]) for root in items])
+    assert engine._executor()._max_workers == 3
+    assert TrioReductionEngine(workers=3)._executor() is engine._executor()
+    assert TrioReductionEngine(workers=2)._executor()._max_workers == 2
+    print("✅ Familias pequeñas y tamaño del pool")
+
+
+def test_learn_streaming_family():
+    """learn acepta un generador de tensores sin materializar la familia."""
+    cycle = AuroraCognitiveCycle(enable_metrics=False)
+    family = _family(3, 500)
+    expected = Evolver().compute_fractal_archetype(family)
+    result = cycle.learn((t for t in family), space_id='stream')
+    assert result['status'] == 'success'
+    assert _fields(result['archetype']) == _fields(expected)
+    print("✅ learn en streaming")
+
+
+if __name__ == "__main__":
+    test_vectorized_matches_scalar()
+    test_parallel_levels_and_fallback()
+    test_small_families_and_pool_size()
+    test_learn_streaming_family()
@@ -0,0 +1,140 @@
+"""
+Test del Trigate vectorizado (NumPy)
+
+Valida que VectorizedTrigate reproduce las LUTs escalares de Trigate en
+los 27 estados, que recursive_synthesis como prefix-scan coincide con la
+reducción secuencial, y que las versiones batch de Transcender y Extender
+coinciden con sus equivalentes escalares.
+"""
+
+import itertools
+import logging
+import random
+
+import numpy as np
+
+from core import (
+    Trigate,
+    VectorizedTrigate,
+    Transcender,
+    Extender,
+    FractalKnowledgeBase
+)
+
+logging.getLogger('aurora.armonizador').setLevel(logging.ERROR)
+
+STATES = (0, 1, None)
+
+
+def _random_vectors(rng, n, null_rate=0.2):
+    return [
+        [None if rng.random() < null_rate else rng.randint(0, 1) for _ in range(3)]
+        for _ in range(n)
+    ]
+
+
+def test_modes_match_scalar_luts():
+    """Los cuatro modos coinciden con Trigate en los 27 estados."""
+    trigate = Trigate()
+    vt = VectorizedTrigate()
+
+    triples = list(itertools.product(STATES, repeat=3))
+    X = vt.encode([[t[0]] for t in triples])
+    Y = vt.encode([[t[1]] for t in triples])
+    Z = vt.encode([[t[2]] for t in triples])
+
+    for name in ('infer', 'learn', 'deduce_a', 'deduce_b'):
+        vec_out = vt.decode(getattr(vt, name)(X, Y, Z))
+        for (x, y, z), out in zip(triples, vec_out):
+            assert out == getattr(trigate, name)([x] * 3, [y] * 3, [z] * 3)[:1], name
+
+    print("✅ infer/learn/deduce_a/deduce_b == LUTs escalares")
+
+
+def test_arbitrary_shapes_and_broadcast():
+    """Funciona con cualquier forma y admite escalares (M=1)."""
+    vt = VectorizedTrigate()
+    A = np.random.default_rng(0).integers(0, 3, size=(4, 5, 7), dtype=np.int8)
+    B = np.random.default_rng(1).integers(0, 3, size=(4, 5, 7), dtype=np.int8)
+
+    M, S = vt.synthesize(A, B)
+    assert M.shape == A.shape and M.dtype == np.int8
+    assert np.array_equal(M, vt.infer(A, B, np.ones_like(A)))
+    assert np.array_equal(S, vt.infer(A, B, 0))
+    assert np.all(M[(A == 2) | (B == 2)] == VectorizedTrigate.NULL_CODE)
+
+    print("✅ Formas arbitrarias y broadcasting")
+
+
+def test_recursive_synthesis_prefix_scan():
+    """El prefix-scan coincide con la reducción secuencial escalar."""
+    trigate = Trigate()
+    vt = VectorizedTrigate()
+    rng = random.Random(7)
+
+    for n in (2, 3, 10):
+        vectors = _random_vectors(rng, n)
+        expected, expected_history = trigate.recursive_synthesis(vectors)
+        result, history = vt.recursive_synthesis(vt.encode(vectors))
+        assert vt.decode(result) == expected
+        assert vt.decode(history) == expected_history
+
+    print("✅ recursive_synthesis como prefix-scan")
+
+
+def test_batch_trio_and_reconstruct():
+    """compute_vector_trio_batch y fractal_reconstruct_batch == escalares."""
+    rng = random.Random(11)
+    transcender = Transcender()
+    extender = Extender(knowledge_base=FractalKnowledgeBase())
+    vt = VectorizedTrigate()
+
+    A, B, C = (_random_vectors(rng, 50) for _ in range(3))
+    batch = transcender.compute_vector_trio_batch(A, B, C)
+    for i in range(50):
+        scalar = transcender.compute_vector_trio(A[i], B[i], C[i])
+        assert vt.decode(batch['M_emergent'][i]) == scalar['M_emergent']
+        assert vt.decode(batch['MetaM'][i]) == scalar['MetaM']
+
+    Ms, MetaM = _random_vectors(rng, 50, 0.0), _random_vectors(rng, 50, 0.0)
+    ra, rb, rc = extender.fractal_reconstruct_batch(Ms, MetaM)
+    for i in range(50):
+        ta, tb, tc = extender.fractal_reconstruct(Ms[i], MetaM[i], 'default')
+        assert vt.decode(ra[i]) == ta.nivel_3[0]
+        assert vt.decode(rb[i]) == tb.nivel_3[0]
+        assert vt.decode(rc[i]) == tc.nivel_3[0]
+
+    print("✅ Transcender/Extender batch == escalares")
+
+
+def test_api_synthesis_endpoint():
+    """/tensors/synthesize con arrays == Trigate escalar par a par."""
+    import asyncio
+    import pytest
+    from fastapi import HTTPException
+    import aurora_api
+    aurora_api.init_gateway()
+
+    rng = random.Random(3)
+    A, B = _random_vectors(rng, 200), _random_vectors(rng, 200)
+    req = aurora_api.TensorSynthesis(A=A, B=B)
+    response = asyncio.run(aurora_api.synthesize_tensors(req, current_user={"user_id": "u"}))
+    trigate = Trigate()
+    assert response["count"] == 200
+    for i in range(200):
+        assert [response["M"][i], response["S"][i]] == list(trigate.synthesize(A[i], B[i]))
+
+    with pytest.raises(HTTPException) as ragged:
+        asyncio.run(aurora_api.synthesize_tensors(
+            aurora_api.TensorSynthesis(A=[[1, 0]], B=[[1, 0, 1]]), current_user={"user_id": "u"}
+        ))
+    assert ragged.value.status_code == 400
+    print("✅ Endpoint de síntesis vectorizado")
+
+
+if __name__ == '__main__':
+    test_modes_match_scalar_luts()
+    test_arbitrary_shapes_and_broadcast()
+    test_recursive_synthesis_prefix_scan()
+    test_batch_trio_and_reconstruct()
+    test_api_synthesis_endpoint()
@@ -0,0 +1,110 @@
+"""
+Test del índice de comodines de _SingleUniverseKB
+
+Valida que find_archetype_by_pattern devuelve el mismo arquetipo que el
+barrido lineal original (primer match en orden de storage), también tras
+reemplazar claves Ss, y que backward_deduce rellena NULLs con él. También
+compara los índices de similitud de los expertos dinámica y relator con
+sus barridos originales.
+"""
+
+import itertools
+import random
+
+from core import (
+    FractalTensor, FractalKnowledgeBase, RecursiveDeductionNetwork, Transcender
+)
+
+
+def _archetype(root, ms):
+    tensor = FractalTensor(nivel_3=[list(root)])
+    tensor.Ms = list(ms)
+    tensor.MetaM = [0, 0, 0]
+    return tensor
+
+
+def test_index_matches_linear_scan():
+    """Todas las consultas con comodines coinciden con el barrido lineal."""
+    rng = random.Random(31)
+    kb = FractalKnowledgeBase()
+    space = kb._get_space('wildcards')
+
+    ms_values = list(itertools.product([0, 1], repeat=3))
+    for i in range(40):
+        root = [rng.choice([0, 1, None]) for _ in range(3)]
+        ss = [rng.choice([0, 1]) for _ in range(3)]
+        # Ms único por MetaM para respetar la coherencia absoluta
+        space.add_archetype(_archetype(root, ms_values[i % 8]), ss)
+
+    for query in itertools.product([0, 1, None], repeat=3):
+        expected = space._scan_by_pattern(query)
+        assert space.find_archetype_by_pattern(list(query)) is expected, query
+    print("✅ Índice de comodines equivalente al barrido lineal")
+
+
+def test_replaced_ss_keeps_storage_order():
+    """Una clave Ss reemplazada conserva su posición de primer match."""
+    kb = FractalKnowledgeBase()
+    space = kb._get_space('orden')
+    first = _archetype([1, 0, 0], [0, 0, 0])
+    second = _archetype([1, 1, 0], [0, 0, 1])
+    space.add_archetype(first, [0, 0, 0])
+    space.add_archetype(second, [1, 1, 1])
+    assert space.find_archetype_by_pattern([1, None, 0]) is first
+
+    replacement = _archetype([1, 1, 1], [0, 1, 0])
+    space.add_archetype(replacement, [0, 0, 0])
+    assert space.find_archetype_by_pattern([1, 0, 0]) is None
+    assert space.find_archetype_by_pattern([1, None, None]) is replacement
+    assert space.find_archetype_by_pattern([1, 1, 0]) is second
+    print("✅ Orden de storage respetado tras reemplazo")
+
+
+def test_backward_deduce_uses_index():
+    """backward_deduce rellena los NULLs desde el arquetipo indexado."""
+    kb = FractalKnowledgeBase()
+    kb.add_archetype('red', 'arq', _archetype([1, 0, 1], [1, 1, 1]), Ss=[1, 0, 1])
+    network = RecursiveDeductionNetwork(kb)
+
+    tensor = FractalTensor(nivel_3=[[1, None, None]])
+    result = network.backward_deduce(tensor, 'red')
+    assert None not in result.nivel_3[0]
+    print(f"✅ backward_deduce: [1, None, None] -> {result.nivel_3[0]}")
+
+
+def test_similarity_indexes_match_scans():
+    """Dinámica y relator eligen el mismo arquetipo que el barrido lineal."""
+    rng = random.Random(32)
+    kb = FractalKnowledgeBase()
+    space = kb._get_space('similitud')
+    transcender = Transcender()
+
+    ms_values = list(itertools.product([0, 1], repeat=3))
+    for i in range(30):
+        root = [rng.choice([0, 1, None]) for _ in range(3)]
+        ss = [rng.choice([0, 1, None]) for _ in range(3)]
+        space.add_archetype(_archetype(root, ms_values[i % 8]), ss)
+
+    for query in itertools.product([0, 1], repeat=3):
+        best, best_sim = None, -1
+        for archetype in space.storage.values():
+            sim = sum(1 for a, b in zip(archetype.nivel_3[0], query) if a == b)
+            if sim > best_sim:
+                best_sim, best = sim, archetype
+        assert space.best_positional_match(list(query)) == (best, best_sim), query
+
+        best, best_score = None, -1
+        for archetype in space.storage.values():
+            rel = transcender.relate_vectors(list(query), archetype.nivel_3[0])
+            score = sum(1 for bit in rel if bit == 0)
+            if score > best_score:
+                best_score, best = score, archetype
+        assert space.best_relation_match(list(query)) == (best, best_score), query
+    print("✅ Índices de similitud equivalentes a los barridos")
+
+
+if __name__ == "__main__":
+    test_index_matches_linear_scan()
+    test_replaced_ss_keeps_storage_order()
+    test_backward_deduce_uses_index()
+    test_similarity_indexes_match_scans()